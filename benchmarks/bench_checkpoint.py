@@ -0,0 +1,74 @@
+"""
+Micro-benchmark: per-contact checkpoint cost as a run grows.
+
+Simulates campaigns of increasing length (10% failures) and reports the mean
+cost per contact for each slice of the run, for the old save_progress (rewriting
+the whole JSON, here with the failed_contacts list it was meant to carry) and for
+checkpoint.Checkpoint. The Checkpoint columns should stay flat.
+
+Run from the repository root:
+    python -m benchmarks.bench_checkpoint [contacts]
+"""
+from checkpoint import Checkpoint
+import json
+import os
+import sys
+import tempfile
+import time
+
+DEFAULT_CONTACTS = 100000
+SLICES = 5
+
+def legacy_save_progress(path, current_index, total_contacts, success_count, failed_count, failed_contacts):
+    progress_data = {
+        'current_index': current_index,
+        'total_contacts': total_contacts,
+        'success_count': success_count,
+        'failed_count': failed_count,
+        'failed_contacts': failed_contacts,
+        'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')
+    }
+    with open(path, 'w') as f:
+        json.dump(progress_data, f, indent=2)
+
+def run_legacy(tmp, contacts):
+    path = os.path.join(tmp, "legacy_progress.json")
+    failed = []
+    success_count = 0
+    timings = []
+    for i in range(contacts):
+        phone = f"98{i:08d}"
+        if i % 10 == 0:
+            failed.append(phone)
+        else:
+            success_count += 1
+        start = time.perf_counter()
+        legacy_save_progress(path, i + 1, contacts, success_count, len(failed), failed)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def run_checkpoint(tmp, contacts):
+    checkpoint = Checkpoint(os.path.join(tmp, "progress.json"), os.path.join(tmp, "progress.journal"))
+    timings = []
+    for i in range(contacts):
+        phone = f"98{i:08d}"
+        start = time.perf_counter()
+        if i % 10 == 0:
+            checkpoint.record(phone, 'failed', "Contact not found (No results)", index=i)
+        else:
+            checkpoint.record(phone, 'sent', index=i)
+        timings.append(time.perf_counter() - start)
+    checkpoint.close()
+    return timings
+
+def slice_means(timings):
+    size = max(1, len(timings) // SLICES)
+    return [sum(timings[i:i + size]) / len(timings[i:i + size]) * 1e6 for i in range(0, size * SLICES, size)]
+
+if __name__ == "__main__":
+    contacts = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_CONTACTS
+    with tempfile.TemporaryDirectory() as tmp:
+        results = [("legacy save_progress", run_legacy(tmp, contacts)), ("Checkpoint", run_checkpoint(tmp, contacts))]
+    print(f"Mean checkpoint cost per contact (µs) over {contacts} contacts, by fifth of the run:")
+    for name, timings in results:
+        print(f"  {name:>22}: " + "  ".join(f"{mean:>9.1f}" for mean in slice_means(timings)))
@@ -0,0 +1,116 @@
+"""
+Offline end-to-end benchmark against the local mock of WhatsApp Web.
+
+Serves mock_whatsapp/index.html from localhost, drives it with headless Chrome
+through the real send_to_contact (and optionally create_single_group /
+open_new_group / send_message_and_images), and prints per-step latencies
+and contacts/hour from the tracing layer. Nothing touches the network or a real
+WhatsApp account.
+
+Run from the repository root:
+    python -m benchmarks.bench_e2e --contacts 50 --latency 150 --images 1
+    python -m benchmarks.bench_e2e --groups 5 --batch-size 3
+"""
+from selenium import webdriver
+from selenium.webdriver.support.ui import WebDriverWait
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from functools import partial
+import argparse
+import random
+import threading
+import os
+
+import tracing
+import locators
+
+MOCK_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mock_whatsapp")
+IMAGE_FOLDER = os.path.join(os.path.dirname(MOCK_DIR), "images")
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+def start_mock_server():
+    """Serves the mock app on a free localhost port; returns (server, base_url)."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(QuietHandler, directory=MOCK_DIR))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/index.html"
+
+def start_headless_chrome():
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--window-size=1400,1000")
+    return webdriver.Chrome(options=options)
+
+def synthetic_numbers(count, seed=7):
+    rng = random.Random(seed)
+    return [f"+97798{rng.randint(10000000, 99999999)}" for _ in range(count)]
+
+def run_contacts(driver, wait, args):
+    from main import send_to_contact
+    from selenium_transport import SeleniumTransport
+    transport = SeleniumTransport(driver)
+    image_files = sorted(f for f in os.listdir(IMAGE_FOLDER) if f.lower().endswith(('.png', '.jpg', '.jpeg')))[:args.images]
+    failed = 0
+    for phone in synthetic_numbers(args.contacts):
+        with tracing.span("contact"):
+            results = send_to_contact(transport, phone, args.message, image_files, IMAGE_FOLDER)
+        tracing.contact_done()
+        if results['error']:
+            failed += 1
+    print(f"📨 {args.contacts} contacts, {failed} failed")
+
+def run_groups(driver, wait, args):
+    from group_creation import send_message_and_images, unique_group_name
+    from selenium_transport import SeleniumTransport, create_single_group, open_new_group
+    transport = SeleniumTransport(driver)
+    numbers = synthetic_numbers(args.groups * args.batch_size)
+    image_files = sorted(f for f in os.listdir(IMAGE_FOLDER) if f.lower().endswith(('.png', '.jpg', '.jpeg')))[:args.images]
+    for i in range(args.groups):
+        batch = numbers[i * args.batch_size:(i + 1) * args.batch_size]
+        group_name = unique_group_name("Bench Group", i + 1)
+        with tracing.span("create_group"):
+            created = create_single_group(driver, wait, batch, group_name)
+        if created:
+            if open_new_group(driver, wait, group_name):
+                send_message_and_images(transport, group_name, args.message, image_files, IMAGE_FOLDER)
+        tracing.contact_done(len(batch))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contacts", type=int, default=20, help="contacts to message (default 20)")
+    parser.add_argument("--groups", type=int, default=0, help="groups to create instead of messaging contacts")
+    parser.add_argument("--batch-size", type=int, default=3, help="members per group")
+    parser.add_argument("--images", type=int, default=0, help="images from images/ to send to each recipient")
+    parser.add_argument("--message", default="Hello from the benchmark 👋\nSecond line", help="text to send")
+    parser.add_argument("--latency", type=int, default=150, help="mock render latency in ms")
+    parser.add_argument("--jitter", type=int, default=50, help="random extra latency in ms")
+    parser.add_argument("--miss-rate", type=float, default=0.1, help="fraction of numbers with no results")
+    parser.add_argument("--trace", default="bench_trace.jsonl", help="JSONL file for the spans")
+    args = parser.parse_args()
+
+    server, url = start_mock_server()
+    driver = start_headless_chrome()
+    try:
+        tracing.enable_tracing(args.trace)
+        with tracing.span("driver_start"):
+            driver.get(f"{url}?latency={args.latency}&jitter={args.jitter}&missRate={args.miss_rate}")
+        wait = WebDriverWait(driver, 30)
+        with tracing.span("login_wait"):
+            wait.until(locators.present('search_box'))
+        if args.groups:
+            run_groups(driver, wait, args)
+        else:
+            run_contacts(driver, wait, args)
+        print(f"🧪 Mock state: {driver.execute_script('return window.mockStats()')}")
+    finally:
+        locators.print_stats()
+        tracing.disable_tracing()
+        driver.quit()
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
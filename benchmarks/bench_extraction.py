@@ -0,0 +1,116 @@
+"""
+Benchmark: streaming contact extractor vs the old extract_contacts_from_pdf.
+
+Generates synthetic contact PDFs (1k, 10k and 100k numbers) in a temp folder and
+times both extractors end to end, plus the text-scan/dedup phase on its own so the
+PyPDF2 cost doesn't hide the difference. The legacy run at 100k is quadratic and
+takes a long time; pass smaller sizes for a quick check.
+
+Run from the repository root:
+    python -m benchmarks.bench_extraction [sizes...]      # default 1000 10000 100000
+"""
+from fpdf import FPDF
+from contact_extractor import iter_contacts_from_pdf, iter_page_numbers
+import PyPDF2
+import argparse
+import random
+import re
+import os
+import tempfile
+import time
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+LINES_PER_PAGE = 50
+
+def legacy_extract_contacts_from_pdf(pdf_file):
+    """The pre-refactor implementation, kept verbatim for comparison."""
+    phone_numbers = []
+    with open(pdf_file, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        full_text = ""
+        for page in pdf_reader.pages:
+            full_text += page.extract_text()
+        
+        patterns = [r'\+?\d{1,4}[-.\s]?\(?\d{1,4}\)?[-.\s]?\d{1,4}[-.\s]?\d{1,9}', r'\d{10}']
+        for pattern in patterns:
+            matches = re.findall(pattern, full_text)
+            for match in matches:
+                cleaned = re.sub(r'[-.\s()]', '', match)
+                if 8 <= len(cleaned) <= 15 and cleaned not in phone_numbers:
+                    phone_numbers.append(cleaned)
+    return phone_numbers
+
+def legacy_scan(pages):
+    phone_numbers = []
+    full_text = ""
+    for text in pages:
+        full_text += text
+    for pattern in [r'\+?\d{1,4}[-.\s]?\(?\d{1,4}\)?[-.\s]?\d{1,4}[-.\s]?\d{1,9}', r'\d{10}']:
+        for match in re.findall(pattern, full_text):
+            cleaned = re.sub(r'[-.\s()]', '', match)
+            if 8 <= len(cleaned) <= 15 and cleaned not in phone_numbers:
+                phone_numbers.append(cleaned)
+    return phone_numbers
+
+def streaming_scan(pages):
+    seen = set()
+    phone_numbers = []
+    for text in pages:
+        for number in iter_page_numbers(text):
+            if number not in seen:
+                seen.add(number)
+                phone_numbers.append(number)
+    return phone_numbers
+
+def synthetic_number(rng):
+    return f"+977 98{rng.randint(0, 9)}-{rng.randint(1000000, 9999999)}"
+
+def generate_pdf(path, count, seed=42):
+    """Writes `count` numbers, LINES_PER_PAGE per page (about 5% repeats)."""
+    rng = random.Random(seed)
+    numbers = [synthetic_number(rng) for _ in range(count)]
+    for i in range(0, count, 20):
+        numbers[i] = numbers[rng.randrange(count)]
+    pdf = FPDF()
+    pdf.set_font("Arial", '', 10)
+    for start in range(0, count, LINES_PER_PAGE):
+        pdf.add_page()
+        lines = [f"Phone: {n}" for n in numbers[start:start + LINES_PER_PAGE]]
+        pdf.multi_cell(0, 5, "\n".join(lines))
+    pdf.output(path)
+
+def read_pages(path):
+    with open(path, 'rb') as file:
+        return [page.extract_text() or "" for page in PyPDF2.PdfReader(file).pages]
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+def run(sizes):
+    print(f"{'numbers':>8} | {'legacy pdf':>11} | {'stream pdf':>11} | {'legacy scan':>11} | {'stream scan':>11} | {'speedup':>7}")
+    print("-" * 75)
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            path = os.path.join(tmp, f"contacts_{size}.pdf")
+            generate_pdf(path, size)
+            pages = read_pages(path)
+
+            legacy_pdf, legacy_result = timed(legacy_extract_contacts_from_pdf, path)
+            stream_pdf, stream_result = timed(lambda p: list(iter_contacts_from_pdf(p)), path)
+            legacy_scan_time, _ = timed(legacy_scan, pages)
+            stream_scan_time, _ = timed(streaming_scan, pages)
+
+            assert set(legacy_result) == set(stream_result), "extractors disagree"
+            print(f"{size:>8} | {legacy_pdf:>10.2f}s | {stream_pdf:>10.2f}s | "
+                  f"{legacy_scan_time:>10.3f}s | {stream_scan_time:>10.3f}s | {legacy_pdf / stream_pdf:>6.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("sizes", nargs="*", type=int, default=DEFAULT_SIZES, metavar="SIZE",
+                        help="numbers per generated PDF (default: %(default)s)")
+    run(parser.parse_args().sizes)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Group-creation throughput before and after the streamlined flow, on the offline mock.
+
+before: the original flow - fixed sleeps around every dialog step, 2s per
+        member, 10s after Create, a page refresh (+5s) and a character-by-character
+        search to reopen the group, then 5s "chat stabilize" and 3s after sending.
+after:  group_creation as it is now - condition-based waits, unique group names
+        and posting straight into the group WhatsApp opens after Create.
+
+The mock keeps its groups in page memory, so the "before" run replaces the page
+refresh with Escape; only its fixed 5s wait is kept. Real refreshes are slower,
+so the "before" figures are on the generous side.
+
+Run from the repository root:
+    python -m benchmarks.bench_groups --groups 3 --batch-size 3
+"""
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support.ui import WebDriverWait
+import argparse
+import contextlib
+import io
+import time
+
+from benchmarks.bench_e2e import start_mock_server, start_headless_chrome, synthetic_numbers
+from group_creation import send_message_and_images, unique_group_name
+from locators import present, clickable, find_all, new_view, clear_cache
+from selenium_transport import SeleniumTransport, create_single_group, open_new_group
+
+def legacy_create_group(driver, wait, batch_contacts, group_name):
+    wait.until(clickable('new_chat_button')).click()
+    time.sleep(2)
+    wait.until(clickable('new_group_option')).click()
+    time.sleep(3)
+    input_box = wait.until(present('member_input'))
+    added_count = 0
+    for phone in batch_contacts:
+        input_box.send_keys(phone)
+        time.sleep(2)
+        if find_all(driver, 'no_results'):
+            input_box.send_keys(Keys.CONTROL + "a", Keys.DELETE)
+        else:
+            input_box.send_keys(Keys.ENTER)
+            added_count += 1
+            time.sleep(0.5)
+    if added_count == 0:
+        return False
+    wait.until(clickable('members_next')).click()
+    time.sleep(2)
+    wait.until(present('group_subject')).send_keys(group_name)
+    time.sleep(1)
+    for name in ('group_permissions', 'group_permission_toggle', 'group_permissions_back'):
+        wait.until(clickable(name)).click()
+        time.sleep(1)
+    wait.until(clickable('group_create')).click()
+    time.sleep(10)
+    return True
+
+def legacy_reopen_and_send(driver, wait, group_name, message):
+    # Stand-in for driver.refresh() + time.sleep(5)
+    driver.find_element("tag name", "body").send_keys(Keys.ESCAPE)
+    time.sleep(5)
+    new_view()
+    search_box = wait.until(present('search_box'))
+    search_box.click()
+    time.sleep(1)
+    search_box.send_keys(Keys.CONTROL + "a")
+    search_box.send_keys(Keys.BACKSPACE)
+    time.sleep(0.5)
+    for char in group_name:
+        search_box.send_keys(char)
+        time.sleep(0.05)
+    time.sleep(3)
+    new_view()
+    search_box.send_keys(Keys.ENTER)
+    time.sleep(3)
+    time.sleep(5)  # "Waiting for chat to stabilize"
+    message_box = wait.until(present('message_box'))
+    message_box.send_keys(message)
+    message_box.send_keys(Keys.ENTER)
+    time.sleep(3)
+
+def run(driver, wait, numbers, args, legacy):
+    created = 0
+    started = time.perf_counter()
+    for i in range(args.groups):
+        batch = numbers[i * args.batch_size:(i + 1) * args.batch_size]
+        group_name = unique_group_name("Legacy Group" if legacy else "Bench Group", i + 1)
+        with contextlib.redirect_stdout(io.StringIO()):
+            if legacy:
+                if legacy_create_group(driver, wait, batch, group_name):
+                    legacy_reopen_and_send(driver, wait, group_name, args.message)
+                    created += 1
+            elif create_single_group(driver, wait, batch, group_name):
+                if open_new_group(driver, wait, group_name):
+                    send_message_and_images(SeleniumTransport(driver), group_name, args.message)
+                created += 1
+    return created, time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--groups", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=3, help="members per group")
+    parser.add_argument("--latency", type=int, default=150, help="mock render latency in ms")
+    parser.add_argument("--message", default="Welcome to the group!")
+    args = parser.parse_args()
+
+    server, url = start_mock_server()
+    numbers = synthetic_numbers(args.groups * args.batch_size)
+    print(f"{'flow':>7} | {'groups':>6} | {'seconds':>8} | {'s/group':>8} | {'groups/hour':>11}")
+    print("-" * 53)
+    try:
+        for label, legacy in (("before", True), ("after", False)):
+            driver = start_headless_chrome()
+            try:
+                driver.get(f"{url}?latency={args.latency}")
+                wait = WebDriverWait(driver, 30)
+                clear_cache()
+                wait.until(present('search_box'))
+                created, elapsed = run(driver, wait, numbers, args, legacy)
+            finally:
+                driver.quit()
+            per_group = elapsed / max(created, 1)
+            print(f"{label:>7} | {created:>6} | {elapsed:>7.1f}s | {per_group:>7.1f}s | {3600 / per_group:>11.0f}")
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Startup cost of each entry point, measured in fresh interpreters.
+
+For every case a new Python process runs the statement and reports how long it
+took and which heavy packages (Selenium, pandas, NumPy, PyPDF2) it pulled in.
+Every case must load none of them: the CLI's help, and importing contact_sources,
+main and group_creation (PyPDF2 and pandas are imported when a file is read,
+Selenium when Chrome is started). Exits with status 1 if a light case loads a
+heavy package or goes over --max-ms; tests/test_imports.py runs the same check.
+
+Run from the repository root:
+    python -m benchmarks.bench_imports --runs 5 --max-ms 150
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+HEAVY = ['selenium', 'pandas', 'numpy', 'PyPDF2']
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # The cases import the repository's modules
+
+# (label, statement, must stay light)
+CASES = [
+    ("cli --help", "import cli; cli.main(['--help'])", True),
+    ("cli send --help", "import cli; cli.main(['send', '--help'])", True),
+    ("cli not-found --help", "import cli; cli.main(['not-found', '--help'])", True),
+    ("import contact_sources (dry run, contacts)", "import contact_sources", True),
+    ("import main (old entry point)", "import main", True),
+    ("import group_creation (old entry point)", "import group_creation", True),
+]
+
+CHILD = """
+import contextlib, io, json, sys, time
+started = time.perf_counter()
+error = None
+with contextlib.redirect_stdout(io.StringIO()):
+    try:
+        exec(compile({statement!r}, '<bench>', 'exec'))
+    except SystemExit:
+        pass
+    except ImportError as e:
+        error = str(e)
+elapsed = time.perf_counter() - started
+heavy = sorted({{m.split('.')[0] for m in sys.modules}} & set({heavy!r}))
+sys.__stdout__.write(json.dumps({{'seconds': elapsed, 'heavy': heavy, 'error': error}}))
+"""
+
+def measure(statement):
+    """(seconds spent importing/running, seconds for the whole process, heavy packages loaded, import error)"""
+    started = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", CHILD.format(statement=statement, heavy=HEAVY)],
+                            capture_output=True, text=True, check=True, cwd=ROOT).stdout
+    total = time.perf_counter() - started
+    result = json.loads(output)
+    return result['seconds'], total, result['heavy'], result['error']
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="processes per case; the fastest is reported")
+    parser.add_argument("--max-ms", type=float, default=None, help="fail if a light case takes longer to import")
+    args = parser.parse_args()
+
+    baseline = min(measure("pass")[1] for _ in range(args.runs))
+    print(f"Interpreter startup: {baseline * 1000:.0f}ms (included in 'process')\n")
+    print(f"{'case':<44} | {'import':>8} | {'process':>8} | heavy packages loaded")
+    print("-" * 96)
+    failures = []
+    for label, statement, light in CASES:
+        runs = [measure(statement) for _ in range(args.runs)]
+        seconds = min(run[0] for run in runs)
+        total = min(run[1] for run in runs)
+        heavy, error = runs[0][2], runs[0][3]
+        loaded = ", ".join(heavy) or "-"
+        if error:
+            loaded = f"n/a ({error})"
+        print(f"{label:<44} | {seconds * 1000:>6.0f}ms | {total * 1000:>6.0f}ms | {loaded}")
+        if light and heavy:
+            failures.append(f"{label} loads {', '.join(heavy)}")
+        if light and args.max_ms is not None and seconds * 1000 > args.max_ms:
+            failures.append(f"{label} took {seconds * 1000:.0f}ms (limit {args.max_ms:.0f}ms)")
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark: structured record extraction vs the regex scan of the flattened text.
+
+Generates contact PDFs in create_pdf.py's layout (Person N / Name / Phone /
+Email / Address, plus an Employee ID line) where addresses and IDs hold long
+digit runs, the way real exports do. For each size it times:
+  - regex: contact_extractor.iter_contacts_from_pdf (every candidate in the text)
+  - records: extraction_cache.read_pdf_records parsing the PDF (page-parallel)
+  - cached: read_pdf_records again, loading the table from the cache
+and the text phase on its own (pages already extracted by PyPDF2), where the
+two parsers differ. "stray" counts numbers that are not a contact's phone, i.e.
+what would later fail at the WhatsApp search step.
+
+Run from the repository root:
+    python -m benchmarks.bench_records [sizes...]      # default 1000 10000 100000
+    python -m benchmarks.bench_records 500 5000
+"""
+from fpdf import FPDF
+from contact_extractor import iter_contacts_from_pdf, iter_page_numbers
+from contact_records import parse_records
+from extraction_cache import read_pdf_records
+from phone_numbers import canonical_digits
+import PyPDF2
+import argparse
+import contextlib
+import io
+import os
+import random
+import tempfile
+import time
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+def generate_pdf(path, count, seed=42):
+    """Writes `count` person blocks; returns the set of their canonical phone numbers."""
+    rng = random.Random(seed)
+    phones = set()
+    pdf = FPDF()
+    pdf.set_auto_page_break(True, margin=10)
+    pdf.add_page()
+    pdf.set_font("Arial", 'B', 14)
+    pdf.cell(0, 10, "Dummy Persons List", ln=True, align="C")
+    pdf.set_font("Arial", '', 9)
+    for i in range(1, count + 1):
+        phone = f"+977 98{rng.randint(0, 9)}-{rng.randint(1000000, 9999999)}"
+        phones.add(canonical_digits(phone))
+        lines = [
+            f"Person {i}",
+            f"Name: Person {i} Sharma",
+            f"Phone: {phone}",
+            f"Email: person{i}@example.com",
+            f"Address: Plot {rng.randint(10000000, 99999999)}, Ward {rng.randint(1, 32)}, Kathmandu, Nepal",
+            f"Employee ID: {rng.randint(1000000000, 9999999999)}",
+        ]
+        pdf.multi_cell(0, 4, "\n".join(lines))
+    pdf.output(path)
+    return phones
+
+def read_pages(path):
+    with open(path, 'rb') as file:
+        return [page.extract_text() or "" for page in PyPDF2.PdfReader(file).pages]
+
+def regex_scan(pages):
+    seen = {}
+    for text in pages:
+        for number in iter_page_numbers(text):
+            seen.setdefault(number, None)
+    return list(seen)
+
+def stray(numbers, phones):
+    return sum(canonical_digits(number) not in phones for number in set(numbers))
+
+def timed(func, *args, **kwargs):
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = func(*args, **kwargs)
+    return time.perf_counter() - started, result
+
+def run(sizes):
+    print(f"{'records':>8} | {'regex pdf':>10} | {'records pdf':>11} | {'cached':>8} | "
+          f"{'regex text':>10} | {'records text':>12} | {'rec/s (text)':>12} | {'stray regex':>11} | {'stray rec':>9}")
+    print("-" * 116)
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_file = os.path.join(tmp, "contacts_cache.sqlite")
+        for size in sizes:
+            path = os.path.join(tmp, f"records_{size}.pdf")
+            phones = generate_pdf(path, size)
+            pages = read_pages(path)
+
+            regex_pdf, regex_numbers = timed(lambda: list(iter_contacts_from_pdf(path)))
+            records_pdf, table = timed(read_pdf_records, path, force_reparse=True, cache_file=cache_file)
+            cached, cached_table = timed(read_pdf_records, path, cache_file=cache_file)
+            regex_text, _ = timed(regex_scan, pages)
+            records_text, text_table = timed(parse_records, pages)
+
+            assert len(table) == size and len(text_table) == size, f"expected {size} records, got {len(table)}"
+            assert cached_table.equals(table), "cached table differs from the parsed one"
+            assert (table['confidence'] == 'high').all(), "a generated record came out low confidence"
+            print(f"{size:>8} | {regex_pdf:>9.2f}s | {records_pdf:>10.2f}s | {cached:>7.2f}s | "
+                  f"{regex_text:>9.3f}s | {records_text:>11.3f}s | {size / records_text:>12,.0f} | "
+                  f"{stray(regex_numbers, phones):>11} | {stray(table['phone'], phones):>9}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("sizes", nargs="*", type=int, default=DEFAULT_SIZES, metavar="SIZE",
+                        help="records per generated PDF (default: %(default)s)")
+    run(parser.parse_args().sizes)
+
+if __name__ == "__main__":
+    main()
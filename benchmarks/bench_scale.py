@@ -0,0 +1,143 @@
+"""
+Million-contact load test of everything around the browser.
+
+Generates a CSV of synthetic numbers (with some duplicates) and runs the real
+send_whatsapp_from_pdf over it on a transport.SimulatedTransport. So extraction,
+normalization and dedup, the contact feed, skip checks, the background writer,
+sent ledger, checkpoints, not-found cache, failure ledger, retry pass and pacing
+all run as in production, only without Chrome. With the default --latency-scale 0
+the simulated browser takes no time, so the wall time is the bookkeeping overhead.
+Pacing gets a per-minute limit it never reaches, so it is timed but never waits.
+
+Reports contacts/second, overhead per contact and resident memory every
+--sample-every contacts. The rows time the browser loop; the progress writer
+runs beside it on its own thread, and the row where the retry pass starts also
+includes the writer catching up (wait_idle). Everything is written to a
+temporary folder.
+
+Run from the repository root:
+    python -m benchmarks.bench_scale --contacts 1000000
+    python -m benchmarks.bench_scale --contacts 20000 --latency-scale 0.001
+"""
+import argparse
+import contextlib
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+
+from main import send_whatsapp_from_pdf
+from transport import SimulatedTransport, SIMULATED_FAILURE_RATES
+
+# A limit that is never reached: the token buckets and their periodic state saves
+# still run on every contact, as in production, but never wait
+UNREACHABLE_RATE_LIMITS = {'minute': 10**9}
+
+def rss_mb():
+    """Current resident set size (peak size where /proc isn't available)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+def write_contacts(path, count, duplicate_every):
+    """National numbers, distinct except for a repeat of an earlier one every `duplicate_every` rows."""
+    with open(path, 'w') as f:
+        f.write("name,phone\n")
+        for i in range(count):
+            # 7919 is coprime with 10**8, so i -> number is one-to-one
+            n = (i // duplicate_every if duplicate_every and i % duplicate_every == 0 and i else i) * 7919 % 10**8
+            f.write(f"Contact {i},98{n:08d}\n")
+
+class SampledTransport(SimulatedTransport):
+    """Records time and memory every `every` chats opened."""
+
+    def __init__(self, every, **options):
+        super().__init__(**options)
+        self.every = every
+        self.samples = []
+        self.started = None
+
+    def open_chat(self, phone_number):
+        if self.started is None:
+            self.started = time.perf_counter()
+        if self.calls['open_chat'] % self.every == 0:
+            sample = (self.calls['open_chat'], time.perf_counter() - self.started, self.simulated_seconds, rss_mb())
+            self.samples.append(sample)
+            sys.__stdout__.write(f"  ... {sample[0]:>9} contacts  {sample[1]:>7.1f}s  {sample[3]:>7.1f}MB\n")
+            sys.__stdout__.flush()
+        return super().open_chat(phone_number)
+
+def transport_elapsed(transport):
+    return time.perf_counter() - transport.started if transport.started else 0.0
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contacts", type=int, default=1000000)
+    parser.add_argument("--duplicate-every", type=int, default=50, help="every Nth row repeats an earlier number")
+    parser.add_argument("--images", type=int, default=1, help="images per contact")
+    parser.add_argument("--latency-scale", type=float, default=0.0, help="multiplier on SIMULATED_LATENCY")
+    parser.add_argument("--failure-scale", type=float, default=1.0, help="multiplier on SIMULATED_FAILURE_RATES")
+    parser.add_argument("--not-found-rate", type=float, default=0.05)
+    parser.add_argument("--sample-every", type=int, default=100000)
+    parser.add_argument("--keep", action="store_true", help="keep the temporary folder for inspection")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_scale-")
+    home = os.getcwd()
+    os.chdir(workdir)
+    try:
+        started = time.perf_counter()
+        write_contacts("contacts.csv", args.contacts, args.duplicate_every)
+        os.makedirs("images")
+        for i in range(args.images):
+            with open(os.path.join("images", f"image_{i}.jpg"), 'wb') as f:
+                f.write(b"\xff\xd8\xff\xd9")
+        print(f"📝 {args.contacts} rows written in {time.perf_counter() - started:.1f}s ({workdir})")
+
+        transport = SampledTransport(
+            args.sample_every, latency_scale=args.latency_scale, not_found_rate=args.not_found_rate,
+            failure_rates={code: rate * args.failure_scale for code, rate in SIMULATED_FAILURE_RATES.items()})
+        rss_before = rss_mb()
+        started = time.perf_counter()
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            send_whatsapp_from_pdf("contacts.csv", "Hello 👋\nSecond line", image_folder="images",
+                                   rate_limits=UNREACHABLE_RATE_LIMITS, prepare_images=False, retry_rounds=1, retry_backoff=0,
+                                   transport=transport)
+        elapsed = time.perf_counter() - started
+        rss_after = rss_mb()
+
+        contacts = transport.calls['open_chat']
+        overhead = elapsed - transport.simulated_seconds
+        print(f"\n📨 {contacts} chats opened in {elapsed:.1f}s ({contacts / max(elapsed, 1e-9):,.0f}/s)")
+        print(f"   Simulated browser time: {transport.simulated_seconds:.1f}s, "
+              f"bookkeeping: {overhead:.1f}s = {overhead / max(contacts, 1) * 1e6:.0f}µs per contact")
+        print(f"   Memory: {rss_before:.0f}MB -> {rss_after:.0f}MB "
+              f"({(rss_after - rss_before) * 1024 / max(contacts, 1):.2f}KB per contact)")
+        print(f"   Injected failures: {transport.failures or 'none'}, not on WhatsApp: {transport.not_found}")
+        print(f"\n{'contacts':>10} | {'seconds':>8} | {'µs/contact':>10} | {'RSS MB':>7}")
+        print("-" * 46)
+        previous = (0, 0.0, 0.0, rss_before)
+        for sample in transport.samples:
+            done = sample[0] - previous[0]
+            if done <= 0:
+                continue
+            work = (sample[1] - previous[1]) - (sample[2] - previous[2])
+            print(f"{sample[0]:>10} | {sample[1]:>8.1f} | {work / done * 1e6:>10.0f} | {sample[3]:>7.0f}")
+            previous = sample
+        print(f"   Last {contacts - previous[0]} contacts, retry pass and shutdown: "
+              f"{transport_elapsed(transport) - previous[1]:.1f}s")
+    finally:
+        os.chdir(home)
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark: peak memory and time of streaming a CSV contact export.
+
+Writes CRM-style CSVs of increasing size and compares loading the whole file
+with pandas (what a convert-then-list approach holds in memory) against
+consuming contact_sources.iter_contacts one number at a time, as the send loop
+does. Peak Python allocations are measured with tracemalloc; the streaming
+column should grow only with the 8-byte-per-number dedup arrays.
+
+Run from the repository root:
+    python -m benchmarks.bench_sources [rows ...]      # default 10000 100000 1000000
+"""
+from contact_sources import iter_contacts
+import pandas as pd
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+
+DEFAULT_SIZES = [10000, 100000, 1000000]
+
+def write_csv(path, rows):
+    with open(path, 'w') as f:
+        f.write("Name,Mobile Number,Email,Address\n")
+        for i in range(rows):
+            f.write(f"Person {i},+977 98{i % 10}-{i:07d},person{i}@example.com,\"Kathmandu, Nepal\"\n")
+
+def measure(func):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+def load_all(path):
+    return len(pd.read_csv(path, dtype=str)["Mobile Number"].tolist())
+
+def stream(path):
+    count = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in iter_contacts(path):
+            count += 1
+    return count
+
+def run(sizes):
+    print(f"{'rows':>9} | {'load all':>9} | {'peak MB':>8} | {'stream':>9} | {'peak MB':>8}")
+    print("-" * 56)
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            path = os.path.join(tmp, f"contacts_{size}.csv")
+            write_csv(path, size)
+            load_time, load_peak, _ = measure(lambda: load_all(path))
+            stream_time, stream_peak, count = measure(lambda: stream(path))
+            assert count == size, f"expected {size} numbers, streamed {count}"
+            print(f"{size:>9} | {load_time:>8.2f}s | {load_peak / 2**20:>8.1f} | "
+                  f"{stream_time:>8.2f}s | {stream_peak / 2**20:>8.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("sizes", nargs="*", type=int, default=DEFAULT_SIZES, metavar="ROWS",
+                        help="rows per generated CSV (default: %(default)s)")
+    run(parser.parse_args().sizes)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Cold start vs warm start of a WhatsApp session, against the offline mock.
+
+Cold: launch a new headless Chrome, load the page and wait for the chat list,
+as every run used to. Warm: attach with session.start_session to a Chrome that
+is already running (started here with --remote-debugging-port) and already
+shows a logged-in WhatsApp tab, so nothing is launched or reloaded.
+
+Run from the repository root:
+    python -m benchmarks.bench_startup --runs 3 --login 2000
+"""
+from selenium import webdriver
+import argparse
+import contextlib
+import io
+import time
+
+from benchmarks.bench_e2e import start_mock_server, start_headless_chrome
+from session import start_session, end_session, wait_until_logged_in
+from locators import clear_cache
+
+DEBUG_PORT = 9333
+
+def cold_start(page):
+    started = time.perf_counter()
+    driver = start_headless_chrome()
+    launched = time.perf_counter()
+    driver.get(page)
+    loaded = time.perf_counter()
+    clear_cache()
+    wait_until_logged_in(driver)
+    done = time.perf_counter()
+    driver.quit()
+    return launched - started, loaded - launched, done - loaded
+
+def warm_start(base_url):
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        driver = start_session(f"127.0.0.1:{DEBUG_PORT}", url=base_url)
+    total = time.perf_counter() - started
+    end_session(driver)
+    return total
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--login", type=int, default=2000, help="mock ms until the chat list appears after a page load")
+    args = parser.parse_args()
+
+    server, base_url = start_mock_server()
+    page = f"{base_url}?login={args.login}"
+
+    # The "already running" browser a warm start attaches to
+    options = webdriver.ChromeOptions()
+    for flag in ("--headless=new", "--no-sandbox", "--disable-dev-shm-usage", "--disable-gpu",
+                 f"--remote-debugging-port={DEBUG_PORT}"):
+        options.add_argument(flag)
+    browser = webdriver.Chrome(options=options)
+    browser.get(page)
+    try:
+        print(f"{'run':>4} | {'launch':>7} | {'load':>7} | {'login':>7} | {'cold':>7} | {'warm':>7}")
+        print("-" * 56)
+        for run in range(1, args.runs + 1):
+            launch, load, login = cold_start(page)
+            warm = warm_start(base_url)
+            print(f"{run:>4} | {launch:>6.2f}s | {load:>6.2f}s | {login:>6.2f}s | "
+                  f"{launch + load + login:>6.2f}s | {warm:>6.2f}s")
+    finally:
+        browser.quit()
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
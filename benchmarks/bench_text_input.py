@@ -0,0 +1,71 @@
+"""
+Keystroke typing vs. one-shot scripted insertion of long multi-line messages.
+
+Opens a chat in the offline mock and, for each message size, times the original
+Shift+Enter keystroke loop against text_input.insert_text, checking that the
+composer shows the same text either way. Emoji are only used for the insertion
+path, since ChromeDriver cannot type characters outside the BMP.
+
+Run from the repository root:
+    python -m benchmarks.bench_text_input --sizes 200 1000 3000
+"""
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+import argparse
+import time
+
+from benchmarks.bench_e2e import start_mock_server, start_headless_chrome
+from text_input import insert_text, type_keystrokes, composer_text, clear_box, normalized
+from locators import LOCATORS
+
+def make_message(chars, emoji=False):
+    line = "Namaste! Special offer this week only, reply YES to join" + (" 🎉" if emoji else "")
+    lines = []
+    while sum(len(l) + 1 for l in lines) < chars:
+        lines.append(f"{len(lines) + 1}. {line}")
+    return "\n".join(lines)
+
+def timed(fn):
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[200, 1000, 3000], help="message lengths in chars")
+    args = parser.parse_args()
+
+    server, url = start_mock_server()
+    driver = start_headless_chrome()
+    try:
+        driver.get(f"{url}?latency=0&jitter=0&missRate=0")
+        wait = WebDriverWait(driver, 30)
+        search_box = wait.until(EC.element_to_be_clickable(LOCATORS['search_box'][0]))
+        search_box.send_keys("+9779800000000")
+        wait.until(EC.presence_of_element_located((By.XPATH, "//*[@id='pane-side']//*[@role='listitem']")))
+        search_box.send_keys(Keys.ENTER)
+        box = wait.until(EC.element_to_be_clickable(LOCATORS['message_box'][0]))
+
+        print(f"{'chars':>7} {'keystrokes':>11} {'insert':>9} {'speedup':>8}  method")
+        for size in args.sizes:
+            plain = make_message(size)
+            box.click()
+            keys_seconds = timed(lambda: type_keystrokes(box, plain))
+            assert normalized(composer_text(driver, box)) == normalized(plain)
+            clear_box(box)
+
+            message = make_message(size, emoji=True)
+            method = []
+            insert_seconds = timed(lambda: method.append(insert_text(driver, box, message)))
+            assert normalized(composer_text(driver, box)) == normalized(message)
+            clear_box(box)
+            print(f"{len(plain):>7} {keys_seconds:>10.2f}s {insert_seconds:>8.3f}s "
+                  f"{keys_seconds / insert_seconds:>7.0f}x  {method[0]}")
+    finally:
+        driver.quit()
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Per-contact time of the original fixed-sleep send_to_contact against the current
+condition-based waits, on the offline mock.
+
+before: the original flow - 0.5s after each Escape, 0.5s after clearing the
+        search, 2s for results, 3s for the chat to open, 0.5s before and 2s after
+        the message (typed line by line), and 1.5s + 1s + 3s + 4s per image.
+after:  main.send_to_contact as it is now, through SeleniumTransport.
+
+Both runs use the same numbers, message and images; the mock's render latency
+(--latency) stands in for WhatsApp's. The fixed sleeps cost the same whatever
+the latency, the waits only as long as the page needs.
+
+Run from the repository root:
+    python -m benchmarks.bench_waits --contacts 10 --latency 150 --images 1
+"""
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.support.ui import WebDriverWait
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import time
+
+from benchmarks.bench_e2e import start_mock_server, start_headless_chrome, synthetic_numbers, IMAGE_FOLDER
+from locators import present, clickable, find_all, new_view, clear_cache
+from main import send_to_contact
+from selenium_transport import SeleniumTransport
+
+def legacy_send_to_contact(driver, wait, phone_number, message, image_files, image_folder):
+    """The original send_to_contact with its sleeps, with XPaths taken from the locator registry."""
+    new_view()
+    actions = ActionChains(driver)
+    actions.send_keys(Keys.ESCAPE).perform()
+    time.sleep(0.5)
+    actions.send_keys(Keys.ESCAPE).perform()
+    time.sleep(0.5)
+
+    search_box = wait.until(present('search_box'))
+    search_box.click()
+    search_box.send_keys(Keys.CONTROL + "a")
+    search_box.send_keys(Keys.DELETE)
+    time.sleep(0.5)
+    search_box.send_keys(phone_number)
+    time.sleep(2.0)
+    if find_all(driver, 'no_results'):
+        search_box.send_keys(Keys.CONTROL + "a")
+        search_box.send_keys(Keys.DELETE)
+        ActionChains(driver).send_keys(Keys.ESCAPE).perform()
+        return False
+    search_box.send_keys(Keys.ENTER)
+    time.sleep(3)
+    new_view()
+
+    message_box = wait.until(present('message_box'))
+    message_box.click()
+    time.sleep(0.5)
+    lines = message.split('\n')
+    for i, line in enumerate(lines):
+        message_box.send_keys(line)
+        if i < len(lines) - 1:
+            message_box.send_keys(Keys.SHIFT + Keys.ENTER)
+    time.sleep(0.5)
+    message_box.send_keys(Keys.ENTER)
+    time.sleep(2)
+
+    for image_file in image_files:
+        wait.until(clickable('attach_button')).click()
+        time.sleep(1.5)
+        wait.until(clickable('photos_option')).click()
+        time.sleep(1)
+        wait.until(present('file_input')).send_keys(os.path.abspath(os.path.join(image_folder, image_file)))
+        time.sleep(3)
+        wait.until(clickable('media_send_button')).click()
+        time.sleep(4)
+    return True
+
+def run(driver, wait, numbers, args, image_files, legacy):
+    """Seconds per contact that got the message (numbers with no results are left out)."""
+    transport = SeleniumTransport(driver)
+    timings = []
+    for phone in numbers:
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            if legacy:
+                sent = legacy_send_to_contact(driver, wait, phone, args.message, image_files, IMAGE_FOLDER)
+            else:
+                results = send_to_contact(transport, phone, args.message, image_files, IMAGE_FOLDER)
+                sent = results['message_sent']
+        if sent:
+            timings.append(time.perf_counter() - started)
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contacts", type=int, default=10)
+    parser.add_argument("--images", type=int, default=0, help="images from images/ per contact")
+    parser.add_argument("--latency", type=int, default=150, help="mock render latency in ms")
+    parser.add_argument("--message", default="Hello from the benchmark 👋\nSecond line")
+    args = parser.parse_args()
+
+    server, url = start_mock_server()
+    numbers = synthetic_numbers(args.contacts)
+    image_files = sorted(f for f in os.listdir(IMAGE_FOLDER)
+                         if f.lower().endswith(('.png', '.jpg', '.jpeg')))[:args.images]
+    print(f"{'flow':>7} | {'sent':>5} | {'mean s':>7} | {'p50 s':>6} | {'max s':>6} | {'contacts/hour':>13}")
+    print("-" * 60)
+    try:
+        for label, legacy in (("before", True), ("after", False)):
+            driver = start_headless_chrome()
+            try:
+                # missRate=0 so every contact goes through the full flow
+                driver.get(f"{url}?latency={args.latency}&missRate=0")
+                wait = WebDriverWait(driver, 30)
+                clear_cache()
+                wait.until(present('search_box'))
+                timings = run(driver, wait, numbers, args, image_files, legacy)
+            finally:
+                driver.quit()
+            if not timings:
+                print(f"{label:>7} | {0:>5} | {'-':>7} | {'-':>6} | {'-':>6} | {'-':>13}")
+                continue
+            mean = statistics.mean(timings)
+            print(f"{label:>7} | {len(timings):>5} | {mean:>7.2f} | {statistics.median(timings):>6.2f} | "
+                  f"{max(timings):>6.2f} | {3600 / mean:>13.0f}")
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
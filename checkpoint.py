@@ -0,0 +1,166 @@
+from contact_extractor import normalize_phone
+from phone_numbers import DEFAULT_COUNTRY_CODE
+from tracing import span
+import json
+import os
+import tempfile
+import time
+
+PROGRESS_FILE = "whatsapp_progress.json"
+PROGRESS_JOURNAL_FILE = "whatsapp_progress.journal"
+CHECKPOINT_EVERY = 10  # Contacts between checkpoints
+CHECKPOINT_SECONDS = 30  # ...or at most this long, whichever comes first
+
+def atomic_write_json(path, data):
+    """Writes JSON to a temp file in the same folder, fsyncs it and renames it over `path`."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def read_journal(path):
+    """
+    Yields the entries of a JSONL journal. A corrupt line in the middle is skipped;
+    a torn last line (a crash mid-append) is cut off so later appends start clean.
+    """
+    if not os.path.exists(path):
+        return
+    offset = 0
+    torn_at = None
+    with open(path, 'rb') as f:
+        for line in f:
+            start, offset = offset, offset + len(line)
+            try:
+                if not line.endswith(b'\n'):
+                    raise ValueError("incomplete line")
+                entry = json.loads(line)
+            except ValueError:
+                torn_at = start
+                continue
+            if torn_at is not None:
+                print(f"⚠️ Skipping corrupt journal entry in {path} (byte {torn_at})")
+                torn_at = None
+            yield entry
+    if torn_at is not None:
+        print("⚠️ Discarding truncated journal entry")
+        os.truncate(path, torn_at)
+
+def append_journal(path, lines):
+    """Appends already-serialized JSON lines and fsyncs them."""
+    with open(path, 'a') as f:
+        f.write('\n'.join(lines) + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+
+class Checkpoint:
+    """
+    Crash-safe campaign progress.
+    Every processed contact is appended to a JSONL journal (keyed by normalized phone
+    number); the small summary in whatsapp_progress.json is replaced atomically. Both
+    are written every `every` contacts or `seconds` seconds, so the per-contact cost
+    stays constant however long the run gets. National numbers in old journals get `country_code`.
+    """
+
+    def __init__(self, progress_file=PROGRESS_FILE, journal_file=PROGRESS_JOURNAL_FILE,
+                 every=CHECKPOINT_EVERY, seconds=CHECKPOINT_SECONDS, country_code=DEFAULT_COUNTRY_CODE):
+        self.progress_file = progress_file
+        self.journal_file = journal_file
+        self.every = max(1, every)
+        self.seconds = seconds
+        self.country_code = country_code
+        self.processed = {}
+        self.failed_contacts = {}  # phone -> error, so a retried contact is dropped in O(1)
+        self.success_count = 0
+        self.failed_count = 0
+        self.current_index = 0
+        self.last_contact = None
+        self.legacy_index = None
+        self.buffer = []
+        self.last_flush = time.monotonic()
+
+    def __contains__(self, phone_number):
+        return normalize_phone(phone_number, self.country_code) in self.processed
+
+    def load(self):
+        """Rebuilds state from the journal. Returns True if there was anything to resume."""
+        for entry in read_journal(self.journal_file):
+            self._apply(entry)
+        if os.path.exists(self.progress_file):
+            try:
+                with open(self.progress_file, 'r') as f:
+                    summary = json.load(f)
+                self.current_index = summary.get('current_index', 0)
+                # Progress files written before the journal existed only have a position
+                if not self.processed:
+                    self.legacy_index = self.current_index
+            except Exception as e:
+                print(f"⚠️ Progress summary unreadable ({e}), rebuilt from journal")
+        return bool(self.processed) or bool(self.legacy_index)
+
+    def reset(self):
+        """Starts a fresh campaign, discarding any previous journal."""
+        for path in (self.journal_file, self.progress_file):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _apply(self, entry):
+        # Journals written before E.164 normalization hold national numbers
+        phone = normalize_phone(entry['phone'], self.country_code)
+        previous = self.processed.get(phone)
+        if previous == 'failed':
+            self.failed_count -= 1
+            del self.failed_contacts[phone]
+        elif previous == 'sent':
+            self.success_count -= 1
+        self.processed[phone] = entry['status']
+        if entry['status'] == 'sent':
+            self.success_count += 1
+        else:
+            self.failed_count += 1
+            self.failed_contacts[phone] = entry.get('error')
+        self.last_contact = phone
+
+    def record(self, phone_number, status, error=None, index=None):
+        """Records a processed contact ('sent' or 'failed'); checkpoints when due."""
+        entry = {'phone': normalize_phone(phone_number, self.country_code), 'status': status}
+        if error:
+            entry['error'] = error
+        self._apply(entry)
+        if index is not None:
+            self.current_index = index + 1
+        self.buffer.append(json.dumps(entry, ensure_ascii=False))
+        if len(self.buffer) >= self.every or time.monotonic() - self.last_flush >= self.seconds:
+            self.flush()
+
+    def summary(self, include_failed=False):
+        data = {
+            'current_index': self.current_index,
+            'total_contacts': len(self.processed),
+            'success_count': self.success_count,
+            'failed_count': self.failed_count,
+            'last_contact': self.last_contact,
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')
+        }
+        # The full list lives in the journal; it is only copied here on close to keep checkpoints O(1)
+        if include_failed:
+            data['failed_contacts'] = [{'phone': phone, 'error': error} for phone, error in self.failed_contacts.items()]
+        return data
+
+    def flush(self, include_failed=False):
+        with span("checkpoint_write", entries=len(self.buffer)):
+            if self.buffer:
+                append_journal(self.journal_file, self.buffer)
+                self.buffer = []
+            atomic_write_json(self.progress_file, self.summary(include_failed))
+        self.last_flush = time.monotonic()
+
+    def close(self):
+        self.flush(include_failed=True)
@@ -0,0 +1,303 @@
+import argparse
+import contextlib
+import itertools
+import json
+import sys
+import time
+
+# ==========================================
+# COMMAND LINE
+# One entry point for both workflows, installed as `whatsapp-automation`
+# (pip install .) or run as `python cli.py`:
+#     whatsapp-automation send contacts.pdf --message-file message.txt --images images/
+#     whatsapp-automation create-groups contacts.csv --batch-size 5 --message "Welcome!"
+#     whatsapp-automation contacts contacts.pdf export.vcf --output numbers.txt
+#     whatsapp-automation not-found stats | list | expire | remove NUMBER ... | clear
+# Settings can also come from a JSON file (--config campaign.json) whose keys are
+# the option names below (e.g. "pdf_file", "rate_limits"); flags override it.
+# Nothing heavy is imported at module level: --help and config errors load
+# neither Selenium nor pandas, and --dry-run / `contacts` never load Selenium.
+# ==========================================
+
+def rate_limit(text):
+    """'hour=100' -> ('hour', 100)"""
+    window, _, limit = text.partition('=')
+    try:
+        return window.strip(), int(limit)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WINDOW=N (e.g. hour=100), got {text!r}")
+
+def add_common_options(parser):
+    parser.add_argument("pdf_file", nargs="*", metavar="CONTACTS",
+                        help="contact files (.pdf, .csv, .xlsx, .vcf); several are read in order")
+    parser.add_argument("--config", metavar="FILE", help="JSON file with any of these options; flags override it")
+    parser.add_argument("--message", help="text to send")
+    parser.add_argument("--message-file", metavar="FILE", help="read the message from a UTF-8 text file")
+    parser.add_argument("--images", dest="image_folder", metavar="FOLDER", help="folder with the images to send")
+    parser.add_argument("--country-code", help="country code for numbers without a +/00 prefix (default 977)")
+    parser.add_argument("--force-reparse", action="store_true", help="ignore the extraction cache")
+    parser.add_argument("--fresh", dest="resume", action="store_false",
+                        help="start a new campaign instead of resuming the previous one")
+    parser.add_argument("--rate", dest="rate_limits", type=rate_limit, action="append", metavar="WINDOW=N",
+                        help="most sends (or groups) per minute/hour/day, e.g. --rate hour=100 (repeatable)")
+    parser.add_argument("--one-by-one", dest="batch_images", action="store_false",
+                        help="upload images one at a time instead of as one album")
+    parser.add_argument("--original-images", dest="prepare_images", action="store_false",
+                        help="upload the original images instead of downscaled copies")
+    parser.add_argument("--attach", dest="debugger_address", metavar="HOST:PORT",
+                        help="attach to a running, logged-in Chrome started with --remote-debugging-port")
+    parser.add_argument("--trace", dest="trace_file", metavar="FILE", help="record per-step timings (JSONL)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="read the contacts and show what would be done, without starting Chrome")
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="whatsapp-automation", argument_default=argparse.SUPPRESS,
+                                     description="Bulk WhatsApp messaging and group creation.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    send = commands.add_parser("send", argument_default=argparse.SUPPRESS,
+                               help="message every contact (send_whatsapp_from_pdf)")
+    add_common_options(send)
+    send.add_argument("--caption", dest="caption_images", action="store_true",
+                      help="put the message in the album caption")
+    send.add_argument("--start-index", type=int, help="skip this many contacts from the start")
+    send.add_argument("--checkpoint-every", type=int, help="contacts between progress checkpoints")
+    send.add_argument("--retry-rounds", type=int, help="end-of-run retry passes over transient failures (0: none)")
+    send.add_argument("--retry-backoff", type=float, help="seconds before the first retry pass, doubled per pass")
+
+    groups = commands.add_parser("create-groups", argument_default=argparse.SUPPRESS,
+                                 help="create one group per batch of contacts (main_group_creator)")
+    add_common_options(groups)
+    groups.add_argument("--image", dest="image_files", action="append", metavar="NAME",
+                        help="image in the --images folder to post (repeatable; default: all of them)")
+    groups.add_argument("--no-images", dest="image_files", action="store_const", const=[], help="post no images")
+    groups.add_argument("--batch-size", type=int, help="contacts per group")
+    groups.add_argument("--prefix", dest="name_prefix", help="group name prefix")
+
+    contacts = commands.add_parser("contacts", argument_default=argparse.SUPPRESS,
+                                   help="extract and normalize the numbers only (no browser)")
+    contacts.add_argument("pdf_file", nargs="*", metavar="CONTACTS")
+    contacts.add_argument("--country-code", help="country code for numbers without a +/00 prefix (default 977)")
+    contacts.add_argument("--force-reparse", action="store_true", help="ignore the extraction cache")
+    contacts.add_argument("--output", metavar="FILE", help="write one number per line here instead of stdout")
+    contacts.add_argument("--records", action="store_true",
+                          help="write the PDF records (page, name, phone, email, address, confidence) as CSV")
+
+    not_found = commands.add_parser("not-found", help="inspect or clear the cache of numbers not on WhatsApp")
+    not_found.add_argument("--file", dest="path", help="cache file (default not_found_cache.sqlite)")
+    not_found.add_argument("--country-code", help="country code for numbers without a +/00 prefix (default 977)")
+    actions = not_found.add_subparsers(dest="action", required=True)
+    actions.add_parser("stats", help="entry count, age and time saved so far")
+    actions.add_parser("list", help="cached numbers, most recently checked first").add_argument(
+        "--limit", type=int, help="how many to show (default 50)")
+    actions.add_parser("expire", help="drop entries past the TTL").add_argument(
+        "--days", type=float, help="max age in days (default 30)")
+    actions.add_parser("remove", help="forget specific numbers").add_argument("numbers", nargs="+")
+    actions.add_parser("clear", help="forget every number")
+    return parser, {"send": send, "create-groups": groups, "contacts": contacts, "not-found": not_found}
+
+def load_options(parser, args):
+    """Merges the --config file under the command-line flags and resolves --message-file."""
+    options = {}
+    config_file = args.pop('config', None)
+    if config_file:
+        try:
+            with open(config_file, 'r', encoding='utf-8') as f:
+                options = json.load(f)
+        except (OSError, ValueError) as e:
+            parser.error(f"can't read config {config_file}: {e}")
+        known = {action.dest for action in parser._actions} - {'help', 'config', 'dry_run'}
+        unknown = set(options) - known
+        if unknown:
+            parser.error(f"unknown option(s) in {config_file}: {', '.join(sorted(unknown))} "
+                         f"(valid: {', '.join(sorted(known))})")
+    options.update(args)
+
+    if isinstance(options.get('rate_limits'), list):
+        options['rate_limits'] = dict(options['rate_limits'])
+    if not options.get('pdf_file'):
+        options.pop('pdf_file', None)
+    message_file = options.pop('message_file', None)
+    if message_file:
+        if 'message' in args:
+            parser.error("use either --message or --message-file")
+        try:
+            with open(message_file, 'r', encoding='utf-8') as f:
+                options['message'] = f.read().strip()
+        except OSError as e:
+            parser.error(f"can't read message file: {e}")
+    if 'image_folder' in options and 'image_files' not in options:
+        options['image_files'] = None  # Every image in the given folder
+    return options
+
+def contact_options(options):
+    return {key: options[key] for key in ('country_code', 'force_reparse') if key in options}
+
+def country_option(options):
+    """The --country-code for the ledgers and caches, so stored national numbers match the contacts."""
+    return {key: options[key] for key in ('country_code',) if key in options}
+
+# ==========================================
+# COMMANDS
+# ==========================================
+def run_send(options):
+    from main import send_whatsapp_from_pdf
+
+    options.setdefault('message', "")
+    options.setdefault('resume', True)
+    options.pop('image_files', None)  # send always uses the whole folder
+    return send_whatsapp_from_pdf(**options) is not False
+
+def run_groups(options):
+    from group_creation import main_group_creator
+
+    main_group_creator(**options)
+    return True
+
+def dry_run_send(options):
+    """Counts who would be messaged with the same skip checks as a real run, and how long it would take."""
+    from contact_sources import iter_contacts
+    from checkpoint import Checkpoint
+    from sent_ledger import SentLedger
+    from not_found_cache import NotFoundCache
+    from pipeline import contact_skip_reason
+    from media_cache import list_images
+    from pacing import RateScheduler, SEND_RATE_LIMITS
+
+    started = time.monotonic()
+    checkpoint = Checkpoint(**country_option(options))
+    start_index = options.get('start_index', 0)
+    if options.get('resume', True) and checkpoint.load() and not checkpoint.processed:
+        start_index = checkpoint.legacy_index
+    ledger = SentLedger(**country_option(options))
+    not_found = NotFoundCache(**country_option(options))
+    to_send = 0
+    skipped = {}
+    for phone in itertools.islice(iter_contacts(options['pdf_file'], **contact_options(options)), start_index, None):
+        reason = contact_skip_reason(phone, checkpoint, ledger, not_found)
+        if reason:
+            skipped[reason] = skipped.get(reason, 0) + 1
+        else:
+            to_send += 1
+    not_found.hits.clear()  # A dry run saves no lookups
+    not_found.close()
+    ledger.close()
+
+    print(f"🧪 Dry run: {to_send} contacts to message, {sum(skipped.values())} skipped "
+          f"({time.monotonic() - started:.1f}s to read)")
+    for reason, count in skipped.items():
+        print(f"   {reason}: {count}")
+    images = list_images(options.get('image_folder'))
+    print(f"   Message: {len(options.get('message') or '')} characters, images: {len(images)}")
+    scheduler = RateScheduler(options.get('rate_limits', SEND_RATE_LIMITS))
+    print(f"   ⏱️ {scheduler.describe_eta(to_send)}")
+    return True
+
+def dry_run_groups(options):
+    """Counts the groups that would be created or resumed, and how long that would take."""
+    from contact_sources import iter_contacts
+    from group_ledger import GroupLedger, batch_key, GROUP_BATCH_SIZE
+    from not_found_cache import NotFoundCache
+    from pacing import RateScheduler, GROUP_RATE_LIMITS, GROUP_PACING_STATE_FILE
+
+    ledger = GroupLedger()
+    if options.get('resume', True):
+        ledger.load()
+    not_found = NotFoundCache(**country_option(options))
+    batch_size = options.get('batch_size', GROUP_BATCH_SIZE)
+    contacts = iter_contacts(options['pdf_file'], **contact_options(options))
+    statuses = {}
+    cached = 0
+    while True:
+        batch = list(itertools.islice(contacts, batch_size))
+        if not batch:
+            break
+        status = ledger.get(batch_key(batch)).get('status') or 'new'
+        statuses[status] = statuses.get(status, 0) + 1
+        if status != 'done':
+            cached += sum(phone in not_found for phone in batch)
+    not_found.close()
+
+    to_do = sum(statuses.values()) - statuses.get('done', 0)
+    print(f"🧪 Dry run: {to_do} groups to create or finish ({statuses.get('new', 0)} new), "
+          f"{statuses.get('done', 0)} already done, {batch_size} contacts per group")
+    if cached:
+        print(f"   {cached} members will be left out (not on WhatsApp, cached)")
+    scheduler = RateScheduler(options.get('rate_limits', GROUP_RATE_LIMITS), GROUP_PACING_STATE_FILE)
+    print(f"   ⏱️ {scheduler.describe_eta(to_do)}")
+    return True
+
+def extract_contacts(options):
+    from contact_sources import iter_contacts
+
+    started = time.monotonic()
+    output = open(options['output'], 'w', encoding='utf-8', newline='') if 'output' in options else sys.stdout
+    count = 0
+    # Progress messages go to stderr, so only the numbers reach stdout and it can be piped
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            if options.get('records'):
+                count = write_records(options, output)
+            else:
+                for phone in iter_contacts(options['pdf_file'], **contact_options(options)):
+                    output.write(phone + "\n")
+                    count += 1
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    if count is None:
+        return False
+    print(f"📇 {count} {'records' if options.get('records') else 'unique numbers'} "
+          f"in {time.monotonic() - started:.1f}s", file=sys.stderr)
+    return True
+
+def write_records(options, output):
+    """CSV of every PDF's records table, with a leading file column; None if a file isn't a PDF."""
+    from contact_sources import read_records
+
+    sources = options['pdf_file']
+    if isinstance(sources, str):
+        sources = [sources]
+    not_pdf = [source for source in sources if not source.lower().endswith('.pdf')]
+    if not_pdf:
+        print(f"❌ --records needs PDF files: {', '.join(not_pdf)}")
+        return None
+    count = low = 0
+    for i, source in enumerate(sources):
+        frame = read_records(source, force_reparse=options.get('force_reparse', False))
+        frame.insert(0, 'file', source)
+        frame.to_csv(output, index=False, header=i == 0)
+        count += len(frame)
+        low += int((frame['confidence'] == 'low').sum())
+    if low:
+        print(f"⚠️ {low} low-confidence records (scanned, or a phone field with several or no valid numbers): "
+              f"check the confidence column")
+    return count
+
+def not_found_command(options):
+    from not_found_cache import run_command
+
+    run_command(**{key: value for key, value in options.items() if value is not None})
+    return True
+
+COMMANDS = {
+    "send": (run_send, dry_run_send),
+    "create-groups": (run_groups, dry_run_groups),
+    "contacts": (extract_contacts, extract_contacts),
+}
+
+def main(argv=None):
+    parser, subparsers = build_parser()
+    args = vars(parser.parse_args(argv))
+    command = args.pop('command')
+    if command == "not-found":
+        return 0 if not_found_command(args) else 1
+    dry_run = args.pop('dry_run', False)
+    options = load_options(subparsers[command], args)
+    if 'pdf_file' not in options and (command != "create-groups" or dry_run):
+        subparsers[command].error("no contact files given (as arguments or \"pdf_file\" in --config)")
+    run, dry = COMMANDS[command]
+    return 0 if (dry if dry_run else run)(options) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+from phone_numbers import canonical_digits, DEFAULT_COUNTRY_CODE
+import re
+
+# Compiled once at import instead of on every page/match
+PHONE_PATTERNS = [
+    re.compile(r'\+?\d{1,4}[-.\s]?\(?\d{1,4}\)?[-.\s]?\d{1,4}[-.\s]?\d{1,9}'),
+    re.compile(r'\d{10}')
+]
+SEPARATOR_PATTERN = re.compile(r'[-.\s()]')
+
+def iter_page_numbers(text):
+    """Yields every valid (8-15 digit) candidate in a block of text, in pattern order."""
+    for pattern in PHONE_PATTERNS:
+        for match in pattern.findall(text):
+            cleaned = SEPARATOR_PATTERN.sub('', match)
+            if 8 <= len(cleaned) <= 15:
+                yield cleaned
+
+def iter_contacts_from_pdf(pdf_file, seen=None):
+    """
+    Streams phone numbers out of a PDF page by page.
+    Numbers are deduplicated with a set, keeping first-seen order. Pass a shared
+    `seen` set to deduplicate across several PDFs.
+    """
+    import PyPDF2
+
+    if seen is None:
+        seen = set()
+    found = 0
+    try:
+        print(f"📄 Reading PDF file: {pdf_file}")
+        with open(pdf_file, 'rb') as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            for page in pdf_reader.pages:
+                for number in iter_page_numbers(page.extract_text() or ""):
+                    if number not in seen:
+                        seen.add(number)
+                        found += 1
+                        yield number
+        print(f"  ✓ Found {found} phone numbers")
+    except Exception as e:
+        print(f"  ❌ Error reading PDF: {e}")
+
+def extract_contacts_from_pdf(pdf_file):
+    """Eager variant of iter_contacts_from_pdf, for callers that need the whole list."""
+    return list(iter_contacts_from_pdf(pdf_file))
+
+def normalize_phone(phone_number, country_code=DEFAULT_COUNTRY_CODE):
+    """
+    Identity used for resume/dedup bookkeeping: the number's E.164 digits, so that
+    '+977 976-1445644' and '9761445644' are the same contact (national numbers
+    get `country_code`). Falls back to the bare digits for numbers that are not valid E.164.
+    """
+    return canonical_digits(phone_number, country_code) or re.sub(r'\D', '', phone_number)
@@ -0,0 +1,152 @@
+from contact_extractor import iter_page_numbers
+from phone_numbers import canonical_digits
+import re
+
+# ==========================================
+# STRUCTURED CONTACT RECORDS
+# Contact PDFs like the one create_pdf.py writes hold labelled blocks:
+#     Person 1
+#     Name: Ramesh Sharma
+#     Phone: +977 976-1445644
+#     Email: ramesh.sharma@example.com
+#     Address: Kathmandu, Nepal
+# Each page is tokenized with one regex pass over its text, and the tokens are
+# assembled into one row per block and number (a block may continue on the next page). The
+# phone comes only from the labelled field, so digit runs in addresses or IDs
+# are never mistaken for numbers. Pages without any labelled field fall back to
+# scanning the whole text with the PHONE_PATTERNS, as before.
+# ==========================================
+RECORD_COLUMNS = ['page', 'name', 'phone', 'email', 'address', 'confidence']
+# Lower-cased label -> column; lines with other labels (ID, Notes, ...) are ignored
+FIELD_LABELS = {
+    'name': 'name', 'full name': 'name', 'contact name': 'name',
+    'phone': 'phone', 'phone number': 'phone', 'mobile': 'phone', 'mobile number': 'phone',
+    'cell': 'phone', 'tel': 'phone', 'telephone': 'phone', 'whatsapp': 'phone',
+    'email': 'email', 'e-mail': 'email',
+    'address': 'address',
+}
+# 'high': the number came from a labelled phone field holding exactly one valid number
+# 'low': scanned from unlabelled text, or the labelled field held several numbers
+#        (one row each) or none that is valid
+CONFIDENCE_LEVELS = ['low', 'high']
+OTHER_LABEL = 'other'
+
+# "Person 12" header, or "Label: value" (values are stripped later); no backtracking, so one pass stays linear
+LINE_PATTERN = re.compile(
+    r'^[ \t]*(?:(?P<header>(?:Person|Contact|Record)[ \t]+\d+)[ \t]*$'
+    r'|(?P<label>[A-Za-z][^:\n]{0,30}):(?P<value>[^\n]*))',
+    re.MULTILINE | re.IGNORECASE
+)
+
+def parse_page(text):
+    """
+    (tokens, scanned) for one page's text. Tokens are (column, value) per labelled
+    field, (None, None) per block header and (OTHER_LABEL, None) per line with a
+    label that isn't a field. On pages without any field `scanned` holds the raw
+    candidates found by scanning the text; RecordBuilder decides whether to use them.
+    """
+    tokens = []
+    labelled = False
+    for header, label, value in LINE_PATTERN.findall(text):
+        if header:
+            tokens.append((None, None))
+            continue
+        column = FIELD_LABELS.get(label.strip().lower())
+        if column is None:
+            tokens.append((OTHER_LABEL, None))
+        else:
+            tokens.append((column, value))
+            labelled = True
+    return tokens, [] if labelled else list(iter_page_numbers(text))
+
+def phone_field_numbers(value):
+    """
+    [(number, confidence)] for the text of a labelled phone field: one entry per
+    distinct valid number, 'high' only when the field holds exactly one number.
+    """
+    candidates = list(iter_page_numbers(value))
+    numbers = {}
+    for candidate in candidates:
+        numbers.setdefault(canonical_digits(candidate), candidate)
+    valid = [number for digits, number in numbers.items() if digits is not None]
+    if not valid:
+        return [(candidates[0] if candidates else value.strip(), 'low')]
+    confidence = 'high' if len(numbers) == 1 else 'low'
+    return [(number, confidence) for number in valid]
+
+class RecordBuilder:
+    """
+    Assembles page tokens into columnar records, in page order. A block ends at
+    the next header or when one of its fields repeats. take() hands over the rows
+    finished so far as a DataFrame; finish() also closes the last block. Blocks
+    without a phone are counted in `without_phone` and dropped.
+    """
+
+    def __init__(self):
+        self.columns = {column: [] for column in RECORD_COLUMNS}
+        self.current = None
+        self.current_page = None
+        self.without_phone = 0
+
+    def add_page(self, page, tokens, scanned):
+        if scanned and tokens and self.current is not None:
+            # Only non-field lines (e.g. "Employee ID: ...") left over from the open block
+            scanned = []
+        for column, value in tokens:
+            if column == OTHER_LABEL:
+                continue
+            if column is None or (self.current is not None and column in self.current):
+                self._close()
+            if column is None:
+                continue
+            if self.current is None:
+                self.current, self.current_page = {}, page
+            self.current[column] = value.strip()
+        if scanned:
+            # An unlabelled page ends the open block, so rows stay in page order
+            self._close()
+        for number in dict.fromkeys(scanned):
+            self._append(page, '', number, '', '', 'low')
+
+    def _close(self):
+        record, self.current = self.current, None
+        if not record:
+            return
+        if not record.get('phone'):
+            self.without_phone += 1
+            return
+        # A field with several numbers ("Phone: 98... / 97...") gives one row per number
+        for phone, confidence in phone_field_numbers(record['phone']):
+            self._append(self.current_page, record.get('name', ''), phone,
+                         record.get('email', ''), record.get('address', ''), confidence)
+
+    def _append(self, *row):
+        for column, value in zip(RECORD_COLUMNS, row):
+            self.columns[column].append(value)
+
+    def take(self):
+        frame = records_frame(self.columns)
+        self.columns = {column: [] for column in RECORD_COLUMNS}
+        return frame
+
+    def finish(self):
+        self._close()
+        return self.take()
+
+def records_frame(columns):
+    """DataFrame with the record columns and dtypes from a dict of column lists."""
+    import pandas as pd
+
+    frame = pd.DataFrame({column: columns.get(column, []) for column in RECORD_COLUMNS})
+    frame['page'] = frame['page'].astype('int32')
+    frame['confidence'] = pd.Categorical(frame['confidence'], categories=CONFIDENCE_LEVELS, ordered=True)
+    for column in ('name', 'phone', 'email', 'address'):
+        frame[column] = frame[column].astype(object)
+    return frame
+
+def parse_records(pages):
+    """Records of a whole document given as page texts (first page is 1); mostly for tests and benchmarks."""
+    builder = RecordBuilder()
+    for page, text in enumerate(pages, start=1):
+        builder.add_page(page, *parse_page(text))
+    return builder.finish()
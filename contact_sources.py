@@ -0,0 +1,165 @@
+from extraction_cache import iter_pdf_chunks, read_pdf_records, ParsePool, CACHE_FILE
+from contact_extractor import iter_page_numbers
+from phone_numbers import CanonicalNumbers, DEFAULT_COUNTRY_CODE
+import re
+import os
+
+# ==========================================
+# CONTACT SOURCES
+# A reader takes a path (plus keyword options it may ignore) and yields lists of
+# raw phone strings, at most CHUNK_ROWS at a time, so memory stays flat however
+# long the list is. Readers are picked by file extension; add your own with
+# register_source(".ext", reader).
+# pandas is imported by the readers that use it, not when this module loads.
+# ==========================================
+CHUNK_ROWS = 10000
+# Whole headers only: "Contact Name", "Order Number" or "ID Number" are not phone columns
+PHONE_COLUMN_PATTERN = re.compile(
+    r'(?:phone|mobile|cell|tel|telephone|whatsapp|phone number|contact number|mobile number)(?: \d+)?',
+    re.IGNORECASE
+)
+HEADER_SEPARATORS = re.compile(r'[\s_.-]+')
+
+def phone_columns(columns):
+    """Header names that look like phone columns; empty if none do (then every cell is scanned)."""
+    return [column for column in columns
+            if PHONE_COLUMN_PATTERN.fullmatch(HEADER_SEPARATORS.sub(' ', str(column)).strip())]
+
+def cell_text(value):
+    """Spreadsheet cells can hold numbers; 9761445644.0 must not become '9761445644.0'."""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+def scan_cells(values):
+    """Raw matches in free-text cells, for files without a recognisable phone column."""
+    numbers = []
+    for value in values:
+        numbers.extend(iter_page_numbers(cell_text(value)))
+    return numbers
+
+def read_csv_chunks(path, chunk_rows=CHUNK_ROWS, **options):
+    import pandas as pd
+
+    columns = phone_columns(pd.read_csv(path, nrows=0).columns)
+    # Without a phone column the first line may well be data, so it is scanned too
+    reader = pd.read_csv(path, dtype=str, usecols=columns or None, header=0 if columns else None,
+                         chunksize=chunk_rows, keep_default_na=False)
+    for frame in reader:
+        if columns:
+            yield [value for value in frame[columns].to_numpy().ravel() if value]
+        else:
+            yield scan_cells(frame.to_numpy().ravel())
+
+def read_xlsx_chunks(path, chunk_rows=CHUNK_ROWS, **options):
+    # pandas.read_excel has no chunksize; openpyxl's read-only mode streams rows instead
+    from openpyxl import load_workbook
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        for sheet in workbook.worksheets:
+            rows = sheet.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                continue
+            indexes = [i for i, name in enumerate(header) if name is not None and phone_columns([name])]
+            chunk = [] if indexes else scan_cells(value for value in header if value is not None)
+            for row in rows:
+                if indexes:
+                    chunk.extend(cell_text(row[i]) for i in indexes if i < len(row) and row[i] is not None)
+                else:
+                    chunk.extend(scan_cells(value for value in row if value is not None))
+                if len(chunk) >= chunk_rows:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+    finally:
+        workbook.close()
+
+def read_vcard_chunks(path, chunk_rows=CHUNK_ROWS, **options):
+    """TEL properties of a .vcf file ("TEL;TYPE=CELL:+977 ...", "item1.TEL:...", "TEL;VALUE=uri:tel:...")."""
+    chunk = []
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            name, _, value = line.partition(':')
+            if not value or name.split(';')[0].split('.')[-1].upper() != 'TEL':
+                continue
+            value = value.strip()
+            if value.lower().startswith('tel:'):
+                value = value[4:]
+            chunk.append(value)
+            if len(chunk) >= chunk_rows:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+SOURCE_READERS = {
+    '.pdf': iter_pdf_chunks,
+    '.csv': read_csv_chunks,
+    '.xlsx': read_xlsx_chunks,
+    '.vcf': read_vcard_chunks,
+}
+
+def register_source(extension, reader):
+    """Adds (or replaces) the reader used for files ending in `extension`."""
+    SOURCE_READERS[extension.lower()] = reader
+
+def read_frame_chunks(frame, chunk_rows=CHUNK_ROWS, **options):
+    """An already extracted records table (e.g. from read_records): its phone column, chunk by chunk."""
+    phones = frame['phone']
+    for start in range(0, len(phones), chunk_rows):
+        yield [phone for phone in phones.iloc[start:start + chunk_rows].tolist() if phone]
+
+def read_records(pdf_file, **options):
+    """
+    The structured records table (page, name, phone, email, address, confidence)
+    of a contact PDF, cached by content hash. Pass the table as `pdf_file` to
+    send_whatsapp_from_pdf / main_group_creator to use it without parsing again.
+    """
+    return read_pdf_records(pdf_file, **options)
+
+def iter_contacts(sources, country_code=DEFAULT_COUNTRY_CODE, **options):
+    """
+    Streams deduplicated '+E.164' numbers from one contact file or a list of them
+    (PDF, CSV, XLSX, vCard, or any registered extension), in file order. A records
+    DataFrame (see read_records) can stand in for a file.
+    Options such as force_reparse / workers / chunk_rows are passed to every reader.
+    Several PDFs share one process pool and are parsed side by side.
+    """
+    if not isinstance(sources, (list, tuple)):
+        sources = [sources]  # One path or one records DataFrame
+    pdf_files = [source for source in sources if isinstance(source, str) and source.lower().endswith('.pdf')]
+    pool = None
+    if len(pdf_files) > 1 and 'pool' not in options:
+        pool = options['pool'] = ParsePool(options.get('workers'))
+    try:
+        if pool is not None:
+            pool.prefetch(pdf_files, options.get('cache_file', CACHE_FILE), options.get('force_reparse', False))
+        yield from _iter_sources(sources, country_code, options)
+    finally:
+        if pool is not None:
+            pool.close()
+
+def _iter_sources(sources, country_code, options):
+    numbers = CanonicalNumbers(country_code)
+    for source in sources:
+        if not isinstance(source, str):  # A records DataFrame
+            chunks = read_frame_chunks(source, **options)
+            source = f"records table ({len(source)} rows)"
+        else:
+            reader = SOURCE_READERS.get(os.path.splitext(source)[1].lower())
+            if reader is None:
+                print(f"  ❌ Unsupported contact file: {source} (supported: {', '.join(SOURCE_READERS)})")
+                continue
+            chunks = reader(source, **options)
+        found = 0
+        try:
+            for chunk in chunks:
+                new_numbers = numbers.add(chunk)
+                found += len(new_numbers)
+                yield from new_numbers
+            print(f"  ✓ Found {found} phone numbers in {source}")
+        except Exception as e:
+            print(f"  ❌ Error reading {source}: {e}")
+    numbers.print_report()
@@ -0,0 +1,229 @@
+from concurrent.futures import ProcessPoolExecutor
+from contact_records import parse_page, RecordBuilder, records_frame, RECORD_COLUMNS
+import hashlib
+import json
+import multiprocessing
+import sqlite3
+import zlib
+import time
+
+# PyPDF2 and pandas are imported where a PDF is actually read, so importing this
+# module (e.g. for a dry run or --help) stays cheap
+# Extraction cache lives next to whatsapp_progress.json
+CACHE_FILE = "contacts_cache.sqlite"
+MAX_CACHE_BYTES = 64 * 1024 * 1024  # Least recently used entries are evicted above this
+PAGES_PER_TASK = 25  # Pages handed to a worker at a time; smaller PDFs are parsed in-process
+# Workers are started by a clean server process, not forked: the pool is created while the
+# contact feed, progress writer and Chrome startup threads are running, and forking a
+# multi-threaded process can deadlock the child on a lock another thread held
+POOL_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+RECORDS_VERSION = 2  # Bumped when the parser's output changes; tables cached by older versions are dropped
+
+_worker_reader = {}  # (path, content hash) -> PdfReader; one per worker process
+
+def file_hash(path):
+    """SHA-256 of the file contents, read in 1 MB chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def open_cache(cache_file=CACHE_FILE):
+    conn = sqlite3.connect(cache_file)
+    # Raw-match entries of earlier versions are never read again
+    conn.execute("DROP TABLE IF EXISTS extractions")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS records ("
+        "hash TEXT PRIMARY KEY, columns BLOB NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)"
+    )
+    if conn.execute("PRAGMA user_version").fetchone()[0] < RECORDS_VERSION:
+        conn.execute("DELETE FROM records")
+        conn.execute(f"PRAGMA user_version = {RECORDS_VERSION}")
+        conn.commit()
+    return conn
+
+def process_pool(workers=None):
+    """ProcessPoolExecutor whose workers don't inherit the parent's threads (see POOL_START_METHOD)."""
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(POOL_START_METHOD))
+
+def is_cached(conn, digest):
+    return conn.execute("SELECT 1 FROM records WHERE hash = ?", (digest,)).fetchone() is not None
+
+def load_cached(conn, digest):
+    """The cached records table for a file hash, or None."""
+    row = conn.execute("SELECT columns FROM records WHERE hash = ?", (digest,)).fetchone()
+    if row is None:
+        return None
+    conn.execute("UPDATE records SET last_used = ? WHERE hash = ?", (time.time(), digest))
+    conn.commit()
+    return records_frame(json.loads(zlib.decompress(row[0])))
+
+def store_cached(conn, digest, frame, max_bytes=MAX_CACHE_BYTES):
+    # Stored column by column, the way the table is built
+    columns = {column: frame[column].astype(str if column == 'confidence' else object).tolist()
+               for column in RECORD_COLUMNS}
+    blob = zlib.compress(json.dumps(columns, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+    conn.execute(
+        "INSERT OR REPLACE INTO records (hash, columns, size, last_used) VALUES (?, ?, ?, ?)",
+        (digest, blob, len(blob), time.time())
+    )
+    evict(conn, max_bytes)
+    conn.commit()
+
+def evict(conn, max_bytes=MAX_CACHE_BYTES):
+    """Drops least recently used entries until the cache fits in max_bytes."""
+    total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM records").fetchone()[0]
+    if total <= max_bytes:
+        return
+    for digest, size in conn.execute("SELECT hash, size FROM records ORDER BY last_used").fetchall():
+        conn.execute("DELETE FROM records WHERE hash = ?", (digest,))
+        total -= size
+        if total <= max_bytes:
+            break
+
+def _parse_pages(reader, start, stop):
+    """(page, tokens, scanned candidates) for pages [start, stop) of an open PdfReader (pages count from 1)."""
+    return [(page_number + 1, *parse_page(reader.pages[page_number].extract_text() or ""))
+            for page_number in range(start, stop)]
+
+def _extract_page_range(task):
+    """Worker: parses pages [start, stop) of a PDF, keeping its reader for the next task of the same file."""
+    import PyPDF2
+
+    pdf_file, digest, start, stop = task
+    reader = _worker_reader.get((pdf_file, digest))
+    if reader is None:
+        # Keyed by content hash too, so a file replaced at the same path is never read from a stale reader
+        _worker_reader.clear()
+        reader = _worker_reader[(pdf_file, digest)] = PyPDF2.PdfReader(pdf_file)
+    return _parse_pages(reader, start, stop)
+
+def _page_tasks(pdf_file, digest):
+    import PyPDF2
+
+    with open(pdf_file, 'rb') as f:
+        page_count = len(PyPDF2.PdfReader(f).pages)
+    return [(pdf_file, digest, start, min(start + PAGES_PER_TASK, page_count))
+            for start in range(0, page_count, PAGES_PER_TASK)]
+
+class ParsePool:
+    """
+    One process pool for every PDF parsed in a run. prefetch() hands the page
+    ranges of all uncached PDFs in a list to the pool up front, so several small
+    PDFs are parsed side by side; parse() then returns each file's results in
+    page order. A lone single-task PDF is parsed in-process, without starting
+    the pool. Content hashes are computed once per path.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers
+        self.executor = None
+        self.pending = {}
+        self.digests = {}
+
+    def _pool(self):
+        if self.executor is None:
+            self.executor = process_pool(self.workers)
+        return self.executor
+
+    def digest(self, pdf_file):
+        if pdf_file not in self.digests:
+            self.digests[pdf_file] = file_hash(pdf_file)
+        return self.digests[pdf_file]
+
+    def prefetch(self, pdf_files, cache_file=CACHE_FILE, force_reparse=False):
+        conn = open_cache(cache_file)
+        try:
+            tasks = []
+            for pdf_file in dict.fromkeys(pdf_files):
+                try:
+                    digest = self.digest(pdf_file)
+                    if force_reparse or not is_cached(conn, digest):
+                        tasks.extend(_page_tasks(pdf_file, digest))
+                except Exception:
+                    continue  # Reported when the file itself is read
+        finally:
+            conn.close()
+        if len(tasks) > 1:
+            for task in tasks:
+                self.pending.setdefault(task[:2], []).append(self._pool().submit(_extract_page_range, task))
+
+    def parse(self, pdf_file, digest):
+        """Yields the parsed pages of one PDF in page order, one list per page range."""
+        futures = self.pending.pop((pdf_file, digest), None)
+        if futures is not None:
+            return (future.result() for future in futures)
+        tasks = _page_tasks(pdf_file, digest)
+        if len(tasks) > 1:
+            return self._pool().map(_extract_page_range, tasks)
+        return self._parse_in_process(pdf_file, tasks)
+
+    def _parse_in_process(self, pdf_file, tasks):
+        import PyPDF2
+
+        with open(pdf_file, 'rb') as f:
+            reader = PyPDF2.PdfReader(f)
+            for _, _, start, stop in tasks:
+                yield _parse_pages(reader, start, stop)
+
+    def close(self):
+        self.pending.clear()
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+def iter_pdf_records(pdf_file, force_reparse=False, workers=None, cache_file=CACHE_FILE, pool=None, **options):
+    """
+    Yields the contact records of a PDF (see contact_records.py) as DataFrames. An
+    unchanged file (same content hash) comes from the cache in one frame;
+    otherwise pages are parsed across a process pool, one frame per page range,
+    and the whole table is cached once the file has been fully read.
+    force_reparse skips the cache lookup and refreshes the stored entry. Pass a
+    shared ParsePool to parse several PDFs in one pool (see iter_contacts).
+    """
+    import pandas as pd
+
+    own_pool = pool is None
+    if own_pool:
+        pool = ParsePool(workers)
+    conn = open_cache(cache_file)
+    try:
+        digest = pool.digest(pdf_file)
+        cached = None if force_reparse else load_cached(conn, digest)
+        if cached is not None:
+            low = int((cached['confidence'] == 'low').sum())
+            print(f"⚡ Loaded {len(cached)} contact records for {pdf_file} from cache ({low} low confidence)")
+            yield cached
+            return
+
+        print(f"📄 Reading PDF file: {pdf_file}")
+        builder = RecordBuilder()
+        frames = []
+        for pages in pool.parse(pdf_file, digest):
+            for page in pages:
+                builder.add_page(*page)
+            frames.append(builder.take())
+            yield frames[-1]
+        frames.append(builder.finish())
+        yield frames[-1]
+        table = pd.concat(frames, ignore_index=True)
+        low = int((table['confidence'] == 'low').sum())
+        print(f"  📋 {len(table)} records ({low} low confidence"
+              f"{f', {builder.without_phone} without a phone' if builder.without_phone else ''})")
+        store_cached(conn, digest, table)
+    finally:
+        conn.close()
+        if own_pool:
+            pool.close()
+
+def read_pdf_records(pdf_file, **options):
+    """The whole records table of a PDF in one DataFrame (from the cache when the file is unchanged)."""
+    import pandas as pd
+
+    return pd.concat(list(iter_pdf_records(pdf_file, **options)), ignore_index=True)
+
+def iter_pdf_chunks(pdf_file, **options):
+    """Contact-source reader for PDFs: the phone column of iter_pdf_records, one list per frame."""
+    for frame in iter_pdf_records(pdf_file, **options):
+        yield [phone for phone in frame['phone'].tolist() if phone]
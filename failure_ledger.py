@@ -0,0 +1,151 @@
+from checkpoint import atomic_write_json, read_journal, append_journal
+from contact_extractor import normalize_phone
+import json
+import os
+import time
+
+FAILURE_JOURNAL_FILE = "failures.journal"
+FAILURE_REPORT_FILE = "failure_report.json"
+
+# ==========================================
+# FAILURE CODES
+# code: (category, meaning). Permanent failures are not worth retrying in this
+# run; transient ones (timeouts, slow renders, upload hiccups) get the retry pass.
+# Unverified sends are not retried either: a retry could deliver them twice.
+# ==========================================
+PERMANENT = 'permanent'
+TRANSIENT = 'transient'
+UNVERIFIED = 'unverified'  # Probably delivered; reported so it can be checked by hand, never retried
+FAILURE_CODES = {
+    'not_found':       (PERMANENT, "No WhatsApp account for the number"),
+    'chat_not_opened': (TRANSIENT, "Search result found but the chat didn't open"),
+    'search_error':    (TRANSIENT, "Exception while searching (stale element, timeout, browser hiccup)"),
+    'message_failed':  (TRANSIENT, "Exception while typing or sending the message"),
+    'images_partial':  (TRANSIENT, "Message sent, some images didn't go out"),
+    'images_failed':   (TRANSIENT, "Message sent (or none), no image went out"),
+    'images_unverified': (UNVERIFIED, "Album upload finished but no new media message was seen"),
+}
+
+def failure_category(code):
+    return FAILURE_CODES.get(code, (TRANSIENT, None))[0]
+
+class FailureLedger:
+    """
+    Per-contact failure details for a campaign: code, category, error text,
+    whether the message went out, images sent out of how many, and the error of
+    every image that failed. One JSON line per attempt in failures.journal, so
+    a resumed run can still retry earlier transient failures. A contact that
+    later succeeds is marked resolved.
+    """
+
+    def __init__(self, journal_file=FAILURE_JOURNAL_FILE, report_file=FAILURE_REPORT_FILE):
+        self.journal_file = journal_file
+        self.report_file = report_file
+        self.failures = {}
+        self.resolved = {}
+
+    def load(self):
+        for entry in read_journal(self.journal_file):
+            self._apply(entry)
+        return bool(self.failures)
+
+    def reset(self):
+        for path in (self.journal_file, self.report_file):
+            if os.path.exists(path):
+                os.remove(path)
+        self.failures = {}
+        self.resolved = {}
+
+    def _apply(self, entry):
+        phone = entry['phone']
+        if entry.get('resolved'):
+            previous = self.failures.pop(phone, None)
+            if previous is not None:
+                self.resolved[phone] = previous['code']
+            return
+        entry.setdefault('attempts', self.failures.get(phone, {}).get('attempts', 0) + 1)
+        self.failures[phone] = entry
+
+    @staticmethod
+    def entry_for(phone_number, results):
+        """Journal entry for one failed (or partially delivered) send_to_contact result."""
+        entry = {
+            'phone': normalize_phone(phone_number),
+            'code': results['code'],
+            'category': failure_category(results['code']),
+            'error': results['error'],
+            'message_sent': results['message_sent'],
+            'images_sent': results['images_sent'],
+            'images_total': results['images_total'],
+            'time': round(time.time(), 1)
+        }
+        if results.get('image_errors'):
+            entry['image_errors'] = results['image_errors']
+        if results.get('images_unverified'):
+            entry['images_unverified'] = results['images_unverified']
+        return entry
+
+    def record_many(self, entries):
+        """Applies and journals entries from entry_for() or resolution markers, with one fsync."""
+        if not entries:
+            return
+        for entry in entries:
+            self._apply(entry)
+        append_journal(self.journal_file, [json.dumps(entry, ensure_ascii=False) for entry in entries])
+
+    @staticmethod
+    def resolution(phone_number):
+        return {'phone': normalize_phone(phone_number), 'resolved': True, 'time': round(time.time(), 1)}
+
+    def get(self, phone_number):
+        return self.failures.get(normalize_phone(phone_number))
+
+    def __contains__(self, phone_number):
+        return normalize_phone(phone_number) in self.failures
+
+    def retryable(self):
+        """Unresolved transient failures, oldest first."""
+        return [entry for entry in self.failures.values() if entry['category'] == TRANSIENT]
+
+    def counts(self):
+        codes = {}
+        for entry in self.failures.values():
+            codes[entry['code']] = codes.get(entry['code'], 0) + 1
+        return codes
+
+    def report(self):
+        codes = self.counts()
+        categories = {PERMANENT: 0, TRANSIENT: 0, UNVERIFIED: 0}
+        for code, count in codes.items():
+            categories[failure_category(code)] += count
+        resolved = {}
+        for code in self.resolved.values():
+            resolved[code] = resolved.get(code, 0) + 1
+        return {
+            'categories': categories,
+            'codes': {code: {'category': failure_category(code), 'count': count,
+                             'meaning': FAILURE_CODES.get(code, (None, None))[1]}
+                      for code, count in sorted(codes.items(), key=lambda item: -item[1])},
+            'resolved_by_retry': resolved,
+            'images_missing': sum(entry['images_total'] - entry['images_sent'] for entry in self.failures.values()),
+            'images_unverified': sum(entry.get('images_unverified', 0) for entry in self.failures.values()),
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')
+        }
+
+    def write_report(self):
+        """Writes failure_report.json and prints the per-category counts."""
+        data = self.report()
+        atomic_write_json(self.report_file, data)
+        if not data['codes'] and not data['resolved_by_retry']:
+            return data
+        print(f"\n📋 Failures: {data['categories'][PERMANENT]} permanent, {data['categories'][TRANSIENT]} transient "
+              f"({data['images_missing']} images not delivered)")
+        if data['categories'][UNVERIFIED]:
+            print(f"   ⚠️ {data['categories'][UNVERIFIED]} contacts with {data['images_unverified']} unverified images "
+                  f"(sent, but no media message was seen; not retried)")
+        for code, info in data['codes'].items():
+            print(f"   {code:<16} {info['category']:<10} {info['count']:>6}")
+        if data['resolved_by_retry']:
+            print(f"   ✅ Recovered by retry: {sum(data['resolved_by_retry'].values())}")
+        print(f"   Full report: {self.report_file}, per-contact details: {self.journal_file}")
+        return data
@@ -1,228 +1,217 @@
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-import PyPDF2
-import re
+from contact_sources import iter_contacts
+from pipeline import ContactFeed
+from group_ledger import GroupLedger, batch_key, GROUP_BATCH_SIZE
+from pacing import RateScheduler, GROUP_RATE_LIMITS, GROUP_PACING_STATE_FILE
+from not_found_cache import NotFoundCache
+from media_cache import list_images, prepare_media
+from tracing import span, enable_tracing, disable_tracing, contact_done
+import itertools
+import math
 import os
 import time
 
 # --- CONFIGURATION ---
-PDF_FILE = "contact.pdf"
+PDF_FILE = "contact.pdf"  # Also accepts .csv, .xlsx or .vcf contact exports
+FORCE_REPARSE = False  # Ignore the extraction cache and parse the PDF again
+COUNTRY_CODE = "977"  # Applied to numbers written without a +/00 prefix
 GROUP_NAME_PREFIX = "Community Update Group"
-BATCH_SIZE = 1
+BATCH_SIZE = GROUP_BATCH_SIZE  # Contacts per group (default 1)
 MESSAGE_TO_SEND = "Welcome to the Community Update Group!"
 IMAGE_FOLDER = "images"
-IMAGE_FILES = ["image_2.jpg"]
+IMAGE_FILES = ["image_2.jpg"]  # None sends every image in IMAGE_FOLDER
+PREPARE_IMAGES = True  # Downscale/re-encode the images once (cached in media_cache/) instead of uploading originals
+BATCH_IMAGES = True  # Upload all images in one go as an album
+TRACE_FILE = None  # e.g. "whatsapp_trace.jsonl" to record per-step timings
+RATE_LIMITS = GROUP_RATE_LIMITS  # Most groups per 'minute' / 'hour' / 'day' (default {'minute': 1}), e.g. {'hour': 20, 'day': 100}
+RESUME = True  # Skip groups finished by an earlier run (group_progress.journal); False starts over
+DEBUGGER_ADDRESS = None  # e.g. "127.0.0.1:9222" to reuse a running, logged-in Chrome
+RUN_STAMP = time.strftime("%Y%m%d-%H%M")  # Part of every group name this run creates
 
-def initialize_chrome_driver():
-    print("🔧 Initializing Chrome driver...")
-    options = webdriver.ChromeOptions()
-    user_data_dir = os.path.abspath("whatsapp_session")
-    if not os.path.exists(user_data_dir):
-        os.makedirs(user_data_dir)
-    
-    options.add_argument(f"--user-data-dir={user_data_dir}")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--start-maximized")
-    options.add_argument("--disable-notifications")
-    options.add_argument("--disable-gpu") 
-    
-    driver = webdriver.Chrome(options=options)
-    return driver
-
-def extract_contacts_from_pdf(pdf_file):
-    phone_numbers = []
-    try:
-        print(f"📄 Reading PDF file: {pdf_file}")
-        with open(pdf_file, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            full_text = ""
-            for page in pdf_reader.pages:
-                full_text += page.extract_text()
-            
-            patterns = [r'\+?\d{1,4}[-.\s]?\(?\d{1,4}\)?[-.\s]?\d{1,4}[-.\s]?\d{1,9}', r'\d{10}']
-            for pattern in patterns:
-                matches = re.findall(pattern, full_text)
-                for match in matches:
-                    cleaned = re.sub(r'[-.\s()]', '', match)
-                    if 8 <= len(cleaned) <= 15 and cleaned not in phone_numbers:
-                        phone_numbers.append(cleaned)
-        print(f"  ✓ Found {len(phone_numbers)} phone numbers")
-    except Exception as e:
-        print(f"  ❌ Error reading PDF: {e}")
-    return phone_numbers
+def unique_group_name(prefix, number, run_stamp=RUN_STAMP):
+    """e.g. 'Community Update Group 20261018-0930 #3' - distinct per group and per run, so search can't open another group."""
+    return f"{prefix} {run_stamp} #{number}"
 
-def search_and_open_group(driver, wait, group_name):
-    """Specifically searches for the group and uses ENTER to open it."""
-    print(f"🔍 Searching for group: {group_name}")
-    try:
-        # 1. Locate search bar using your existing logic/context
-        search_box = wait.until(EC.presence_of_element_located(
-            (By.XPATH, "//*[@id='side']/div[1]/div/div[2]/div/div/div[1]/p")
-        ))
-        search_box.click()
-        time.sleep(1)
-        
-        # 2. Clear and Type
-        search_box.send_keys(Keys.CONTROL + "a")
-        search_box.send_keys(Keys.BACKSPACE)
-        time.sleep(0.5)
-        
-        for char in group_name:
-            search_box.send_keys(char)
-            time.sleep(0.05)
-        
-        time.sleep(3) # Let search results populate
-        
-        # 3. Press Enter to open the first result (Fixes the 'closing' issue)
-        search_box.send_keys(Keys.ENTER)
-        time.sleep(3)
-        return True
-    except Exception as e:
-        print(f"❌ Search failed: {e}")
-        return False
-
-def send_message_and_images(driver, wait, group_name, message_text=None, image_files=None, image_folder=None):
+def send_message_and_images(transport, group_name, message_text=None, image_files=None, image_folder=None,
+                            batch_images=BATCH_IMAGES):
+    """Posts the message and images into the open group through `transport` (see transport.py)."""
     print(f"\n📤 Sending content to group: {group_name}")
-    results = {'message_sent': False, 'images_sent': 0}
+    results = {'message_sent': False, 'images_sent': 0, 'images_unverified': 0}
     
     try:
-        print("    ⏳ Waiting for chat to stabilize...")
-        time.sleep(5)
-        
-        # Send text message (Your original XPATHs)
+        # Send text message
         if message_text:
             print("    💬 Sending text message...")
-            message_box = None
-            for attempt in range(5):
-                try:
-                    message_box = wait.until(EC.presence_of_element_located(
-                        (By.XPATH, "//*[@id='main']/footer/div[1]/div/span/div/div/div/div[3]/div[1]")
-                    ))
-                    break
-                except:
-                    print(f"      ⏳ Attempt {attempt + 1}/5 to find message box...")
-                    time.sleep(2)
-            
-            if message_box:
-                message_box.click()
-                time.sleep(1)
-                message_box.send_keys(message_text)
-                time.sleep(0.5)
-                message_box.send_keys(Keys.ENTER)
+            try:
+                transport.send_text(message_text)
                 results['message_sent'] = True
                 print("    ✅ Message sent successfully")
-                time.sleep(3)
+            except Exception as e:
+                print(f"    ❌ Message not sent: {e}")
 
-        # Send images (Your original XPATHs)
+        # Send images (one album upload, per-image loop as fallback)
         if image_files and image_folder:
             print(f"    🖼️ Sending {len(image_files)} images...")
-            success_count = 0
-            for image_file in image_files:
-                image_path = os.path.abspath(os.path.join(image_folder, image_file))
-                if not os.path.exists(image_path): continue
-                try:
-                    attach_button = wait.until(EC.element_to_be_clickable((By.XPATH, '//*[@id="main"]/footer/div[1]/div/span/div/div/div/div[1]/div/span/button')))
-                    attach_button.click()
-                    time.sleep(2)
-                    photo_video_option = wait.until(EC.element_to_be_clickable((By.XPATH, '//*[@id="app"]/div/div/span[6]/div/ul/div/div/div[2]/li/div')))
-                    photo_video_option.click()
-                    time.sleep(1.5)
-                    file_input = wait.until(EC.presence_of_element_located((By.XPATH, "//input[@accept='image/*,video/mp4,video/3gpp,video/quicktime']")))
-                    file_input.send_keys(image_path)
-                    time.sleep(4)
-                    send_button = wait.until(EC.element_to_be_clickable((By.XPATH, '//*[@id="app"]/div/div/div[3]/div/div[3]/div[2]/div/span/div/div/div/div[2]/div/div[2]/div[2]/span/div/div')))
-                    send_button.click()
-                    success_count += 1
-                    time.sleep(5)
-                except: pass
-            results['images_sent'] = success_count
+            image_paths = [os.path.abspath(os.path.join(image_folder, image_file)) for image_file in image_files]
+            media = transport.send_media(image_paths, batched=batch_images)
+            results['images_sent'] = media['images_sent']
+            results['images_unverified'] = media.get('unverified', 0)
     except Exception as e:
         print(f"    ❌ Error: {e}")
     return results
 
-def create_single_group(driver, wait, batch_contacts, group_name):
-    # This remains exactly as your working version
-    print(f"\n🔨 Creating Group: {group_name}...")
+def process_batch(transport, ledger, batch, batch_number, image_folder, image_files, not_found=None,
+                  message=MESSAGE_TO_SEND, name_prefix=GROUP_NAME_PREFIX, batch_images=BATCH_IMAGES):
+    """
+    Runs (or resumes) one batch: create the group, open it, post the message, post
+    the images. Steps the ledger already has are skipped.
+    """
+    key = batch_key(batch)
+    state = ledger.get(key)
+    group_name = state.get('name') or unique_group_name(name_prefix, batch_number)
+
+    # 1. Create the Group (a batch that got as far as the dialog may have created it already)
+    opened = False
+    if state.get('status') == 'created':
+        print(f"🔄 Resuming group {group_name}")
+        opened = transport.open_group(group_name)
+    else:
+        if state.get('status') in ('creating', 'failed'):
+            opened = transport.open_group(group_name)
+            if opened:
+                ledger.record(key, 'created', added=None)
+        if not opened:
+            ledger.record(key, 'creating', name=group_name, members=batch)
+            with span("create_group", members=len(batch)) as group_span:
+                added = transport.create_group(group_name, batch, not_found)
+                group_span.set(ok=bool(added))
+            if not added:
+                ledger.record(key, 'failed', error="Group not created")
+                return
+            ledger.record(key, 'created', added=added)
+            # 2. WhatsApp opens the new group itself; no reload, no search
+            opened = transport.open_group(group_name, created=True)
+    if not opened:
+        return
+
+    # 3. Send Content (only what a previous run didn't deliver)
+    state = ledger.get(key)
+    text = message if not state.get('message_sent') else None
+    # After a partial delivery only the images that didn't go out are sent (album order is kept)
+    images_sent = state.get('images_sent', 0)
+    images = image_files[images_sent:]
+    results = send_message_and_images(transport, group_name, text, images, image_folder, batch_images)
+    if results['message_sent']:
+        ledger.record(key, 'message', message_sent=True)
+    if images:
+        # Unverified images count as sent (a resume mustn't post them twice) but stay in the journal
+        ledger.record(key, 'images', images_sent=images_sent + results['images_sent'],
+                      images_unverified=state.get('images_unverified', 0) + results['images_unverified'])
+    state = ledger.get(key)
+    if (state.get('message_sent') or not message) and state.get('images_sent', 0) >= len(image_files):
+        ledger.record(key, 'done')
+
+def main_group_creator(pdf_file=PDF_FILE, message=MESSAGE_TO_SEND, image_folder=IMAGE_FOLDER, image_files=IMAGE_FILES,
+                       batch_size=BATCH_SIZE, name_prefix=GROUP_NAME_PREFIX, country_code=COUNTRY_CODE,
+                       force_reparse=FORCE_REPARSE, prepare_images=PREPARE_IMAGES, batch_images=BATCH_IMAGES,
+                       trace_file=TRACE_FILE, rate_limits=RATE_LIMITS, resume=RESUME, debugger_address=DEBUGGER_ADDRESS,
+                       transport=None):
+    """
+    Creates one group per `batch_size` contacts. Defaults come from the configuration
+    above; `transport` replaces Chrome, e.g. with transport.SimulatedTransport().
+    pdf_file may also be a records table from contact_sources.read_records.
+    """
+    feed = None
+    ledger = None
+    not_found = None
+    media = None
+    scheduler = None
+    transport_started = False
+    groups_processed = 0
+
     try:
-        new_chat_btn = wait.until(EC.element_to_be_clickable((By.XPATH, "//*[@id='app']/div/div/div[3]/div/div[4]/header/header/div/span/div/div[2]/span/button")))
-        new_chat_btn.click()
-        time.sleep(2)
-        new_group_btn = wait.until(EC.element_to_be_clickable((By.XPATH, "//*[@id='app']/div/div/span[6]/div/ul/div/div[1]/li/div")))
-        new_group_btn.click()
-        time.sleep(3)
-        input_box = wait.until(EC.presence_of_element_located((By.XPATH, "//*[@id='app']/div/div/div[3]/div/div[3]/div[1]/div/span/div/span/div/div/div[1]/div/div/div[2]/input")))
-        
-        added_count = 0
-        for phone in batch_contacts:
-            input_box.send_keys(phone)
-            time.sleep(2)
-            try:
-                driver.find_element(By.XPATH, "//*[contains(text(), 'No results found')]")
-                input_box.send_keys(Keys.CONTROL + "a", Keys.DELETE)
-            except NoSuchElementException:
-                input_box.send_keys(Keys.ENTER)
-                added_count += 1
-                time.sleep(0.5)
-        
-        if added_count == 0: return False
-        
-        wait.until(EC.element_to_be_clickable((By.XPATH, "//*[@id='app']/div/div/div[3]/div/div[3]/div[1]/div/span/div/span/div/div/span/div/div"))).click()
-        time.sleep(2)
-        subject_box = wait.until(EC.presence_of_element_located((By.XPATH, "//*[@id='app']/div/div/div[3]/div/div[3]/div[1]/div/span/div/span/div/div/div[1]/div[2]/div/div[2]/div[1]/div/div/p")))
-        subject_box.send_keys(group_name)
-        time.sleep(1)
-        wait.until(EC.element_to_be_clickable((By.XPATH, "//*[@id='app']/div/div/div[3]/div/div[3]/div[1]/div/span/div/span/div/div/div[3]/div/div/div[1]/div/h3/span"))).click()
-        time.sleep(1)
-        wait.until(EC.element_to_be_clickable((By.XPATH, "//*[@id='app']/div/div/div[3]/div/div[3]/div[1]/div/span/div/span/div/div/div[2]/div[2]/div/div/div/div[1]/div[3]/div/input"))).click()
-        time.sleep(1)
-        wait.until(EC.element_to_be_clickable((By.XPATH, "//*[@id='app']/div/div/div[3]/div/div[3]/div[1]/div/span/div/span/div/header/div/div[1]/div/span/button/div/div/div[1]/span"))).click()
-        time.sleep(1)
-        wait.until(EC.element_to_be_clickable((By.XPATH, "//*[@id='app']/div/div/div[3]/div/div[3]/div[1]/div/span/div/span/div/div/span/div/div/div"))).click()
-        time.sleep(10)
-        return True
-    except: return False
+        if trace_file:
+            enable_tracing(trace_file)
+        # Extraction keeps running ahead in a background thread while Chrome starts and groups are created
+        feed = ContactFeed(iter_contacts(pdf_file, country_code=country_code, force_reparse=force_reparse)).start()
+        phone_numbers = iter(feed)
+        batch = list(itertools.islice(phone_numbers, batch_size))
+        if not batch: return
+        # Steps finished by an earlier run are skipped, a half-finished batch resumes where it stopped
+        ledger = GroupLedger()
+        if resume and ledger.load():
+            counts = ledger.counts()
+            print(f"🔄 Resuming: {counts.get('done', 0)} groups done, "
+                  f"{counts.get('created', 0) + counts.get('creating', 0)} unfinished, {counts.get('failed', 0)} failed")
+        elif not resume:
+            ledger.reset()
+        # Numbers with no WhatsApp account (from either script) aren't searched for again
+        not_found = NotFoundCache(country_code=country_code)
+        if image_files is None:
+            image_files = list_images(image_folder)
+        if image_files and prepare_images:
+            with span("media_prepare", images=len(image_files)):
+                media = prepare_media([os.path.join(image_folder, f) for f in image_files])
+            image_folder, image_files = media.folder, media.files
+        # Launches Chrome, or attaches to a running one; returns once WhatsApp is logged in
+        if transport is None:
+            # Imported here so runs on another transport don't need Selenium
+            from selenium_transport import SeleniumTransport
+            transport = SeleniumTransport(debugger_address=debugger_address)
+        transport = transport.start()
+        transport_started = True
+        # Replaces the fixed 60s cooldown; the allowance used by earlier runs is remembered
+        scheduler = RateScheduler(rate_limits, GROUP_PACING_STATE_FILE)
+        started = time.monotonic()
+        batch_number = 1
 
-def main_group_creator():
-    phone_numbers = extract_contacts_from_pdf(PDF_FILE)
-    if not phone_numbers: return
-    batches = [phone_numbers[i:i + BATCH_SIZE] for i in range(0, len(phone_numbers), BATCH_SIZE)]
-    driver = initialize_chrome_driver()
-    driver.get("https://web.whatsapp.com")
-    wait = WebDriverWait(driver, 300)
-    
-    # Initial Wait
-    wait.until(EC.presence_of_element_located((By.XPATH, "//div[@contenteditable='true'][@data-tab='3']")))
-    
-    for i, batch in enumerate(batches):
-        group_name = f"{GROUP_NAME_PREFIX}"
-        
-        # 1. Create the Group
-        if create_single_group(driver, wait, batch, group_name):
-            
-            # 2. REFRESH TO PREVENT CRASH
-            print("🔄 Refreshing page to clear memory and prevent crash...")
-            driver.refresh()
-            
-            # 3. Wait for reload
-            wait.until(EC.presence_of_element_located((By.XPATH, "//div[@contenteditable='true'][@data-tab='3']")))
-            time.sleep(5)
-            
-            # 4. Search and Open the Group
-            if search_and_open_group(driver, wait, group_name):
-                # 5. Send Content
-                send_message_and_images(driver, wait, group_name, MESSAGE_TO_SEND, IMAGE_FILES, IMAGE_FOLDER)
-        
-        if i < len(batches) - 1:
-            print("⏳ 60s Batch Cooldown...")
-            time.sleep(60)
+        while batch:
+            # Batches are pulled from the PDF stream as we go, one ahead for the cooldown check
+            next_batch = list(itertools.islice(phone_numbers, batch_size))
+            state = ledger.get(batch_key(batch))
+            if state.get('status') == 'done':
+                print(f"⏭️  Batch {batch_number} already done ({state['name']})")
+            else:
+                remaining, exact = feed.remaining()
+                batches_left = 1 + math.ceil((remaining + len(next_batch)) / batch_size)
+                print(f"\n📋 Batch {batch_number} ({scheduler.describe_eta(batches_left, exact)})")
+                # Waits only if another group now would exceed rate_limits
+                scheduler.acquire()
+                process_batch(transport, ledger, batch, batch_number, image_folder, image_files, not_found,
+                              message, name_prefix, batch_images)
+                groups_processed += 1
+                contact_done(len(batch))
+                # Each group starts from the new-chat button, so a reload here loses no UI state
+                # (replaces the reload after every group: only done when the tab has grown too big)
+                transport.check()
+            batch_number += 1
+            batch = next_batch
 
-    driver.quit()
+        elapsed = max(time.monotonic() - started, 1)
+        print(f"👥 {groups_processed} groups processed in {elapsed:.0f}s "
+              f"({groups_processed / elapsed * 3600:.0f} groups/hour, cooldowns included)")
+        unverified = ledger.summary()['images_unverified']
+        if unverified:
+            print(f"⚠️ {unverified} images sent but not seen in their group (images_unverified in {ledger.progress_file})")
+    except Exception as e:
+        print(f"❌ Critical Error: {e}")
+    finally:
+        if feed is not None:
+            feed.stop()
+        if ledger is not None:
+            ledger.close()
+        if not_found is not None:
+            not_found.print_report()
+            not_found.close()
+        if media is not None:
+            media.print_report(groups_processed)
+        if transport_started:
+            transport.print_report()
+        if scheduler is not None:
+            scheduler.close()
+            scheduler.print_report()
+        disable_tracing()
+        if transport_started:
+            transport.close()
 
 if __name__ == "__main__":
     main_group_creator()
\ No newline at end of file
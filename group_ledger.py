@@ -0,0 +1,88 @@
+from checkpoint import atomic_write_json, read_journal, append_journal
+from tracing import span
+import json
+import os
+import time
+
+GROUP_PROGRESS_FILE = "group_progress.json"
+GROUP_JOURNAL_FILE = "group_progress.journal"
+SUMMARY_EVERY = 10  # Journal entries between rewrites of the summary file
+GROUP_BATCH_SIZE = 1  # Contacts per group
+
+def batch_key(batch):
+    """Batches are identified by their members, so resuming doesn't depend on batch positions."""
+    return ",".join(batch)
+
+class GroupLedger:
+    """
+    Crash-safe group-creation progress, one record per batch:
+        name, members, status ('creating' -> 'created' -> 'done', or 'failed'),
+        added (members actually added), message_sent, images_sent, error
+    Every step is appended to a JSONL journal and fsynced before the next UI step,
+    so a restart knows exactly where a batch stopped. group_progress.json (counts
+    only) is replaced atomically every SUMMARY_EVERY steps and on close.
+    """
+
+    def __init__(self, progress_file=GROUP_PROGRESS_FILE, journal_file=GROUP_JOURNAL_FILE, every=SUMMARY_EVERY):
+        self.progress_file = progress_file
+        self.journal_file = journal_file
+        self.every = max(1, every)
+        self.batches = {}
+        self.pending = 0
+
+    def load(self):
+        """Rebuilds state from the journal. Returns True if there was anything to resume."""
+        for entry in read_journal(self.journal_file):
+            self._apply(entry)
+        return bool(self.batches)
+
+    def reset(self):
+        """Starts a fresh campaign, discarding any previous journal."""
+        for path in (self.journal_file, self.progress_file):
+            if os.path.exists(path):
+                os.remove(path)
+        self.batches = {}
+
+    def get(self, key):
+        return self.batches.get(key, {})
+
+    def _apply(self, entry):
+        state = self.batches.setdefault(entry['batch'], {})
+        state.update((field, value) for field, value in entry.items() if field not in ('batch', 'step'))
+        state['status'] = entry['step'] if entry['step'] in ('creating', 'created', 'failed', 'done') else state.get('status')
+
+    def record(self, key, step, **fields):
+        """Journals one step of a batch ('creating', 'created', 'message', 'images', 'failed', 'done')."""
+        entry = {'batch': key, 'step': step, **fields}
+        self._apply(entry)
+        with span("group_ledger_write", step=step):
+            append_journal(self.journal_file, [json.dumps(entry, ensure_ascii=False)])
+            self.pending += 1
+            if self.pending >= self.every:
+                self.flush()
+
+    def counts(self):
+        counts = {}
+        for state in self.batches.values():
+            counts[state.get('status')] = counts.get(state.get('status'), 0) + 1
+        return counts
+
+    def summary(self):
+        counts = self.counts()
+        return {
+            'total_batches': len(self.batches),
+            'done': counts.get('done', 0),
+            'created': counts.get('created', 0),
+            'failed': counts.get('failed', 0),
+            'in_progress': counts.get('creating', 0),
+            'members_added': sum(len(state.get('added') or []) for state in self.batches.values()),
+            'images_unverified': sum(state.get('images_unverified', 0) for state in self.batches.values()),
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')
+        }
+
+    def flush(self):
+        atomic_write_json(self.progress_file, self.summary())
+        self.pending = 0
+
+    def close(self):
+        self.flush()
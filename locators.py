@@ -0,0 +1,209 @@
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.common.exceptions import StaleElementReferenceException
+from collections import defaultdict
+import time
+
+# ==========================================
+# LOCATOR REGISTRY
+# name: [primary, fallback, ...] - tried in order until one matches. When a
+# fallback matches it is tried first from then on, so a WhatsApp layout change
+# costs one extra query, not one per lookup.
+# ==========================================
+APP_GROUP_DIALOG = "//*[@id='app']/div/div/div[3]/div/div[3]/div[1]/div/span/div/span/div"
+MEDIA_PREVIEW = "//*[@id='app']/div/div/div[3]/div/div[3]/div[2]/div/span/div/div/div/div[2]"
+
+LOCATORS = {
+    # Chat list / search
+    'search_box': [
+        (By.XPATH, "//div[@contenteditable='true'][@data-tab='3']"),
+        (By.XPATH, "//*[@id='side']//div[@contenteditable='true']"),
+    ],
+    'qr_code': [
+        (By.XPATH, "//canvas[contains(@aria-label, 'Scan this QR code')]"),
+        (By.XPATH, "//div[@data-ref]//canvas"),
+    ],
+    'no_results': [
+        (By.XPATH, "//*[contains(text(), 'No results found') or contains(text(), 'no results found')]"),
+    ],
+
+    # Open chat
+    'message_box': [
+        (By.XPATH, "//div[@contenteditable='true'][@data-tab='10']"),
+        (By.XPATH, "//*[@id='main']/footer/div[1]/div/span/div/div/div/div[3]/div[1]"),
+        (By.XPATH, "//*[@id='main']//footer//div[@contenteditable='true']"),
+    ],
+    'chat_header': [
+        (By.XPATH, "//*[@id='main']//header//span[@dir='auto'][@title]"),
+        (By.XPATH, "//*[@id='main']/header"),
+    ],
+    'outgoing_bubbles': [
+        (By.XPATH, "//div[contains(@class, 'message-out')]"),
+    ],
+    # Outgoing message rows holding media: one per album however many tiles it shows,
+    # and rows whose only images are emoji don't count
+    'media_messages': [
+        (By.XPATH, "//*[@id='main']//div[contains(@class, 'message-out')]"
+                   "[.//img[not(contains(@class, 'emoji')) and not(@data-plain-text)]]"),
+    ],
+
+    # Attachments
+    'attach_button': [
+        (By.XPATH, '//*[@id="main"]/footer/div[1]/div/span/div/div/div/div[1]/div/span/button'),
+        (By.XPATH, "//*[@id='main']//footer//*[@title='Attach' or @aria-label='Attach']"),
+    ],
+    'photos_option': [
+        (By.XPATH, '//*[@id="app"]/div/div/span[6]/div/ul/div/div/div[2]/li/div'),
+        (By.XPATH, "//li[contains(., 'Photos & videos')]"),
+    ],
+    'file_input': [
+        (By.XPATH, "//input[@accept='image/*,video/mp4,video/3gpp,video/quicktime']"),
+        (By.XPATH, "//input[@type='file'][contains(@accept, 'image')]"),
+    ],
+    'media_send_button': [
+        (By.XPATH, MEDIA_PREVIEW + "/div/div[2]/div[2]/span/div/div"),
+        (By.XPATH, "//div[@role='button'][@aria-label='Send']"),
+    ],
+    'caption_box': [
+        (By.XPATH, "//div[@contenteditable='true'][@aria-label='Add a caption' or @aria-placeholder='Add a caption']"),
+        (By.XPATH, MEDIA_PREVIEW + "/div/div[1]/div/div[2]"),
+    ],
+
+    # Group creation
+    'new_chat_button': [
+        (By.XPATH, "//*[@id='app']/div/div/div[3]/div/div[4]/header/header/div/span/div/div[2]/span/button"),
+        (By.XPATH, "//header//*[@title='New chat' or @aria-label='New chat']"),
+    ],
+    'new_group_option': [
+        (By.XPATH, "//*[@id='app']/div/div/span[6]/div/ul/div/div[1]/li/div"),
+        (By.XPATH, "//li[contains(., 'New group')]"),
+    ],
+    'member_input': [
+        (By.XPATH, APP_GROUP_DIALOG + "/div/div[1]/div/div/div[2]/input"),
+    ],
+    'member_results': [
+        (By.XPATH, APP_GROUP_DIALOG + "/div/div[1]/div/div/div[3]//*[@role='listitem']"),
+        (By.XPATH, APP_GROUP_DIALOG + "//*[@role='listitem'][contains(., '+')]"),
+    ],
+    'members_next': [
+        (By.XPATH, APP_GROUP_DIALOG + "/div/span/div/div"),
+    ],
+    'group_subject': [
+        (By.XPATH, APP_GROUP_DIALOG + "/div/div[1]/div[2]/div/div[2]/div[1]/div/div/p"),
+    ],
+    'group_permissions': [
+        (By.XPATH, APP_GROUP_DIALOG + "/div/div[3]/div/div/div[1]/div/h3/span"),
+    ],
+    'group_permission_toggle': [
+        (By.XPATH, APP_GROUP_DIALOG + "/div/div[2]/div[2]/div/div/div/div[1]/div[3]/div/input"),
+    ],
+    'group_permissions_back': [
+        (By.XPATH, APP_GROUP_DIALOG + "/header/div/div[1]/div/span/button/div/div/div[1]/span"),
+    ],
+    'group_create': [
+        (By.XPATH, APP_GROUP_DIALOG + "/div/span/div/div/div"),
+    ],
+}
+
+# Kept across chats; everything else belongs to one chat/dialog view
+PAGE_SCOPED = {'search_box', 'new_chat_button'}
+
+_cache = {}
+_preferred = {}
+stats = defaultdict(lambda: {'lookups': 0, 'hits': 0, 'queries': 0, 'fallbacks': 0, 'stale': 0, 'seconds': 0.0})
+
+class CachedElement(WebElement):
+    """
+    A resolved element that re-runs its locator and retries once when WhatsApp
+    re-renders it (StaleElementReferenceException). Still a WebElement, so it
+    can be passed to execute_script and expected conditions as usual.
+    """
+
+    def __init__(self, element, name):
+        super().__init__(element.parent, element.id)
+        self.locator_name = name
+
+    def _execute(self, command, params=None):
+        try:
+            return super()._execute(command, params)
+        except StaleElementReferenceException:
+            stats[self.locator_name]['stale'] += 1
+            found = query(self.parent, self.locator_name)
+            if not found:
+                _cache.pop(self.locator_name, None)
+                raise
+            self._id = found[0].id
+            return super()._execute(command, params)
+
+def query(driver, name):
+    """Uncached DOM lookup through the primary and fallback strategies; returns all matches."""
+    strategies = LOCATORS[name]
+    order = [_preferred.get(name, 0)] + [i for i in range(len(strategies)) if i != _preferred.get(name, 0)]
+    started = time.perf_counter()
+    found = []
+    for i in order:
+        found = driver.find_elements(*strategies[i])
+        if found:
+            if i != 0:
+                stats[name]['fallbacks'] += 1
+            _preferred[name] = i
+            break
+    stats[name]['queries'] += 1
+    stats[name]['seconds'] += time.perf_counter() - started
+    return found
+
+def find_all(driver, name):
+    """All current matches (bubbles, "No results" markers); never cached."""
+    stats[name]['lookups'] += 1
+    return query(driver, name)
+
+def find(driver, name):
+    """First match for `name`, served from the per-view cache when possible. None if absent."""
+    stats[name]['lookups'] += 1
+    element = _cache.get(name)
+    if element is not None:
+        stats[name]['hits'] += 1
+        return element
+    found = query(driver, name)
+    if not found:
+        return None
+    element = _cache[name] = CachedElement(found[0], name)
+    return element
+
+def present(name):
+    """Expected condition for WebDriverWait: `wait.until(present('search_box'))`."""
+    def condition(driver):
+        return find(driver, name) or False
+    return condition
+
+def clickable(name):
+    """Expected condition for a displayed and enabled element: `wait.until(clickable('attach_button')).click()`."""
+    def condition(driver):
+        element = find(driver, name)
+        try:
+            if element is not None and element.is_displayed() and element.is_enabled():
+                return element
+        except StaleElementReferenceException:
+            # is_displayed runs as a script, so it bypasses CachedElement's retry
+            _cache.pop(name, None)
+        return False
+    return condition
+
+def new_view():
+    """Call when a different chat or dialog opens; drops the elements that belonged to the old one."""
+    for name in list(_cache):
+        if name not in PAGE_SCOPED:
+            del _cache[name]
+
+def clear_cache():
+    """Call after a page reload; every cached element is gone."""
+    _cache.clear()
+
+def print_stats():
+    if not stats:
+        return
+    print("\n🔎 DOM LOOKUPS")
+    print(f"   {'locator':<24} {'lookups':>8} {'hits':>6} {'queries':>8} {'fallback':>8} {'stale':>6} {'time':>8}")
+    for name, s in sorted(stats.items(), key=lambda item: -item[1]['seconds']):
+        print(f"   {name:<24} {s['lookups']:>8} {s['hits']:>6} {s['queries']:>8} {s['fallbacks']:>8} "
+              f"{s['stale']:>6} {s['seconds']:>7.2f}s")
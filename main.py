@@ -1,331 +1,307 @@
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from selenium.webdriver.common.action_chains import ActionChains
-import pandas as pd
-import PyPDF2
-import re
+from contact_sources import iter_contacts
+from phone_numbers import DEFAULT_COUNTRY_CODE, format_e164
+from sent_ledger import SentLedger
+from not_found_cache import NotFoundCache, NOT_FOUND_ERROR
+from failure_ledger import FailureLedger
+from checkpoint import Checkpoint, CHECKPOINT_EVERY
+from pipeline import ContactFeed, BackgroundWriter, contact_skip_reason
+from media_cache import list_images, prepare_media
+from pacing import RateScheduler, SEND_RATE_LIMITS
+from tracing import span, enable_tracing, disable_tracing, contact_done
+import itertools
 import os
 import time
-import json
 
-# Progress tracking file
+# Progress tracking files
 PROGRESS_FILE = "whatsapp_progress.json"
-SENT_CONTACTS_FILE = "sent_contacts.json"
+PROGRESS_JOURNAL_FILE = "whatsapp_progress.journal"
+SENT_LEDGER_FILE = "sent_contacts.sqlite"  # Existing sent_contacts.json is imported on first run
+NOT_FOUND_CACHE_FILE = "not_found_cache.sqlite"
+FAILURE_JOURNAL_FILE = "failures.journal"  # Error code and details of every failed contact
+FAILURE_REPORT_FILE = "failure_report.json"  # Counts per error code / category, written at the end
+RETRY_ROUNDS = 2  # End-of-run passes over transient failures
+RETRY_BACKOFF_SECONDS = 60  # Wait before the first pass, doubled for each further pass
 
-def initialize_chrome_driver():
-    """Initialize Chrome driver with robust options."""
-    print("🔧 Initializing Chrome driver...")
-    
-    options = webdriver.ChromeOptions()
-    user_data_dir = os.path.abspath("whatsapp_session")
-    if not os.path.exists(user_data_dir):
-        os.makedirs(user_data_dir)
-    
-    options.add_argument(f"--user-data-dir={user_data_dir}")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--start-maximized")
-    options.add_argument("--disable-notifications")
-    options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    options.add_experimental_option('useAutomationExtension', False)
-    
-    try:
-        driver = webdriver.Chrome(options=options)
-        return driver
-    except Exception as e:
-        print(f"❌ Failed to initialize Chrome: {e}")
-        raise
-
-def save_sent_contact(phone_number):
-    sent_contacts = load_sent_contacts()
-    if phone_number not in sent_contacts:
-        sent_contacts.append(phone_number)
-        with open(SENT_CONTACTS_FILE, 'w') as f:
-            json.dump(sent_contacts, f, indent=2)
-
-def load_sent_contacts():
-    if os.path.exists(SENT_CONTACTS_FILE):
-        try:
-            with open(SENT_CONTACTS_FILE, 'r') as f:
-                return json.load(f)
-        except:
-            return []
-    return []
-
-def is_already_sent(phone_number):
-    return phone_number in load_sent_contacts()
-
-def save_progress(current_index, total_contacts, success_count, failed_count, failed_contacts):
-    progress_data = {
-        'current_index': current_index,
-        'total_contacts': total_contacts,
-        'success_count': success_count,
-        'failed_count': failed_count,
-        'failed_contacts': failed_contacts,
-        'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')
-    }
-    with open(PROGRESS_FILE, 'w') as f:
-        json.dump(progress_data, f, indent=2)
-
-def load_progress():
-    if os.path.exists(PROGRESS_FILE):
-        try:
-            with open(PROGRESS_FILE, 'r') as f:
-                return json.load(f)
-        except:
-            return None
-    return None
-
-def extract_contacts_from_pdf(pdf_file):
-    phone_numbers = []
-    try:
-        print(f"📄 Reading PDF file: {pdf_file}")
-        with open(pdf_file, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            full_text = ""
-            for page in pdf_reader.pages:
-                full_text += page.extract_text()
-            
-            patterns = [r'\+?\d{1,4}[-.\s]?\(?\d{1,4}\)?[-.\s]?\d{1,4}[-.\s]?\d{1,9}', r'\d{10}']
-            for pattern in patterns:
-                matches = re.findall(pattern, full_text)
-                for match in matches:
-                    cleaned = re.sub(r'[-.\s()]', '', match)
-                    if 8 <= len(cleaned) <= 15 and cleaned not in phone_numbers:
-                        phone_numbers.append(cleaned)
-        print(f"  ✓ Found {len(phone_numbers)} phone numbers")
-    except Exception as e:
-        print(f"  ❌ Error reading PDF: {e}")
-    return phone_numbers
-
-def clear_search_box_robust(driver):
+def send_to_contact(transport, phone_number, message=None, image_files=None, image_folder=None,
+                    batch_images=True, caption_images=False):
     """
-    FIX: Clears search box AND presses Escape to close previous chat.
-    This prevents sending messages to the wrong person.
+    Opens the chat and sends the message and images through `transport` (see
+    transport.py). results['code'] is None on full success, else a
+    failure_ledger.FAILURE_CODES key; results['error'] has the details.
     """
-    try:
-        # Press Escape multiple times to close any open chat or search
-        # This ensures we don't accidentally type in the previous person's chat
-        actions = ActionChains(driver)
-        actions.send_keys(Keys.ESCAPE).perform()
-        time.sleep(0.5)
-        actions.send_keys(Keys.ESCAPE).perform()
-        time.sleep(0.5)
-    except:
-        pass
-
-def send_to_contact(driver, wait, phone_number, message=None, image_files=None, image_folder=None):
-    results = {'message_sent': False, 'images_sent': 0, 'error': None}
+    results = {'message_sent': False, 'message_expected': bool(message), 'images_sent': 0, 'images_total': len(image_files or []) if image_folder else 0,
+               'image_errors': [], 'images_unverified': 0, 'error': None, 'code': None, 'elapsed': 0.0, 'not_found': False}
+    started = time.monotonic()
     
     # ==========================================
-    # STEP 1: SAFE SEARCH (THE FIX)
+    # STEP 1: SAFE SEARCH (previous chat closed first, so nothing goes to the wrong person)
     # ==========================================
     try:
-        # 1. Clear everything first (Close previous chat)
-        clear_search_box_robust(driver)
-        
-        # 2. Find Search Box
-        search_box = wait.until(EC.presence_of_element_located(
-            (By.XPATH, "//div[@contenteditable='true'][@data-tab='3']")
-        ))
-        search_box.click()
-        
-        # 3. Clear and Type Number
-        search_box.send_keys(Keys.CONTROL + "a")
-        search_box.send_keys(Keys.DELETE)
-        time.sleep(0.5)
-        search_box.send_keys(phone_number)
-        
-        # 4. CRITICAL FIX: Wait and check for "No results found"
-        time.sleep(2.0)
-        try:
-            # Check if WhatsApp says "No results found"
-            no_results = driver.find_elements(By.XPATH, "//*[contains(text(), 'No results found') or contains(text(), 'no results found')]")
-            if len(no_results) > 0:
-                results['error'] = "Contact not found (No results)"
-                # Clean up: clear search and escape
-                search_box.send_keys(Keys.CONTROL + "a")
-                search_box.send_keys(Keys.DELETE)
-                ActionChains(driver).send_keys(Keys.ESCAPE).perform()
-                return results
-        except:
-            pass
-            
-        # 5. Press Enter to open chat
-        search_box.send_keys(Keys.ENTER)
-        time.sleep(3) # Wait for chat to load
-        
-        # 6. Verify Chat is Open (Message box exists)
-        # If we are still on the "WhatsApp Web" home screen, the message box won't be there
-        try:
-            msg_box_check = driver.find_element(By.XPATH, "//div[@contenteditable='true'][@data-tab='10']")
-        except NoSuchElementException:
-            results['error'] = "Chat failed to open"
-            return results
-
+        outcome = transport.open_chat(phone_number)
     except Exception as e:
+        outcome = None
         results['error'] = f"Search error: {str(e)}"
+        results['code'] = 'search_error'
+    results['elapsed'] = time.monotonic() - started
+    if outcome == 'not_found':
+        results['error'] = NOT_FOUND_ERROR
+        results['code'] = 'not_found'
+        results['not_found'] = True
+    elif outcome == 'not_opened':
+        results['error'] = "Chat failed to open"
+        results['code'] = 'chat_not_opened'
+    if outcome != 'opened':
         return results
 
+    # With caption_images the message rides along as the album caption instead
+    caption = message if (caption_images and message and image_files and image_folder) else None
+
     # ==========================================
     # STEP 2: SEND MESSAGE (PRESERVED)
     # ==========================================
-    if message:
+    if message and not caption:
         try:
-            msg_box = wait.until(EC.presence_of_element_located(
-                (By.XPATH, "//div[@contenteditable='true'][@data-tab='10']")
-            ))
-            msg_box.click()
-            time.sleep(0.5)
-            
-            lines = message.split('\n')
-            for i, line in enumerate(lines):
-                msg_box.send_keys(line)
-                if i < len(lines) - 1:
-                    msg_box.send_keys(Keys.SHIFT + Keys.ENTER)
-            
-            time.sleep(0.5)
-            msg_box.send_keys(Keys.ENTER)
+            transport.send_text(message)
             results['message_sent'] = True
-            time.sleep(2)
         except Exception as e:
             results['error'] = f"Message failed: {str(e)}"
+            results['code'] = 'message_failed'
+            results['elapsed'] = time.monotonic() - started
             return results
 
     # ==========================================
-    # STEP 3: SEND IMAGES (YOUR EXACT CODE)
+    # STEP 3: SEND IMAGES (one album upload, per-image loop as fallback)
     # ==========================================
     if image_files and image_folder:
-        success_count = 0
-        for image_file in image_files:
-            image_path = os.path.abspath(os.path.join(image_folder, image_file))
-            try:
-                # YOUR CODE STARTS HERE
-                # Click attach button
-                attach_button = wait.until(EC.element_to_be_clickable(
-                    (By.XPATH, '//*[@id="main"]/footer/div[1]/div/span/div/div/div/div[1]/div/span/button')
-                ))
-                attach_button.click()
-                time.sleep(1.5)
-                
-                # Click "Photos & videos" option
-                photo_video_option = wait.until(EC.element_to_be_clickable(
-                    (By.XPATH, '//*[@id="app"]/div/div/span[6]/div/ul/div/div/div[2]/li/div')
-                ))
-                photo_video_option.click()
-                time.sleep(1)
-                
-                # Upload image
-                file_input = wait.until(EC.presence_of_element_located(
-                    (By.XPATH, "//input[@accept='image/*,video/mp4,video/3gpp,video/quicktime']")
-                ))
-                file_input.send_keys(image_path)
-                time.sleep(3)
-                
-                # Click send button
-                send_button = wait.until(EC.element_to_be_clickable(
-                    (By.XPATH, '//*[@id="app"]/div/div/div[3]/div/div[3]/div[2]/div/span/div/div/div/div[2]/div/div[2]/div[2]/span/div/div')
-                ))
-                # YOUR CODE ENDS HERE
-                
-                send_button.click()
-                success_count += 1
-                time.sleep(4)
-                
-            except Exception as e:
-                print(f"    Image error: {e}")
+        image_paths = [os.path.abspath(os.path.join(image_folder, image_file)) for image_file in image_files]
+        media = transport.send_media(image_paths, caption=caption, batched=batch_images)
+        results['images_sent'] = media['images_sent']
+        results['image_errors'] = media['errors']
+        results['images_unverified'] = media.get('unverified', 0)
+        if caption:
+            results['message_sent'] = media['caption_sent']
+            if not media['caption_sent']:
+                # Caption couldn't be attached, send the text on its own
                 try:
-                    ActionChains(driver).send_keys(Keys.ESCAPE).perform()
-                except:
-                    pass
-                continue
-        
-        results['images_sent'] = success_count
+                    transport.send_text(message)
+                    results['message_sent'] = True
+                except Exception as e:
+                    results['error'] = f"Message failed: {str(e)}"
+                    results['code'] = 'message_failed'
+        if results['code'] is None and results['images_sent'] < results['images_total']:
+            results['code'] = 'images_partial' if results['images_sent'] else 'images_failed'
+            results['error'] = f"Only {results['images_sent']}/{results['images_total']} images sent"
+        if results['code'] is None and results['images_unverified']:
+            # Counted as sent and never retried, but kept in the failure ledger and report
+            results['code'] = 'images_unverified'
+            results['error'] = f"{results['images_unverified']} images sent but not seen in the chat"
 
+    results['elapsed'] = time.monotonic() - started
     return results
 
-def send_whatsapp_from_pdf(pdf_file, message, image_folder=None, start_index=0, resume=False):
-    """Main execution function."""
-    driver = None
-    success_count = 0
-    failed_count = 0
+def record_result(writer, phone, results, index=None, previous=None):
+    """
+    Prints and records one send_to_contact result. The contact counts as sent once
+    its message went out, even if images are missing; those are kept in the failure
+    ledger for the retry pass. `previous` is the failure being retried, if any.
+    """
+    code = results['code']
+    if code is None:
+        print(f"  ✅ Sent successfully ({results['elapsed']:.1f}s)")
+        writer.record(phone, 'sent', index=index,
+                      failure=FailureLedger.resolution(phone) if previous is not None else None)
+        return True
+    failure = FailureLedger.entry_for(phone, results)
+    if previous is not None:
+        # Totals across attempts: the retry only sent what was still missing
+        failure['message_sent'] = failure['message_sent'] or previous['message_sent']
+        failure['images_sent'] += previous['images_sent']
+        failure['images_total'] = previous['images_total']
+    # The message reached them (now, in an earlier attempt, or there is none)
+    delivered = failure['message_sent'] or not results['message_expected']
+    if code.startswith('images_') and delivered:
+        print(f"  ⚠️ Sent, but {results['error']} ({results['elapsed']:.1f}s)")
+        writer.record(phone, 'sent', index=index, failure=failure)
+    else:
+        print(f"  ❌ Failed: {results['error']} [{code}, {failure['category']}] ({results['elapsed']:.1f}s)")
+        writer.record(phone, 'failed', results['error'], index=index, failure=failure,
+                      lookup_seconds=results['elapsed'] if results['not_found'] else None)
+    return False
+
+def retry_transient_failures(transport, writer, failures, scheduler, message, image_files, image_folder,
+                             rounds=RETRY_ROUNDS, backoff=RETRY_BACKOFF_SECONDS, **send_options):
+    """
+    Retries transient failures (timeouts, chats that didn't open, missing images)
+    for up to `rounds` rounds, waiting backoff, 2x backoff, ... before each round.
+    Only what is still missing is sent: no second copy of a delivered message, and
+    only the images that didn't go out.
+    """
+    for round_number in range(1, rounds + 1):
+        writer.wait_idle()
+        pending = failures.retryable()
+        if not pending:
+            return
+        delay = backoff * 2 ** (round_number - 1)
+        print(f"\n🔁 Retry round {round_number}/{rounds}: {len(pending)} transient failures, starting in {delay:.0f}s")
+        with span("cooldown", kind="retry_backoff"):
+            time.sleep(delay)
+        for previous in pending:
+            phone = previous['phone']
+            failed_images = {e['image'] for e in previous.get('image_errors', [])}
+            retry_images = [f for f in image_files if f in failed_images]
+            if not retry_images:
+                # No error names an image (or the names are from another image set)
+                retry_images = image_files[previous['images_sent']:]
+            print(f"\n[retry {round_number}] {format_e164(phone)}: {previous['code']}")
+            scheduler.acquire()
+            with span("contact", retry=round_number) as contact_span:
+                results = send_to_contact(transport, format_e164(phone),
+                                          None if previous['message_sent'] else message,
+                                          retry_images, image_folder, **send_options)
+                contact_span.set(ok=results['code'] is None, images=results['images_sent'])
+            record_result(writer, phone, results, previous=previous)
+
+def send_whatsapp_from_pdf(pdf_file, message, image_folder=None, start_index=0, resume=False, force_reparse=False,
+                           checkpoint_every=CHECKPOINT_EVERY, trace_file=None, batch_images=True, caption_images=False,
+                           country_code=DEFAULT_COUNTRY_CODE, debugger_address=None, rate_limits=SEND_RATE_LIMITS,
+                           prepare_images=True, retry_rounds=RETRY_ROUNDS, retry_backoff=RETRY_BACKOFF_SECONDS,
+                           transport=None):
+    """
+    Main execution function. pdf_file may be a single path or a list of contact files
+    (.pdf, .csv, .xlsx or .vcf); contacts are streamed from them chunk by chunk.
+    A records table from contact_sources.read_records is used as is, without parsing again.
+    Pass trace_file (e.g. "whatsapp_trace.jsonl") to record per-step timings.
+    batch_images sends all images as one album; caption_images puts the message in its caption.
+    Numbers without a '+' or '00' prefix are treated as national numbers of country_code.
+    debugger_address (e.g. "127.0.0.1:9222") attaches to an already running, logged-in Chrome.
+    rate_limits caps sends per 'minute' / 'hour' / 'day', e.g. {'hour': 100, 'day': 500}.
+    prepare_images downscales and re-encodes the images once (cached in media_cache/) before sending.
+    retry_rounds / retry_backoff: retry passes over transient failures at the end of the run (0 turns them off).
+    transport replaces Chrome, e.g. transport.SimulatedTransport() for load tests (see transport.py).
+    """
+    ledger = None
+    not_found = None
+    checkpoint = None
+    feed = None
+    writer = None
+    scheduler = None
+    failures = None
+    media = None
+    recipients = 0
+    transport_started = False
     
     try:
         print("🚀 WHATSAPP BULK SENDER STARTING...")
-        phone_numbers = extract_contacts_from_pdf(pdf_file)
-        
-        if not phone_numbers:
-            return False
+        if trace_file:
+            enable_tracing(trace_file)
+        ledger = SentLedger(SENT_LEDGER_FILE, country_code=country_code)
+        # Numbers that had no WhatsApp account in an earlier run (expire with: python not_found_cache.py expire)
+        not_found = NotFoundCache(NOT_FOUND_CACHE_FILE, country_code=country_code)
 
-        # Resume logic
-        if resume:
-            previous_progress = load_progress()
-            if previous_progress:
-                start_index = previous_progress['current_index']
+        # Resume logic (contacts already in the journal are skipped by number, not position)
+        checkpoint = Checkpoint(PROGRESS_FILE, PROGRESS_JOURNAL_FILE, every=checkpoint_every, country_code=country_code)
+        if resume and checkpoint.load():
+            if checkpoint.processed:
+                print(f"🔄 Resuming: {len(checkpoint.processed)} contacts already processed "
+                      f"({checkpoint.success_count} sent, {checkpoint.failed_count} failed)")
+            else:
+                start_index = checkpoint.legacy_index
                 print(f"🔄 Resuming from index {start_index}")
+        elif not resume:
+            checkpoint.reset()
+        # Error code, category and partial image delivery of every failed contact
+        failures = FailureLedger(FAILURE_JOURNAL_FILE, FAILURE_REPORT_FILE)
+        if resume:
+            failures.load()
+        else:
+            failures.reset()
 
-        # Filter contacts
-        contacts_to_process = phone_numbers[start_index:]
+        # Extraction, validation and skip checks run ahead of the browser in a background thread
+        numbered = itertools.islice(enumerate(iter_contacts(pdf_file, country_code=country_code,
+                                                            force_reparse=force_reparse)), start_index, None)
+        feed = ContactFeed(((index, phone, contact_skip_reason(phone, checkpoint, ledger, not_found))
+                            for index, phone in numbered),
+                           counted=lambda contact: not contact[2]).start()
+        contacts_to_process = iter(feed)
+        first_contact = next(contacts_to_process, None)
         
-        # Prepare images
-        image_files = []
-        if image_folder and os.path.exists(image_folder):
-            image_files = [f for f in os.listdir(image_folder) if f.lower().endswith(('.png', '.jpg', '.jpeg'))]
+        if first_contact is None:
+            return False
 
-        # Init Driver
-        driver = initialize_chrome_driver()
-        driver.get("https://web.whatsapp.com")
-        print("📱 Please Scan QR Code...")
-        wait = WebDriverWait(driver, 300)
-        
-        # Wait for load
-        wait.until(EC.presence_of_element_located((By.XPATH, "//div[@contenteditable='true'][@data-tab='3']")))
-        print("✅ WhatsApp Loaded!")
+        # Ledger and checkpoint writes happen on their own thread from here on
+        writer = BackgroundWriter(ledger, checkpoint, not_found=not_found, failures=failures).start()
+        # Send pacing; the allowance used by earlier runs is remembered in pacing_state.json
+        scheduler = RateScheduler(rate_limits)
         
-        for idx, phone in enumerate(contacts_to_process, 1):
-            actual_index = start_index + idx - 1
-            print(f"\n[{actual_index + 1}/{len(phone_numbers)}] Processing: {phone}")
+        # Prepare images (sorted by name; re-encoded once, reused from the cache on later runs)
+        image_files = list_images(image_folder)
+        if image_files and prepare_images:
+            with span("media_prepare", images=len(image_files)):
+                media = prepare_media([os.path.join(image_folder, f) for f in image_files])
+            image_folder, image_files = media.folder, media.files
 
-            if is_already_sent(phone):
-                print("  ⏭️  Skipped (Already sent)")
+        # Start or attach to Chrome (the feed keeps extracting meanwhile); returns once logged in
+        if transport is None:
+            # Imported here so runs on another transport don't need Selenium
+            from selenium_transport import SeleniumTransport
+            transport = SeleniumTransport(debugger_address=debugger_address)
+        transport.start()
+        transport_started = True
+        
+        for actual_index, phone, skip in itertools.chain([first_contact], contacts_to_process):
+            if skip:
+                print(f"\n[{actual_index + 1}] Processing: {phone}")
+                print(f"  ⏭️  Skipped ({skip})")
                 continue
 
-            results = send_to_contact(driver, wait, phone, message, image_files, image_folder)
-            
-            if results['error']:
-                print(f"  ❌ Failed: {results['error']}")
-                failed_count += 1
-            else:
-                print(f"  ✅ Sent successfully")
-                success_count += 1
-                save_sent_contact(phone)
+            remaining, exact = feed.remaining()
+            print(f"\n[{actual_index + 1}] Processing: {phone}  ({scheduler.describe_eta(remaining + 1, exact)})")
+            # Waits only if sending now would exceed a configured rate limit
+            scheduler.acquire()
 
-            save_progress(actual_index + 1, len(phone_numbers), success_count, failed_count, [])
+            recipients += 1
+            with span("contact") as contact_span:
+                results = send_to_contact(transport, phone, message, image_files, image_folder,
+                                          batch_images=batch_images, caption_images=caption_images)
+                contact_span.set(ok=results['code'] is None, images=results['images_sent'])
+            contact_done()
             
-            # --- 1 HOUR WAIT LOGIC (UPDATED TO 100) ---
-            # If we have processed 100 contacts in this session, pause for 1 hour
-            if idx > 0 and idx % 100 == 0 and idx < len(contacts_to_process):
-                print("\n" + "="*50)
-                print(f"⏳ 100 MESSAGES SENT. PAUSING FOR 1 HOUR.")
-                print(f"   Current Time: {time.strftime('%H:%M:%S')}")
-                print(f"   Will resume at: {time.strftime('%H:%M:%S', time.localtime(time.time() + 3600))}")
-                print("="*50 + "\n")
-                time.sleep(7200)  # Sleep for 3600 seconds (1 Hour)
-            else:
-                # Normal short delay between messages
-                time.sleep(2)
+            record_result(writer, phone, results, index=actual_index)
+
+            # e.g. reloads the page when the tab has grown too big
+            transport.check()
+
+        # Transient failures (this run's and earlier runs') get another go, with backoff
+        retry_transient_failures(transport, writer, failures, scheduler, message, image_files, image_folder,
+                                 rounds=retry_rounds, backoff=retry_backoff,
+                                 batch_images=batch_images, caption_images=caption_images)
 
     except Exception as e:
         print(f"❌ Critical Error: {e}")
     finally:
-        if driver:
-            time.sleep(5)
-            driver.quit()
+        if feed is not None:
+            feed.stop()
+        if writer is not None:
+            writer.close()
+        if checkpoint is not None:
+            checkpoint.close()
+        if ledger is not None:
+            ledger.close()
+        if not_found is not None:
+            not_found.print_report()
+            not_found.close()
+        if failures is not None:
+            failures.write_report()
+        if transport_started:
+            transport.print_report()
+        if scheduler is not None:
+            scheduler.close()
+            scheduler.print_report()
+        if media is not None:
+            media.print_report(recipients)
+        disable_tracing()
+        if transport_started:
+            transport.close()
 
 if __name__ == "__main__":
     pdf_file = "contacts.pdf"
@@ -0,0 +1,163 @@
+from checkpoint import atomic_write_json
+from extraction_cache import file_hash, process_pool
+import json
+import os
+import shutil
+
+# ==========================================
+# MEDIA PREPARATION
+# Images are re-encoded once per campaign, not uploaded as phone-camera
+# originals to every recipient. They are downscaled to MAX_DIMENSION and saved
+# as JPEG at JPEG_QUALITY, in parallel across cores. Results are cached in
+# MEDIA_CACHE_DIR by content hash + settings, so later runs reuse them.
+# Requires Pillow (pip install pillow); without it the originals are sent.
+# ==========================================
+MEDIA_CACHE_DIR = "media_cache"
+MAX_DIMENSION = 1600        # Longest side in pixels; WhatsApp scales photos down to about this anyway
+JPEG_QUALITY = 82
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+UPLOAD_BYTES_PER_SECOND = 1024 * 1024  # Assumed upload speed for the "upload time avoided" estimate
+
+def list_images(image_folder):
+    """Image files in the folder, sorted by name so every run sends them in the same order."""
+    if not image_folder or not os.path.isdir(image_folder):
+        return []
+    return sorted((f for f in os.listdir(image_folder) if f.lower().endswith(IMAGE_EXTENSIONS)), key=str.lower)
+
+def _encode(source, target, max_dimension, quality):
+    """
+    Worker: downscales and re-encodes one image. Returns True if that made it
+    smaller, False if not, or the error text if the image couldn't be read or encoded.
+    """
+    from PIL import Image, ImageOps
+
+    tmp_target = target + '.tmp'
+    try:
+        with Image.open(source) as image:
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+            if image.mode in ('RGBA', 'LA', 'P'):
+                # JPEG has no alpha; flatten onto white as WhatsApp does
+                image = image.convert('RGBA')
+                background = Image.new('RGB', image.size, (255, 255, 255))
+                background.paste(image, mask=image.getchannel('A'))
+                image = background
+            elif image.mode != 'RGB':
+                image = image.convert('RGB')
+            image.save(tmp_target, 'JPEG', quality=quality, optimize=True, progressive=True)
+        if os.path.getsize(tmp_target) >= os.path.getsize(source):
+            os.remove(tmp_target)
+            return False
+        os.replace(tmp_target, target)
+        return True
+    except Exception as e:
+        if os.path.exists(tmp_target):
+            os.remove(tmp_target)
+        return f"{type(e).__name__}: {e}"
+
+class PreparedMedia:
+    """
+    The prepared images of a campaign: `folder` + `files` go wherever the original
+    image folder and file names went. Keeps the byte counts for the report.
+    """
+
+    def __init__(self, folder, files, original_bytes, prepared_bytes, encoded, reused):
+        self.folder = folder
+        self.files = files
+        self.original_bytes = original_bytes
+        self.prepared_bytes = prepared_bytes
+        self.encoded = encoded
+        self.reused = reused
+
+    @property
+    def paths(self):
+        return [os.path.abspath(os.path.join(self.folder, f)) for f in self.files]
+
+    def upload_seconds_saved(self, recipients=1):
+        return (self.original_bytes - self.prepared_bytes) * recipients / UPLOAD_BYTES_PER_SECOND
+
+    def print_report(self, recipients=None):
+        if not self.files:
+            return
+        saved = self.original_bytes - self.prepared_bytes
+        line = (f"🖼️ Media: {len(self.files)} images ({self.encoded} re-encoded, {self.reused} from cache), "
+                f"{self.original_bytes / 2**20:.1f}MB -> "
+                f"{self.prepared_bytes / 2**20:.1f}MB ({saved / 2**20:.1f}MB less per recipient, "
+                f"~{self.upload_seconds_saved():.1f}s upload")
+        if recipients:
+            line += f"; ~{self.upload_seconds_saved(recipients) / 60:.1f} min over {recipients} recipients"
+        print(line + ")")
+
+def prepare_media(image_paths, max_dimension=MAX_DIMENSION, quality=JPEG_QUALITY, workers=None,
+                  cache_dir=MEDIA_CACHE_DIR):
+    """
+    Returns PreparedMedia for the given image files (missing ones are skipped),
+    re-encoding only images not already in the cache. Images that wouldn't get
+    smaller are copied into the cache unchanged.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    index_file = os.path.join(cache_dir, "index.json")
+    try:
+        with open(index_file, 'r') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = {}
+
+    jobs = {}
+    files = []
+    original_bytes = 0
+    for path in image_paths:
+        if not os.path.exists(path):
+            print(f"    ⚠️ Image not found: {path}")
+            continue
+        original_bytes += os.path.getsize(path)
+        key = f"{file_hash(path)[:24]}-{max_dimension}-q{quality}"
+        name = index.get(key)
+        if name and os.path.exists(os.path.join(cache_dir, name)):
+            files.append(name)
+            continue
+        files.append(key)
+        jobs[key] = path
+
+    encoded = 0
+    if jobs:
+        try:
+            import PIL
+        except ImportError:
+            print("    ⚠️ Pillow not installed, sending the original images (pip install pillow)")
+            originals = [os.path.abspath(p) for p in image_paths if os.path.exists(p)]
+            return PreparedMedia(os.path.dirname(originals[0]), [os.path.basename(p) for p in originals],
+                                 original_bytes, original_bytes, 0, 0)
+
+        targets = {key: os.path.join(cache_dir, key + ".jpg") for key in jobs}
+        args = [(jobs[key], targets[key], max_dimension, quality) for key in jobs]
+        if len(args) > 1 and workers != 1:
+            with process_pool(workers) as pool:
+                results = list(pool.map(_encode, *zip(*args)))
+        else:
+            results = [_encode(*a) for a in args]
+
+        failed = {}
+        for (key, source), smaller in zip(jobs.items(), results):
+            if isinstance(smaller, str):
+                # Sent as it is this run; not indexed, so the next run tries to encode it again
+                print(f"    ⚠️ Can't re-encode {os.path.basename(source)} ({smaller}), sending the original")
+                failed[key] = key + os.path.splitext(source)[1].lower()
+                try:
+                    shutil.copyfile(source, os.path.join(cache_dir, failed[key]))
+                except OSError as e:
+                    print(f"    ⚠️ Can't read {os.path.basename(source)} ({e}), leaving it out")
+                    failed[key] = None
+                continue
+            if smaller:
+                index[key] = key + ".jpg"
+                encoded += 1
+            else:
+                index[key] = key + os.path.splitext(source)[1].lower()
+                shutil.copyfile(source, os.path.join(cache_dir, index[key]))
+        atomic_write_json(index_file, index)
+        files = [failed[name] if name in failed else index.get(name, name) for name in files]
+        files = [name for name in files if name]
+
+    prepared_bytes = sum(os.path.getsize(os.path.join(cache_dir, f)) for f in files)
+    return PreparedMedia(cache_dir, files, original_bytes, prepared_bytes, encoded, len(files) - len(jobs))
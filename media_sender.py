@@ -0,0 +1,122 @@
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.common.action_chains import ActionChains
+from selenium.common.exceptions import TimeoutException
+from tracing import span
+from locators import find_all, clickable, present
+from text_input import insert_text
+from ui_waits import UPLOAD_PREVIEW_TIMEOUT, MEDIA_SENT_TIMEOUT, wait_for, wait_for_clickable, wait_for_gone
+import os
+
+def count_media(driver):
+    """Outgoing media messages in the open chat (an album is one message)."""
+    return len(find_all(driver, 'media_messages'))
+
+def open_file_input(driver, wait):
+    """Attach button -> "Photos & videos"; returns the image file input."""
+    wait.until(clickable('attach_button')).click()
+    wait.until(clickable('photos_option')).click()
+    return wait.until(present('file_input'))
+
+def type_caption(driver, caption):
+    caption_box = wait_for_clickable(driver, 'caption_box', UPLOAD_PREVIEW_TIMEOUT)
+    if caption_box is None:
+        return False
+    insert_text(driver, caption_box, caption)
+    return True
+
+def send_album(driver, wait, image_paths, caption=None):
+    """
+    Uploads every image through one file-input call and sends them as a single album.
+    Returns (images delivered, caption_sent); images delivered is None when the
+    preview closed but no new media message could be seen, i.e. unverified. Raises
+    TimeoutException if the preview never appears, i.e. before anything was sent.
+    """
+    with span("image_attach", images=len(image_paths)):
+        file_input = open_file_input(driver, wait)
+    with span("image_upload", images=len(image_paths)):
+        # Chrome accepts several files in one send_keys, separated by newlines
+        file_input.send_keys('\n'.join(image_paths))
+        send_button = wait_for_clickable(driver, 'media_send_button', UPLOAD_PREVIEW_TIMEOUT)
+        if send_button is None:
+            raise TimeoutException("Upload preview not ready")
+        caption_sent = bool(caption) and type_caption(driver, caption)
+    with span("image_send", images=len(image_paths)) as send_span:
+        media_before = count_media(driver)
+        send_button.click()
+        if not wait_for_gone(driver, send_button, MEDIA_SENT_TIMEOUT):
+            send_span.set(delivered=0)
+            return 0, False
+        # WhatsApp shows an album as one message (a 4-tile grid with a "+N" overlay) or
+        # as one message per image, so any new media message means the album went out
+        new_messages = wait_for(driver, lambda d: count_media(d) - media_before, MEDIA_SENT_TIMEOUT)
+        delivered = len(image_paths) if new_messages else None
+        send_span.set(delivered=delivered)
+    return delivered, caption_sent
+
+def send_images_one_by_one(driver, wait, image_paths, errors=None):
+    """
+    The original flow: one attach/upload/send cycle per image. Returns images sent;
+    per-image failures are appended to `errors` as {'image': name, 'error': text}.
+    """
+    success_count = 0
+    for image_path in image_paths:
+        image_file = os.path.basename(image_path)
+        try:
+            with span("image_attach", image=image_file):
+                file_input = open_file_input(driver, wait)
+            with span("image_upload", image=image_file):
+                file_input.send_keys(image_path)
+                send_button = wait_for_clickable(driver, 'media_send_button', UPLOAD_PREVIEW_TIMEOUT)
+                if send_button is None:
+                    raise TimeoutException("Upload preview not ready")
+            with span("image_send", image=image_file):
+                media_before = count_media(driver)
+                send_button.click()
+                success_count += 1
+                # Preview closes and the media bubble is appended once the image is sent
+                wait_for_gone(driver, send_button, MEDIA_SENT_TIMEOUT)
+                wait_for(driver, lambda d: count_media(d) > media_before, MEDIA_SENT_TIMEOUT)
+        except Exception as e:
+            print(f"    Image error: {e}")
+            if errors is not None:
+                errors.append({'image': image_file, 'error': f"{type(e).__name__}: {e}".strip()})
+            try:
+                ActionChains(driver).send_keys(Keys.ESCAPE).perform()
+            except:
+                pass
+    return success_count
+
+def send_images(driver, wait, image_paths, caption=None, batched=True):
+    """
+    Sends images to the open chat. In batched mode they go out as one album (with
+    an optional caption); if the album upload fails before sending, it falls back
+    to the per-image loop. Returns {'images_sent': n, 'caption_sent': bool, 'errors': [...],
+    'unverified': n}, errors holding {'image': name, 'error': text} for every image that
+    didn't go out; 'unverified' of the images sent had no media message to confirm them.
+    """
+    results = {'images_sent': 0, 'caption_sent': False, 'errors': [], 'unverified': 0}
+    missing = [p for p in image_paths if not os.path.exists(p)]
+    results['errors'] = [{'image': os.path.basename(p), 'error': "File not found"} for p in missing]
+    image_paths = [p for p in image_paths if os.path.exists(p)]
+    if not image_paths:
+        return results
+    if batched and (len(image_paths) > 1 or caption):
+        try:
+            delivered, results['caption_sent'] = send_album(driver, wait, image_paths, caption)
+            if delivered is None:
+                print(f"    ⚠️ Album of {len(image_paths)} sent, but no new media message was seen (unverified)")
+                delivered = results['unverified'] = len(image_paths)
+            elif delivered == 0:
+                print("    ⚠️ Album preview never closed, nothing was sent")
+                results['errors'] += [{'image': os.path.basename(p), 'error': "Album preview did not close"}
+                                      for p in image_paths]
+            results['images_sent'] = delivered
+            return results
+        except Exception as e:
+            print(f"    ⚠️ Album upload failed ({e}), sending images one by one")
+            try:
+                ActionChains(driver).send_keys(Keys.ESCAPE).perform()
+            except:
+                pass
+    results['images_sent'] = send_images_one_by_one(driver, wait, image_paths, results['errors'])
+    return results
@@ -0,0 +1,108 @@
+from session import reload_whatsapp
+from tracing import span
+import json
+import time
+
+# ==========================================
+# BROWSER MEMORY WATCHDOG
+# WhatsApp Web's heap and DOM grow with every chat opened. Instead of reloading
+# the page unconditionally, both flows sample the tab every CHECK_EVERY contacts
+# and only reload once a threshold is exceeded. Samples are appended to
+# MEMORY_LOG_FILE so the limits can be tuned from real runs.
+# ==========================================
+CHECK_EVERY = 10              # Contacts (or groups) between samples
+HEAP_LIMIT_MB = 500           # Reload once the JS heap in use exceeds this
+DOM_NODE_LIMIT = 150000       # ...or the document holds more nodes than this
+MEMORY_LOG_FILE = "memory_samples.jsonl"  # None to only print
+
+# Fallback when CDP is unavailable (performance.memory is Chrome-only and coarse)
+SAMPLE_SCRIPT = """
+const memory = performance.memory || {};
+return [memory.usedJSHeapSize || 0, document.getElementsByTagName('*').length];
+"""
+
+def sample_memory(driver):
+    """Returns (heap_bytes, dom_nodes, source) for the current tab."""
+    try:
+        driver.execute_cdp_cmd("Performance.enable", {})
+        metrics = driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+        values = {metric["name"]: metric["value"] for metric in metrics}
+        return int(values["JSHeapUsedSize"]), int(values["Nodes"]), "cdp"
+    except Exception:
+        heap, nodes = driver.execute_script(SAMPLE_SCRIPT)
+        return int(heap), int(nodes), "performance"
+
+class MemoryWatchdog:
+    """
+    Call check() between contacts, while no chat or dialog is open. Every `every`
+    calls it samples the tab; past a limit it reloads WhatsApp and waits for the
+    chat list, which is the state both flows start each contact from.
+    """
+
+    def __init__(self, driver, heap_limit_mb=HEAP_LIMIT_MB, dom_node_limit=DOM_NODE_LIMIT,
+                 every=CHECK_EVERY, log_file=MEMORY_LOG_FILE):
+        self.driver = driver
+        self.heap_limit = heap_limit_mb * 2**20
+        self.dom_node_limit = dom_node_limit
+        self.every = max(1, every)
+        self.log_file = log_file
+        self.calls = 0
+        self.samples = 0
+        self.reloads = 0
+        self.peak_heap = 0
+        self.peak_nodes = 0
+
+    def _log(self, record):
+        if self.log_file:
+            with open(self.log_file, 'a') as f:
+                f.write(json.dumps(record) + '\n')
+
+    def sample(self, event="sample"):
+        try:
+            heap, nodes, source = sample_memory(self.driver)
+        except Exception as e:
+            print(f"⚠️ Memory sample failed: {e}")
+            return None
+        self.samples += 1
+        self.peak_heap = max(self.peak_heap, heap)
+        self.peak_nodes = max(self.peak_nodes, nodes)
+        self._log({'time': round(time.time(), 3), 'event': event, 'contacts': self.calls,
+                   'heap_mb': round(heap / 2**20, 1), 'dom_nodes': nodes, 'source': source})
+        return heap, nodes
+
+    def over_limit(self, heap, nodes):
+        reasons = []
+        if heap > self.heap_limit:
+            reasons.append(f"heap {heap / 2**20:.0f}MB > {self.heap_limit / 2**20:.0f}MB")
+        if nodes > self.dom_node_limit:
+            reasons.append(f"{nodes} DOM nodes > {self.dom_node_limit}")
+        return reasons
+
+    def check(self):
+        """Counts one contact; samples (and reloads if needed) every `every` calls. Returns True if it reloaded."""
+        self.calls += 1
+        if self.calls % self.every:
+            return False
+        with span("memory_check") as check_span:
+            measured = self.sample()
+            if measured is None:
+                return False
+            heap, nodes = measured
+            reasons = self.over_limit(heap, nodes)
+            check_span.set(heap_mb=round(heap / 2**20, 1), dom_nodes=nodes, reload=bool(reasons))
+            print(f"🧠 Memory: heap {heap / 2**20:.0f}MB, {nodes} DOM nodes")
+            if not reasons:
+                return False
+
+            print(f"🔄 Reloading WhatsApp to free memory ({', '.join(reasons)})...")
+            if not reload_whatsapp(self.driver):
+                print("⚠️ WhatsApp did not come back after the reload")
+            self.reloads += 1
+            self.sample(event="after_reload")
+            return True
+
+    def print_report(self):
+        if not self.samples:
+            return
+        print(f"🧠 Memory watchdog: {self.samples} samples, peak heap {self.peak_heap / 2**20:.0f}MB, "
+              f"peak {self.peak_nodes} DOM nodes, {self.reloads} reloads")
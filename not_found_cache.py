@@ -0,0 +1,176 @@
+from contact_extractor import normalize_phone
+from phone_numbers import DEFAULT_COUNTRY_CODE
+import argparse
+import heapq
+import sqlite3
+import time
+
+# ==========================================
+# NOT-FOUND CACHE
+# Numbers WhatsApp answered with "No results found" are remembered for
+# NOT_FOUND_TTL_DAYS, so reruns and later campaigns skip them without touching
+# the browser. Past MAX_ENTRIES the least recently checked entries are evicted.
+#     python not_found_cache.py stats | list | expire [--days N] | remove NUMBER ... | clear
+# National numbers get `country_code`, like everywhere else.
+# ==========================================
+NOT_FOUND_CACHE_FILE = "not_found_cache.sqlite"
+NOT_FOUND_TTL_DAYS = 30
+MAX_ENTRIES = 100000
+NOT_FOUND_ERROR = "Contact not found (No results)"
+
+class NotFoundCache:
+    """
+    Normalized numbers with no WhatsApp account, loaded into a dict once so
+    lookups are O(1). add_many() commits once per call. Safe to read from the
+    contact feed thread while the progress writer thread adds entries.
+    """
+
+    def __init__(self, path=NOT_FOUND_CACHE_FILE, ttl_days=NOT_FOUND_TTL_DAYS, max_entries=MAX_ENTRIES,
+                 country_code=DEFAULT_COUNTRY_CODE):
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS not_found ("
+            "phone TEXT PRIMARY KEY, checked_at REAL NOT NULL, lookup_seconds REAL NOT NULL, hits INTEGER NOT NULL DEFAULT 0)"
+        )
+        self.country_code = country_code
+        self.ttl = ttl_days * 86400
+        self.max_entries = max_entries
+        self.entries = {}
+        self.expire()
+        self.entries = {phone: (checked_at, lookup_seconds) for phone, checked_at, lookup_seconds
+                        in self.conn.execute("SELECT phone, checked_at, lookup_seconds FROM not_found")}
+        self.hits = {}
+        self.added = 0
+        self.seconds_saved = 0.0
+
+    def __contains__(self, phone_number):
+        entry = self.entries.get(normalize_phone(phone_number, self.country_code))
+        return entry is not None and time.time() - entry[0] < self.ttl
+
+    def __len__(self):
+        return len(self.entries)
+
+    def hit(self, phone_number):
+        """Counts a lookup the cache saved, credited with what that lookup cost when it was made."""
+        phone = normalize_phone(phone_number, self.country_code)
+        entry = self.entries.get(phone)
+        if entry is not None:
+            self.hits[phone] = self.hits.get(phone, 0) + 1
+            self.seconds_saved += entry[1]
+
+    def skip(self, phone_number):
+        """True (and counted as a hit) if the number is cached as not on WhatsApp."""
+        if phone_number in self:
+            self.hit(phone_number)
+            return True
+        return False
+
+    def add(self, phone_number, lookup_seconds=0.0):
+        self.add_many([(phone_number, lookup_seconds)])
+
+    def add_many(self, lookups):
+        """Caches (number, seconds the failed lookup took) pairs with a single commit."""
+        now = time.time()
+        rows = [(normalize_phone(phone, self.country_code), now, lookup_seconds or 0.0) for phone, lookup_seconds in lookups]
+        if not rows:
+            return
+        self.conn.executemany(
+            "INSERT INTO not_found (phone, checked_at, lookup_seconds) VALUES (?, ?, ?) "
+            "ON CONFLICT(phone) DO UPDATE SET checked_at = excluded.checked_at, lookup_seconds = excluded.lookup_seconds",
+            rows)
+        for phone, checked_at, lookup_seconds in rows:
+            self.entries[phone] = (checked_at, lookup_seconds)
+        self.added += len(rows)
+        if len(self.entries) > self.max_entries:
+            self.evict()
+        self.conn.commit()
+
+    def evict(self):
+        """Drops the least recently checked entries above max_entries."""
+        overflow = len(self.entries) - self.max_entries
+        oldest = heapq.nsmallest(overflow, self.entries.items(), key=lambda item: item[1][0])
+        self.conn.executemany("DELETE FROM not_found WHERE phone = ?", [(phone,) for phone, _ in oldest])
+        for phone, _ in oldest:
+            del self.entries[phone]
+
+    def expire(self, older_than_days=None):
+        """Deletes entries past the TTL (or older than `older_than_days`). Returns how many."""
+        max_age = self.ttl if older_than_days is None else older_than_days * 86400
+        cutoff = time.time() - max_age
+        removed = self.conn.execute("DELETE FROM not_found WHERE checked_at < ?", (cutoff,)).rowcount
+        self.conn.commit()
+        self.entries = {phone: entry for phone, entry in self.entries.items() if entry[0] >= cutoff}
+        return removed
+
+    def remove(self, phone_numbers):
+        phones = [normalize_phone(p, self.country_code) for p in phone_numbers]
+        self.conn.executemany("DELETE FROM not_found WHERE phone = ?", [(p,) for p in phones])
+        self.conn.commit()
+        for phone in phones:
+            self.entries.pop(phone, None)
+
+    def clear(self):
+        self.conn.execute("DELETE FROM not_found")
+        self.conn.commit()
+        self.entries = {}
+
+    def print_report(self):
+        skipped = sum(self.hits.values())
+        if skipped or self.added:
+            print(f"🚫 Not-found cache: {skipped} lookups skipped (~{self.seconds_saved:.0f}s of browser time saved), "
+                  f"{self.added} numbers added, {len(self.entries)} cached")
+
+    def close(self):
+        if self.hits:
+            self.conn.executemany("UPDATE not_found SET hits = hits + ? WHERE phone = ?",
+                                  [(count, phone) for phone, count in self.hits.items()])
+            self.conn.commit()
+        self.conn.close()
+
+def run_command(action, path=NOT_FOUND_CACHE_FILE, limit=50, days=None, numbers=(), country_code=DEFAULT_COUNTRY_CODE):
+    """Runs one maintenance command: stats, list, expire, remove or clear (also `whatsapp-automation not-found`)."""
+    # No TTL while opening, so stats/list show expired entries too until `expire` runs
+    cache = NotFoundCache(path, ttl_days=float('inf'), country_code=country_code)
+    if action == "expire":
+        print(f"🧹 Expired {cache.expire(NOT_FOUND_TTL_DAYS if days is None else days)} entries")
+    elif action == "stats":
+        count, oldest, hits, saved = cache.conn.execute(
+            "SELECT COUNT(*), MIN(checked_at), COALESCE(SUM(hits), 0), COALESCE(SUM(hits * lookup_seconds), 0) FROM not_found"
+        ).fetchone()
+        print(f"🚫 {count} numbers cached (TTL {NOT_FOUND_TTL_DAYS} days, max {MAX_ENTRIES})")
+        if count:
+            print(f"   Oldest entry: {time.strftime('%Y-%m-%d %H:%M', time.localtime(oldest))}")
+            print(f"   {hits} lookups skipped so far, ~{saved / 60:.1f} min of browser time saved")
+    elif action == "list":
+        rows = cache.conn.execute("SELECT phone, checked_at, lookup_seconds, hits FROM not_found "
+                                  "ORDER BY checked_at DESC LIMIT ?", (limit,))
+        for phone, checked_at, lookup_seconds, hits in rows:
+            print(f"{phone:>16}  checked {time.strftime('%Y-%m-%d %H:%M', time.localtime(checked_at))}  "
+                  f"lookup {lookup_seconds:.1f}s  skipped {hits}x")
+    elif action == "remove":
+        cache.remove(numbers)
+        print(f"🗑️ Removed {len(numbers)} numbers")
+    elif action == "clear":
+        cache.clear()
+        print("🗑️ Cache cleared")
+    cache.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect or expire the cache of numbers that aren't on WhatsApp.")
+    parser.add_argument("--file", dest="path", default=NOT_FOUND_CACHE_FILE)
+    parser.add_argument("--country-code", default=DEFAULT_COUNTRY_CODE,
+                        help="country code for numbers without a +/00 prefix (remove)")
+    commands = parser.add_subparsers(dest="action", required=True)
+    commands.add_parser("stats", help="entry count, age and time saved so far")
+    list_parser = commands.add_parser("list", help="cached numbers, most recently checked first")
+    list_parser.add_argument("--limit", type=int, default=50)
+    expire_parser = commands.add_parser("expire", help="drop entries past the TTL")
+    expire_parser.add_argument("--days", type=float, default=None, help=f"max age in days (default {NOT_FOUND_TTL_DAYS})")
+    remove_parser = commands.add_parser("remove", help="forget specific numbers")
+    remove_parser.add_argument("numbers", nargs="+")
+    commands.add_parser("clear", help="forget every number")
+    run_command(**vars(parser.parse_args(argv)))
+
+if __name__ == "__main__":
+    main()
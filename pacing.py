@@ -0,0 +1,154 @@
+from checkpoint import atomic_write_json
+from tracing import span
+import json
+import os
+import time
+
+# ==========================================
+# RATE LIMITS
+# Maximum sends per window, enforced as token buckets: each window holds up to
+# `limit` tokens, refilled continuously at limit/window, and every send takes one
+# token from each. Time spent on a slow send refills the buckets too, so no
+# fixed delay is added on top of it. Bucket levels are saved to a state file, so
+# restarting the script doesn't reset the hourly/daily allowance. They are written
+# every SAVE_EVERY sends or SAVE_SECONDS and on close(), so a crash can forget at
+# most that many sends.
+# ==========================================
+WINDOWS = {'minute': 60, 'hour': 3600, 'day': 86400}
+SEND_RATE_LIMITS = {'minute': 20, 'hour': 100}   # Contacts messaged by main.py
+GROUP_RATE_LIMITS = {'minute': 1}                # Groups created by group_creation.py
+PACING_STATE_FILE = "pacing_state.json"
+GROUP_PACING_STATE_FILE = "group_pacing_state.json"
+PAUSE_NOTICE_SECONDS = 30  # Waits longer than this are announced with their resume time
+WORK_SMOOTHING = 0.2       # Weight of the latest send in the average send duration
+SAVE_EVERY = 10            # Sends between state-file writes (an fsync each), so acquire() stays off the disk...
+SAVE_SECONDS = 60          # ...or at most this long; close() writes the final state
+
+def format_duration(seconds):
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+
+class RateScheduler:
+    """
+    Call acquire() right before each send; it returns once every configured
+    window has a token left. eta(n) estimates how long n more sends take, from
+    the bucket levels and the measured average send duration.
+    """
+
+    def __init__(self, limits=SEND_RATE_LIMITS, state_file=PACING_STATE_FILE):
+        unknown = set(limits) - set(WINDOWS)
+        if unknown:
+            raise ValueError(f"Unknown rate window(s) {sorted(unknown)}; use {sorted(WINDOWS)}")
+        self.limits = {window: limit for window, limit in limits.items() if limit}
+        self.state_file = state_file
+        self.tokens = {window: float(limit) for window, limit in self.limits.items()}
+        self.updated = time.time()
+        self.last_acquired = None
+        self.average_work = None
+        self.waited = 0.0
+        self.unsaved = 0
+        self.last_save = time.monotonic()
+        self.load()
+
+    def load(self):
+        if not self.state_file or not os.path.exists(self.state_file):
+            return
+        try:
+            with open(self.state_file, 'r') as f:
+                state = json.load(f)
+            for window, tokens in state.get('tokens', {}).items():
+                if window in self.tokens:
+                    self.tokens[window] = min(float(tokens), self.limits[window])
+            self.updated = state.get('updated', self.updated)
+            self.average_work = state.get('average_work')
+        except Exception as e:
+            print(f"⚠️ Pacing state unreadable ({e}), starting with full allowance")
+
+    def save(self):
+        self.unsaved = 0
+        self.last_save = time.monotonic()
+        # Without limits there is no allowance to remember
+        if self.state_file and self.limits:
+            atomic_write_json(self.state_file, {
+                'limits': self.limits,
+                'tokens': {window: round(tokens, 4) for window, tokens in self.tokens.items()},
+                'updated': self.updated,
+                'average_work': self.average_work
+            })
+
+    def _refill(self, now):
+        elapsed = max(0.0, now - self.updated)
+        for window, limit in self.limits.items():
+            self.tokens[window] = min(limit, self.tokens[window] + elapsed * limit / WINDOWS[window])
+        self.updated = now
+
+    def wait_time(self):
+        """Seconds until every window has a whole token."""
+        self._refill(time.time())
+        return max([(1 - tokens) * WINDOWS[window] / self.limits[window]
+                    for window, tokens in self.tokens.items() if tokens < 1] or [0.0])
+
+    def acquire(self):
+        """Blocks until the rate limits allow one more send, then takes its token. Returns seconds waited."""
+        now = time.monotonic()
+        if self.last_acquired is not None:
+            work = now - self.last_acquired
+            self.average_work = work if self.average_work is None else \
+                (1 - WORK_SMOOTHING) * self.average_work + WORK_SMOOTHING * work
+
+        waited = 0.0
+        delay = self.wait_time()
+        if delay > 0:
+            with span("cooldown", kind="rate_limit") as wait_span:
+                if delay >= PAUSE_NOTICE_SECONDS:
+                    limited = ", ".join(f"{limit}/{window}" for window, limit in self.limits.items()
+                                        if self.tokens[window] < 1)
+                    print(f"⏳ Rate limit reached ({limited}). Waiting {format_duration(delay)}, "
+                          f"resuming at {time.strftime('%H:%M:%S', time.localtime(time.time() + delay))}")
+                while delay > 0:
+                    time.sleep(delay)
+                    waited += delay
+                    delay = self.wait_time()
+                wait_span.set(seconds=round(waited, 1))
+            self.waited += waited
+
+        for window in self.tokens:
+            self.tokens[window] -= 1
+        self.unsaved += 1
+        # Right after a wait the write costs nothing extra; otherwise only every SAVE_EVERY sends
+        if waited or self.unsaved >= SAVE_EVERY or time.monotonic() - self.last_save >= SAVE_SECONDS:
+            self.save()
+        self.last_acquired = time.monotonic()
+        return waited
+
+    def close(self):
+        """Writes the bucket levels of any sends not saved yet."""
+        if self.unsaved:
+            self.save()
+
+    def eta(self, remaining):
+        """Seconds until `remaining` more sends are done at the configured rates."""
+        if remaining <= 0:
+            return 0.0
+        self._refill(time.time())
+        rate_bound = max([max(0.0, remaining - tokens) * WINDOWS[window] / self.limits[window]
+                          for window, tokens in self.tokens.items()] or [0.0])
+        return max(rate_bound, remaining * (self.average_work or 0.0))
+
+    def describe_eta(self, remaining, exact=True):
+        """e.g. '42 left, ETA 15:32 (1h 05m)'; '≥' while the total isn't known yet."""
+        seconds = self.eta(remaining)
+        finish = time.strftime('%H:%M', time.localtime(time.time() + seconds))
+        if seconds >= 86400:
+            finish = time.strftime('%a %H:%M', time.localtime(time.time() + seconds))
+        bound = "" if exact else "≥"
+        return f"{bound}{remaining} left, ETA {bound}{finish} ({bound}{format_duration(seconds)})"
+
+    def print_report(self):
+        if self.waited:
+            print(f"🚦 Rate limits ({', '.join(f'{limit}/{window}' for window, limit in self.limits.items())}) "
+                  f"held sends back for {format_duration(self.waited)} in total")
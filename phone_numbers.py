@@ -0,0 +1,149 @@
+from collections import Counter
+import re
+
+# ==========================================
+# CANONICAL (E.164) PHONE NUMBERS
+# Numbers written without "+" or "00" are treated as national numbers of
+# DEFAULT_COUNTRY_CODE when they are at most NATIONAL_NUMBER_LENGTH digits long
+# (after dropping a trunk "0"); longer ones are assumed to carry a country code.
+# National numbers shorter than NATIONAL_MIN_DIGITS (IDs, extensions, ...) are invalid.
+# NumPy and pandas are imported where the vectorized path needs them, so modules
+# that only use canonical_digits / format_e164 stay light to import.
+# ==========================================
+DEFAULT_COUNTRY_CODE = "977"
+NATIONAL_NUMBER_LENGTH = 10
+NATIONAL_MIN_DIGITS = 7
+E164_MIN_DIGITS = 8
+E164_MAX_DIGITS = 15  # Always fits in an int64
+
+NON_DIGITS = re.compile(r'\D')
+
+def canonical_digits(phone_number, country_code=DEFAULT_COUNTRY_CODE):
+    """Scalar version of to_e164: the number's E.164 digits (no '+'), or None if invalid."""
+    phone_number = str(phone_number).strip()
+    digits = NON_DIGITS.sub('', phone_number)
+    if phone_number.startswith('00'):
+        digits = digits[2:]
+    elif not phone_number.startswith('+'):
+        digits = digits.lstrip('0')
+        if len(digits) <= NATIONAL_NUMBER_LENGTH:
+            if len(digits) < NATIONAL_MIN_DIGITS:
+                return None
+            digits = country_code + digits
+    if not E164_MIN_DIGITS <= len(digits) <= E164_MAX_DIGITS or digits.startswith('0'):
+        return None
+    return digits
+
+def to_e164(candidates, country_code=DEFAULT_COUNTRY_CODE):
+    """
+    Vectorized canonicalization of raw candidates ('+977 976-1445644', '9761445644', ...).
+    Returns an int64 array of E.164 numbers (without '+'), 0 where a candidate is invalid.
+    """
+    import numpy as np
+    import pandas as pd
+
+    raw = pd.Series(candidates, dtype=object).astype(str).str.strip()
+    digits = raw.str.replace(r'\D', '', regex=True)
+    international = raw.str.startswith('+')
+    double_zero = raw.str.startswith('00')
+    national = ~(international | double_zero)
+
+    digits = digits.mask(double_zero, digits.str[2:])
+    trimmed = digits.str.lstrip('0')
+    digits = digits.mask(national, trimmed)
+    national_lengths = trimmed.str.len()
+    short = national & (national_lengths <= NATIONAL_NUMBER_LENGTH)
+    too_short = national & (national_lengths < NATIONAL_MIN_DIGITS)
+    digits = digits.mask(short, country_code + trimmed)
+
+    lengths = digits.str.len()
+    valid = lengths.between(E164_MIN_DIGITS, E164_MAX_DIGITS) & ~digits.str.startswith('0') & ~too_short
+    numbers = np.zeros(len(digits), dtype=np.int64)
+    numbers[valid.to_numpy()] = digits[valid].astype(np.int64).to_numpy()
+    return numbers
+
+def format_e164(number):
+    return f"+{number}"
+
+def in_sorted(sorted_numbers, numbers):
+    """Vectorized membership test of `numbers` against a sorted int64 array."""
+    import numpy as np
+
+    if not len(sorted_numbers):
+        return np.zeros(len(numbers), dtype=bool)
+    positions = np.searchsorted(sorted_numbers, numbers).clip(max=len(sorted_numbers) - 1)
+    return sorted_numbers[positions] == numbers
+
+class CanonicalNumbers:
+    """
+    Running dedup of raw candidates by canonical number, chunk by chunk.
+    Each chunk is canonicalized, validated and deduplicated with array operations.
+    Numbers already yielded are remembered in sorted int64 arrays (8 bytes each);
+    new ones collect in a small `recent` array that is folded into `known` every
+    MERGE_EVERY numbers, so a merge is not paid on every chunk.
+    """
+
+    MERGE_EVERY = 65536
+
+    def __init__(self, country_code=DEFAULT_COUNTRY_CODE):
+        import numpy as np
+
+        self.country_code = country_code
+        self.known = np.zeros(0, dtype=np.int64)
+        self.recent = np.zeros(0, dtype=np.int64)
+        self.collapsed_counts = Counter()
+        self.raw_total = 0
+        self.invalid = 0
+
+    def __len__(self):
+        return len(self.known) + len(self.recent)
+
+    def __contains__(self, phone_number):
+        digits = canonical_digits(phone_number, self.country_code)
+        if digits is None:
+            return False
+        import numpy as np
+
+        number = np.array([int(digits)], dtype=np.int64)
+        return bool(in_sorted(self.known, number)[0] or in_sorted(self.recent, number)[0])
+
+    def add(self, candidates):
+        """Returns the numbers from `candidates` not seen before, as '+E.164' strings."""
+        if not len(candidates):
+            return []
+        import numpy as np
+        import pandas as pd
+
+        numbers = to_e164(candidates, self.country_code)
+        self.raw_total += len(numbers)
+        numbers = numbers[numbers > 0]
+        self.invalid += len(candidates) - len(numbers)
+
+        # pd.unique keeps first-seen order, np.unique would sort
+        ordered = pd.unique(numbers)
+        new = ordered[~(in_sorted(self.known, ordered) | in_sorted(self.recent, ordered))]
+
+        # Only numbers with more than one raw match are counted, to keep this small
+        unique, counts = np.unique(numbers, return_counts=True)
+        earlier = in_sorted(self.known, unique) | in_sorted(self.recent, unique)
+        repeated = (counts > 1) | earlier
+        for number, count, was_seen in zip(unique[repeated].tolist(), counts[repeated].tolist(), earlier[repeated].tolist()):
+            # A number met in an earlier chunk but not counted yet had exactly one raw match there
+            self.collapsed_counts[number] = self.collapsed_counts.get(number, 1 if was_seen else 0) + count
+
+        self.recent = np.union1d(self.recent, new)
+        if len(self.recent) >= self.MERGE_EVERY:
+            self.known = np.union1d(self.known, self.recent)
+            self.recent = np.zeros(0, dtype=np.int64)
+        return [format_e164(number) for number in new.tolist()]
+
+    def collapsed(self):
+        """{'+E.164': raw matches} for every number that more than one raw match mapped to."""
+        return {format_e164(number): count for number, count in self.collapsed_counts.items()}
+
+    def print_report(self, limit=10):
+        collapsed = self.collapsed()
+        print(f"📇 {self.raw_total} raw matches -> {len(self)} numbers "
+              f"({self.raw_total - self.invalid - len(self)} duplicates collapsed, {self.invalid} invalid)")
+        for number, count in sorted(collapsed.items(), key=lambda item: -item[1])[:limit]:
+            print(f"   {number}: {count} raw matches")
@@ -0,0 +1,167 @@
+import queue
+import threading
+
+# ==========================================
+# PIPELINE STAGES
+# The browser loop is the only stage that touches Chrome. Contact ingestion runs
+# ahead of it in a background thread (bounded, so memory stays flat) and all
+# persistence happens in a single writer thread, so the browser never waits on
+# PDF parsing, SQLite commits or fsyncs.
+# ==========================================
+FEED_QUEUE_SIZE = 500   # Contacts extracted and validated ahead of the browser
+WRITE_BATCH = 50        # Most updates the writer applies in one go when it falls behind
+
+_DONE = object()
+
+class ContactFeed:
+    """
+    Iterates `items` (any iterable, e.g. a generator doing extraction and skip
+    checks) in a background thread and hands them over through a bounded queue.
+    Iterating the feed yields the same items in the same order; an exception in
+    the producer is re-raised in the consumer once the queued items are used up.
+    remaining() tells how many items (those matching `counted`) are still to come.
+    """
+
+    def __init__(self, items, maxsize=FEED_QUEUE_SIZE, counted=None):
+        self.items = items
+        self.queue = queue.Queue(maxsize)
+        self.counted = counted or (lambda item: True)
+        # Each counter is only written by one thread
+        self.produced = 0
+        self.consumed = 0
+        self.finished = False
+        self.error = None
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="contact-feed", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def _put(self, item):
+        while not self.stopped.is_set():
+            try:
+                self.queue.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self):
+        try:
+            for item in self.items:
+                if not self._put(item):
+                    return
+                if self.counted(item):
+                    self.produced += 1
+            self.finished = True
+        except Exception as e:
+            self.error = e
+        finally:
+            self._put(_DONE)
+
+    def __iter__(self):
+        while True:
+            item = self.queue.get()
+            if item is _DONE:
+                break
+            if self.counted(item):
+                self.consumed += 1
+            yield item
+        if self.error is not None:
+            raise self.error
+
+    def remaining(self):
+        """(items not yet handed out, exact) - a lower bound while extraction is still running."""
+        return max(0, self.produced - self.consumed), self.finished
+
+    def stop(self):
+        """Stops the producer early (e.g. the browser loop crashed); queued items are dropped."""
+        self.stopped.set()
+        self.thread.join(timeout=5)
+
+def contact_skip_reason(phone, checkpoint, ledger, not_found):
+    """Why the contact needs no browser work (None if it does). Cheap enough for the feed thread."""
+    if phone in checkpoint:
+        return "Already processed"
+    if phone in ledger:
+        return "Already sent"
+    if not_found.skip(phone):
+        return "Not on WhatsApp (cached)"
+    return None
+
+class BackgroundWriter:
+    """
+    Owns the sent ledger and the checkpoint on a thread of its own. The browser loop
+    calls record(), which only enqueues; the writer applies whatever has queued up
+    (up to WRITE_BATCH) with one ledger commit, then lets the checkpoint decide when
+    to flush. Numbers whose lookup found no WhatsApp account go to the not-found
+    cache and failure details to the failure ledger, if given. close() drains the
+    queue before returning.
+    """
+
+    def __init__(self, ledger, checkpoint, batch=WRITE_BATCH, not_found=None, failures=None):
+        self.ledger = ledger
+        self.checkpoint = checkpoint
+        self.not_found = not_found
+        self.failures = failures
+        self.batch = batch
+        self.queue = queue.Queue()
+        self.batches = 0
+        self.written = 0
+        self.thread = threading.Thread(target=self._run, name="progress-writer", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def record(self, phone_number, status, error=None, index=None, lookup_seconds=None, failure=None):
+        """
+        lookup_seconds is set for numbers WhatsApp found no account for (cached as not found);
+        failure is a FailureLedger entry (failure details, or the resolution of an earlier failure).
+        """
+        self.queue.put((phone_number, status, error, index, lookup_seconds, failure))
+
+    def wait_idle(self):
+        """Blocks until everything recorded so far has been written."""
+        self.queue.join()
+
+    def _run(self):
+        while True:
+            updates = [self.queue.get()]
+            while len(updates) < self.batch:
+                try:
+                    updates.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            done = _DONE in updates
+            fetched = len(updates)
+            updates = [update for update in updates if update is not _DONE]
+            if updates:
+                self._write(updates)
+            for _ in range(fetched):
+                self.queue.task_done()
+            if done:
+                return
+
+    def _write(self, updates):
+        try:
+            self.ledger.add_many([phone for phone, status, _, _, _, _ in updates if status == 'sent'])
+            if self.not_found is not None:
+                self.not_found.add_many([(phone, lookup_seconds) for phone, _, _, _, lookup_seconds, _ in updates
+                                         if lookup_seconds is not None])
+            if self.failures is not None:
+                self.failures.record_many([failure for *_, failure in updates if failure is not None])
+            for phone, status, error, index, _, _ in updates:
+                self.checkpoint.record(phone, status, error, index=index)
+            self.batches += 1
+            self.written += len(updates)
+        except Exception as e:
+            print(f"⚠️ Progress write failed: {e}")
+
+    def close(self):
+        """Writes everything still queued and stops the thread."""
+        self.queue.put(_DONE)
+        self.thread.join()
+        if self.batches:
+            print(f"💾 {self.written} progress updates written in {self.batches} batches (background writer)")
@@ -0,0 +1,242 @@
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.common.action_chains import ActionChains
+from selenium.common.exceptions import WebDriverException
+from session import start_session, end_session, DEBUGGER_ADDRESS
+from memory_watchdog import MemoryWatchdog
+from tracing import span
+from ui_waits import (
+    wait_for_chat_closed, wait_for_empty, wait_for_text, wait_for_search_outcome,
+    wait_for_message_box, wait_for_outgoing, pane_signature, count_outgoing,
+    wait_for_member_outcome, wait_for_member_input_cleared, wait_for_chat_opened
+)
+from media_sender import send_images
+from text_input import insert_text, print_stats as print_typing_stats
+from locators import present, clickable, find_all, new_view, print_stats as print_lookup_stats
+import time
+
+WAIT_TIMEOUT = 300
+CLOSE_GRACE_SECONDS = 5  # Lets the last uploads finish before the browser is closed
+
+def clear_search_box_robust(driver):
+    """
+    FIX: Clears search box AND presses Escape to close previous chat.
+    This prevents sending messages to the wrong person.
+    """
+    # Elements cached for the previous chat must not be reused in the next one
+    new_view()
+    try:
+        # Press Escape multiple times to close any open chat or search
+        # This ensures we don't accidentally type in the previous person's chat
+        actions = ActionChains(driver)
+        actions.send_keys(Keys.ESCAPE).perform()
+        wait_for_chat_closed(driver)
+        actions.send_keys(Keys.ESCAPE).perform()
+    except:
+        pass
+
+def send_text_message(driver, msg_box, message):
+    """Types a (multi-line) message into the open chat and waits for its bubble."""
+    with span("message_type", chars=len(message)) as type_span:
+        # Whole message in one scripted paste; keystroke typing is only the fallback
+        type_span.set(method=insert_text(driver, msg_box, message))
+        wait_for_text(driver, msg_box)
+    with span("message_send"):
+        sent_before = count_outgoing(driver)
+        msg_box.send_keys(Keys.ENTER)
+        wait_for_outgoing(driver, sent_before)
+
+def search_and_open_group(driver, wait, group_name):
+    """Fallback when the new group didn't open by itself: searches its (unique) name and opens it."""
+    print(f"🔍 Searching for group: {group_name}")
+    try:
+        new_view()
+        search_box = wait.until(present('search_box'))
+        search_box.click()
+        search_box.send_keys(Keys.CONTROL + "a")
+        search_box.send_keys(Keys.BACKSPACE)
+        wait_for_empty(driver, search_box)
+        previous_results = pane_signature(driver)
+        search_box.send_keys(group_name)
+        if wait_for_search_outcome(driver, previous_results) == 'no_results':
+            print("❌ Group not found")
+            return False
+
+        # Enter opens the first result; the name is unique, so that is our group
+        new_view()
+        search_box.send_keys(Keys.ENTER)
+        return bool(wait_for_chat_opened(driver, group_name))
+    except Exception as e:
+        print(f"❌ Search failed: {e}")
+        return False
+
+def add_member(driver, input_box, phone, not_found=None):
+    """
+    Types one number into the member search and selects it. Returns True if it was added.
+    Numbers WhatsApp has no account for are remembered in `not_found` (a NotFoundCache).
+    """
+    with span("member_add") as member_span:
+        started = time.monotonic()
+        input_box.send_keys(phone)
+        outcome = wait_for_member_outcome(driver)
+        member_span.set(outcome=outcome)
+        if outcome == 'result':
+            input_box.send_keys(Keys.ENTER)
+        else:
+            input_box.send_keys(Keys.CONTROL + "a", Keys.DELETE)
+            if outcome == 'no_results' and not_found is not None:
+                not_found.add(phone, time.monotonic() - started)
+        # Next number only once the chip is in and the old results are gone
+        wait_for_member_input_cleared(driver, input_box)
+        return outcome == 'result'
+
+def create_single_group(driver, wait, batch_contacts, group_name, not_found=None):
+    """
+    Creates the group and returns the numbers actually added (False if none were).
+    WhatsApp then opens the new group by itself (see open_new_group). Numbers in
+    the not-found cache are left out without searching for them.
+    """
+    print(f"\n🔨 Creating Group: {group_name}...")
+    if not_found is not None:
+        cached = [phone for phone in batch_contacts if not_found.skip(phone)]
+        if cached:
+            print(f"    ⏭️  {len(cached)} numbers skipped (not on WhatsApp, cached)")
+            batch_contacts = [phone for phone in batch_contacts if phone not in cached]
+        if not batch_contacts:
+            return False
+    new_view()
+    try:
+        with span("group_dialog_open"):
+            wait.until(clickable('new_chat_button')).click()
+            wait.until(clickable('new_group_option')).click()
+            input_box = wait.until(present('member_input'))
+        
+        added = [phone for phone in batch_contacts if add_member(driver, input_box, phone, not_found)]
+        if not added: return False
+        
+        with span("group_finalize", members=len(added)):
+            wait.until(clickable('members_next')).click()
+            subject_box = wait.until(present('group_subject'))
+            subject_box.send_keys(group_name)
+            wait_for_text(driver, subject_box)
+            wait.until(clickable('group_permissions')).click()
+            wait.until(clickable('group_permission_toggle')).click()
+            wait.until(clickable('group_permissions_back')).click()
+            new_view()
+            wait.until(clickable('group_create')).click()
+        return added
+    except WebDriverException as e:
+        print(f"    ❌ Group not created: {type(e).__name__}: {e.msg or e}")
+        return False
+
+def open_new_group(driver, wait, group_name):
+    """Waits for WhatsApp to open the group it just created; searches for it only if it doesn't."""
+    with span("group_open") as open_span:
+        if wait_for_chat_opened(driver, group_name):
+            open_span.set(via="direct")
+            return True
+        open_span.set(via="search")
+        return search_and_open_group(driver, wait, group_name)
+
+class SeleniumTransport:
+    """
+    WhatsApp Web in Chrome, behind the interface described in transport.py.
+    Pass a driver to work in a browser you already have; otherwise start() launches
+    Chrome or attaches to debugger_address and waits for the login. check() runs
+    the memory watchdog.
+    """
+
+    def __init__(self, driver=None, debugger_address=None, timeout=WAIT_TIMEOUT):
+        self.driver = driver
+        self.debugger_address = debugger_address or DEBUGGER_ADDRESS
+        self.timeout = timeout
+        self.wait = WebDriverWait(driver, timeout) if driver is not None else None
+        self.owns_driver = driver is None
+        self.message_box = None
+        self.watchdog = None
+
+    def start(self):
+        if self.driver is None:
+            self.driver = start_session(self.debugger_address)
+            self.wait = WebDriverWait(self.driver, self.timeout)
+        # Reloads the page only when the tab's heap or DOM has grown past its limits
+        self.watchdog = MemoryWatchdog(self.driver)
+        return self
+
+    def open_chat(self, phone_number):
+        """Searches the number and opens its chat: 'opened', 'not_found' or 'not_opened'."""
+        driver = self.driver
+        self.message_box = None
+        with span("search") as search_span:
+            # 1. Clear everything first (Close previous chat)
+            clear_search_box_robust(driver)
+
+            # 2. Find Search Box
+            search_box = self.wait.until(present('search_box'))
+            search_box.click()
+
+            # 3. Clear and Type Number
+            search_box.send_keys(Keys.CONTROL + "a")
+            search_box.send_keys(Keys.DELETE)
+            wait_for_empty(driver, search_box)
+            previous_results = pane_signature(driver)
+            search_box.send_keys(phone_number)
+
+            # 4. CRITICAL FIX: Wait for the results to render, or for "No results found"
+            outcome = wait_for_search_outcome(driver, previous_results)
+            search_span.set(outcome=outcome)
+        try:
+            # On timeout fall back to checking for "No results found" directly
+            if outcome == 'no_results' or (outcome is None and find_all(driver, 'no_results')):
+                # Clean up: clear search and escape
+                search_box.send_keys(Keys.CONTROL + "a")
+                search_box.send_keys(Keys.DELETE)
+                ActionChains(driver).send_keys(Keys.ESCAPE).perform()
+                return 'not_found'
+        except:
+            pass
+
+        with span("chat_open"):
+            # 5. Press Enter to open chat
+            search_box.send_keys(Keys.ENTER)
+
+            # 6. Verify Chat is Open (Message box exists)
+            # If we are still on the "WhatsApp Web" home screen, the message box won't appear
+            self.message_box = wait_for_message_box(driver)
+        return 'opened' if self.message_box is not None else 'not_opened'
+
+    def send_text(self, text):
+        """Sends a message into the open chat; raises if it doesn't go out."""
+        message_box = self.message_box or wait_for_message_box(self.driver)
+        if message_box is None:
+            raise RuntimeError("Message box not found")
+        send_text_message(self.driver, message_box, text)
+
+    def send_media(self, image_paths, caption=None, batched=True):
+        return send_images(self.driver, self.wait, image_paths, caption=caption, batched=batched)
+
+    def create_group(self, group_name, members, not_found=None):
+        self.message_box = None
+        return create_single_group(self.driver, self.wait, members, group_name, not_found) or []
+
+    def open_group(self, group_name, created=False):
+        """Opens a group: one just created opens by itself, an earlier one is searched for."""
+        self.message_box = None
+        if created:
+            return open_new_group(self.driver, self.wait, group_name)
+        return search_and_open_group(self.driver, self.wait, group_name)
+
+    def check(self):
+        if self.watchdog is not None:
+            self.watchdog.check()
+
+    def print_report(self):
+        print_typing_stats()
+        print_lookup_stats()
+        if self.watchdog is not None:
+            self.watchdog.print_report()
+
+    def close(self):
+        if self.driver is not None and self.owns_driver:
+            time.sleep(CLOSE_GRACE_SECONDS)
+            end_session(self.driver)
@@ -0,0 +1,85 @@
+from contact_extractor import normalize_phone
+from phone_numbers import DEFAULT_COUNTRY_CODE
+import sqlite3
+import json
+import os
+import time
+
+SENT_LEDGER_FILE = "sent_contacts.sqlite"
+LEGACY_SENT_CONTACTS_FILE = "sent_contacts.json"
+SYNC_EVERY = 50  # Appends between fsyncs (WAL checkpoints)
+
+class SentLedger:
+    """
+    Append-only record of contacts that were messaged successfully, keyed by
+    normalized (E.164) number. The whole ledger is loaded into a set once, so
+    lookups and appends are O(1).
+    Each append is committed to a SQLite WAL (safe against the script crashing);
+    the WAL is checkpointed and fsynced every `sync_every` appends.
+    National numbers (old rows, sent_contacts.json) get `country_code`.
+    """
+
+    def __init__(self, path=SENT_LEDGER_FILE, legacy_file=LEGACY_SENT_CONTACTS_FILE, sync_every=SYNC_EVERY,
+                 country_code=DEFAULT_COUNTRY_CODE):
+        # Written from the pipeline's background writer thread, closed from the main thread
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS sent (phone TEXT PRIMARY KEY, sent_at REAL NOT NULL)")
+        self.sync_every = sync_every
+        self.country_code = country_code
+        self.pending = 0
+        # Rows written before E.164 normalization are normalized as they are loaded
+        self.sent = {self.normalize(row[0]) for row in self.conn.execute("SELECT phone FROM sent")}
+        if not self.sent and legacy_file and os.path.exists(legacy_file):
+            self.import_json(legacy_file)
+
+    def import_json(self, json_file):
+        """Imports an old sent_contacts.json list (the file itself is left untouched)."""
+        try:
+            with open(json_file, 'r') as f:
+                phones = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Could not import {json_file}: {e}")
+            return 0
+        now = time.time()
+        new_phones = [p for p in dict.fromkeys(map(self.normalize, phones)) if p not in self.sent]
+        self.conn.executemany("INSERT OR IGNORE INTO sent (phone, sent_at) VALUES (?, ?)", [(p, now) for p in new_phones])
+        self.conn.commit()
+        self.sent.update(new_phones)
+        print(f"📥 Imported {len(new_phones)} sent contacts from {json_file}")
+        return len(new_phones)
+
+    def normalize(self, phone_number):
+        return normalize_phone(phone_number, self.country_code)
+
+    def __contains__(self, phone_number):
+        return self.normalize(phone_number) in self.sent
+
+    def __len__(self):
+        return len(self.sent)
+
+    def add(self, phone_number):
+        self.add_many([phone_number])
+
+    def add_many(self, phone_numbers):
+        """Appends several contacts with a single commit."""
+        new_phones = [p for p in dict.fromkeys(map(self.normalize, phone_numbers)) if p not in self.sent]
+        if not new_phones:
+            return
+        now = time.time()
+        self.conn.executemany("INSERT OR IGNORE INTO sent (phone, sent_at) VALUES (?, ?)", [(p, now) for p in new_phones])
+        self.conn.commit()
+        self.sent.update(new_phones)
+        self.pending += len(new_phones)
+        if self.pending >= self.sync_every:
+            self.sync()
+
+    def sync(self):
+        """Checkpoints the WAL into the database file, which fsyncs it."""
+        self.conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        self.pending = 0
+
+    def close(self):
+        self.sync()
+        self.conn.close()
@@ -0,0 +1,130 @@
+from selenium import webdriver
+from tracing import span
+from locators import clickable, find_all, clear_cache
+from ui_waits import wait_for
+import os
+import time
+
+# ==========================================
+# WHATSAPP WEB SESSION
+# Cold start: launch Chrome on the saved whatsapp_session profile and open WhatsApp.
+# Warm start: set DEBUGGER_ADDRESS (or pass debugger_address=) to attach to a Chrome
+# you started yourself, e.g.
+#     chrome --remote-debugging-port=9222 --user-data-dir=whatsapp_session
+# The already-open, logged-in tab is reused and nothing is reloaded.
+# ==========================================
+WHATSAPP_URL = "https://web.whatsapp.com"
+SESSION_DIR = "whatsapp_session"
+DEBUGGER_ADDRESS = None      # e.g. "127.0.0.1:9222"
+LOGIN_TIMEOUT = 300          # Time allowed for scanning the QR code
+READY_TIMEOUT = 300          # Time allowed for the chat list or QR code to appear (big accounts sync slowly)
+
+def chrome_options(debugger_address=None, user_data_dir=SESSION_DIR):
+    options = webdriver.ChromeOptions()
+    if debugger_address:
+        # Attaching: the running browser already has its profile and flags
+        options.debugger_address = debugger_address
+        return options
+
+    user_data_dir = os.path.abspath(user_data_dir)
+    if not os.path.exists(user_data_dir):
+        os.makedirs(user_data_dir)
+    options.add_argument(f"--user-data-dir={user_data_dir}")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--start-maximized")
+    options.add_argument("--disable-notifications")
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option('useAutomationExtension', False)
+    return options
+
+def find_whatsapp_tab(driver, url=WHATSAPP_URL):
+    """Switches to an already-open WhatsApp tab of an attached browser. Returns True if there was one."""
+    for handle in driver.window_handles:
+        driver.switch_to.window(handle)
+        if driver.current_url.startswith(url):
+            return True
+    return False
+
+def login_state(driver):
+    """'ready' once the chat list's search box is there, 'qr' while the QR code is shown, else False."""
+    if clickable('search_box')(driver):
+        return 'ready'
+    if find_all(driver, 'qr_code'):
+        return 'qr'
+    return False
+
+def wait_until_logged_in(driver, login_timeout=LOGIN_TIMEOUT, ready_timeout=READY_TIMEOUT):
+    """
+    Returns as soon as the chat list is usable. Only asks for a QR scan (and only
+    then allows login_timeout) if WhatsApp actually shows the QR code.
+    Returns 'ready' (already logged in), 'scanned' or None on timeout.
+    """
+    state = wait_for(driver, login_state, ready_timeout)
+    if state == 'ready':
+        return 'ready'
+    if state == 'qr':
+        print("📱 Please Scan QR Code...")
+        if wait_for(driver, clickable('search_box'), login_timeout):
+            return 'scanned'
+    return None
+
+def start_session(debugger_address=DEBUGGER_ADDRESS, url=WHATSAPP_URL, login_timeout=LOGIN_TIMEOUT):
+    """
+    Returns a driver with WhatsApp Web loaded and logged in, attaching to a running
+    Chrome when debugger_address is set and launching one otherwise. Prints how long
+    each startup phase took (also recorded as tracing spans).
+    """
+    mode = 'attach' if debugger_address else 'launch'
+    timings = {}
+    started = time.perf_counter()
+
+    with span("driver_start", mode=mode):
+        print(f"🔧 {'Attaching to Chrome at ' + debugger_address if debugger_address else 'Launching Chrome'}...")
+        driver = webdriver.Chrome(options=chrome_options(debugger_address))
+        driver.whatsapp_attached = bool(debugger_address)
+        timings[mode] = time.perf_counter() - started
+
+    phase_started = time.perf_counter()
+    with span("page_load") as load_span:
+        reused = bool(debugger_address) and find_whatsapp_tab(driver, url)
+        if not reused:
+            driver.get(url)
+        load_span.set(reused=reused)
+        timings['page_load'] = time.perf_counter() - phase_started
+
+    phase_started = time.perf_counter()
+    with span("login_wait") as login_span:
+        clear_cache()
+        state = wait_until_logged_in(driver, login_timeout)
+        login_span.set(state=state)
+        timings['login'] = time.perf_counter() - phase_started
+
+    total = time.perf_counter() - started
+    phases = ", ".join(f"{name} {seconds:.1f}s" for name, seconds in timings.items())
+    start_kind = "warm" if reused else "cold"
+    if state is None:
+        print(f"❌ WhatsApp did not finish loading ({phases})")
+        end_session(driver)
+        raise TimeoutError("WhatsApp Web login timed out")
+    print(f"✅ WhatsApp Loaded! ({start_kind} start, {'already logged in' if state == 'ready' else 'QR scanned'}: "
+          f"{phases}, total {total:.1f}s)")
+    return driver
+
+def reload_whatsapp(driver, ready_timeout=READY_TIMEOUT):
+    """Reloads the page and returns once the chat list is usable again (no fixed sleep)."""
+    with span("page_refresh"):
+        started = time.perf_counter()
+        driver.refresh()
+        clear_cache()
+        state = wait_until_logged_in(driver, ready_timeout=ready_timeout)
+    print(f"🔄 Page reloaded in {time.perf_counter() - started:.1f}s")
+    return state is not None
+
+def end_session(driver):
+    """Quits a browser we launched; leaves an attached browser (and its session) running."""
+    if getattr(driver, 'whatsapp_attached', False):
+        driver.service.stop()
+    else:
+        driver.quit()
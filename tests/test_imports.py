@@ -0,0 +1,11 @@
+import pytest
+
+from benchmarks.bench_imports import CASES, measure
+
+LIGHT_CASES = [(label, statement) for label, statement, light in CASES if light]
+
+@pytest.mark.parametrize("label, statement", LIGHT_CASES, ids=[label for label, _ in LIGHT_CASES])
+def test_entry_point_loads_no_heavy_package(label, statement):
+    seconds, total, heavy, error = measure(statement)
+    assert error is None, f"{label}: {error}"
+    assert heavy == [], f"{label} loads {', '.join(heavy)}"
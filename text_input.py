@@ -0,0 +1,94 @@
+from selenium.webdriver.common.keys import Keys
+import time
+
+# Paste the whole text as one ClipboardEvent; WhatsApp's editor handles it like a real
+# paste, keeping line breaks and emoji. Returns false if nothing handled the event.
+PASTE_SCRIPT = """
+const box = arguments[0], text = arguments[1];
+box.focus();
+const data = new DataTransfer();
+data.setData('text/plain', text);
+const event = new ClipboardEvent('paste', {clipboardData: data, bubbles: true, cancelable: true});
+box.dispatchEvent(event);
+return event.defaultPrevented;
+"""
+
+# Fallback for editors that ignore synthetic paste events: native editing commands
+INSERT_SCRIPT = """
+const box = arguments[0], lines = arguments[1].split('\\n');
+box.focus();
+lines.forEach((line, i) => {
+  if (line) document.execCommand('insertText', false, line);
+  if (i < lines.length - 1) document.execCommand('insertLineBreak');
+});
+"""
+
+COMPOSER_TEXT_SCRIPT = "return arguments[0].innerText;"
+
+# Rough cost of one WebDriver keystroke, used to report the time saved
+KEYSTROKE_SECONDS = 0.012
+
+stats = {'messages': 0, 'chars': 0, 'seconds': 0.0, 'fallbacks': 0}
+
+def normalized(text):
+    """
+    Form used to compare what we typed with what the composer shows. Line breaks
+    must survive, so only line endings, non-breaking spaces, trailing spaces on a
+    line and trailing blank lines (contenteditable adds one) are evened out.
+    """
+    text = (text or "").replace('\r\n', '\n').replace('\r', '\n').replace('\xa0', ' ')
+    return '\n'.join(line.rstrip() for line in text.split('\n')).rstrip('\n')
+
+def composer_text(driver, box):
+    return driver.execute_script(COMPOSER_TEXT_SCRIPT, box)
+
+def clear_box(box):
+    box.send_keys(Keys.CONTROL + "a")
+    box.send_keys(Keys.DELETE)
+
+def type_keystrokes(box, text):
+    """The original path: one WebDriver key event per character, Shift+Enter between lines."""
+    lines = text.split('\n')
+    for i, line in enumerate(lines):
+        box.send_keys(line)
+        if i < len(lines) - 1:
+            box.send_keys(Keys.SHIFT + Keys.ENTER)
+
+def insert_text(driver, box, text):
+    """
+    Puts `text` into a contenteditable box in one operation and checks the composer
+    shows it before returning. Tries a scripted paste, then execCommand insertion,
+    then falls back to keystroke typing. Returns the method that worked.
+    """
+    started = time.perf_counter()
+    box.click()
+    method = 'keys'
+    for name, script in (('paste', PASTE_SCRIPT), ('insert', INSERT_SCRIPT)):
+        try:
+            driver.execute_script(script, box, text)
+        except Exception:
+            continue
+        shown = composer_text(driver, box)
+        if normalized(shown) == normalized(text):
+            method = name
+            break
+        if shown and shown.strip():
+            clear_box(box)
+    if method == 'keys':
+        stats['fallbacks'] += 1
+        type_keystrokes(box, text)
+    stats['messages'] += 1
+    stats['chars'] += len(text)
+    stats['seconds'] += time.perf_counter() - started
+    return method
+
+def estimated_seconds_saved():
+    """Keystroke-typing estimate for everything inserted so far, minus the time it actually took."""
+    return stats['chars'] * KEYSTROKE_SECONDS - stats['seconds']
+
+def print_stats():
+    if not stats['messages']:
+        return
+    print(f"⌨️ Inserted {stats['messages']} messages ({stats['chars']} chars) in {stats['seconds']:.1f}s, "
+          f"~{max(0, estimated_seconds_saved()):.0f}s saved vs keystroke typing "
+          f"({stats['fallbacks']} keystroke fallbacks)")
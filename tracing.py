@@ -0,0 +1,118 @@
+from collections import defaultdict
+import json
+import math
+import time
+
+TRACE_FILE = "whatsapp_trace.jsonl"
+
+_trace_file = None
+_durations = defaultdict(list)
+_run_started = None
+_contacts_done = 0
+
+class _NullSpan:
+    """Returned while tracing is disabled; entering and leaving it costs next to nothing."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+class _Span:
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def set(self, **attrs):
+        """Attaches extra attributes (e.g. outcome) to the span before it ends."""
+        self.attrs.update(attrs)
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self.started
+        _durations[self.name].append(duration)
+        if _trace_file is not None:
+            record = {'span': self.name, 'start': round(time.time() - duration, 3), 'duration': round(duration, 4)}
+            if exc_type is not None:
+                record['error'] = exc_type.__name__
+            record.update(self.attrs)
+            _trace_file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        return False
+
+def span(name, **attrs):
+    """Context manager timing one named step: `with span("search", phone=phone): ...`"""
+    if _run_started is None:
+        return _NULL_SPAN
+    return _Span(name, attrs)
+
+def enable_tracing(path=TRACE_FILE):
+    """Starts a traced run; spans are appended to `path` as JSON lines."""
+    global _trace_file, _run_started, _contacts_done
+    _trace_file = open(path, 'a', buffering=1) if path else None
+    _durations.clear()
+    _run_started = time.monotonic()
+    _contacts_done = 0
+    print(f"⏱️ Tracing enabled ({path})")
+
+def is_enabled():
+    return _run_started is not None
+
+def contact_done(count=1):
+    """Counts finished contacts (a group counts its members) for the throughput figure."""
+    global _contacts_done
+    _contacts_done += count
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    rank = math.ceil(pct / 100 * len(sorted_values))
+    return sorted_values[max(0, rank - 1)]
+
+def summary():
+    steps = {}
+    for name, durations in _durations.items():
+        ordered = sorted(durations)
+        steps[name] = {
+            'count': len(ordered),
+            'p50': percentile(ordered, 50),
+            'p95': percentile(ordered, 95),
+            'p99': percentile(ordered, 99),
+            'total': sum(ordered)
+        }
+    elapsed = time.monotonic() - _run_started if _run_started is not None else 0
+    per_hour = _contacts_done / elapsed * 3600 if elapsed > 0 else 0
+    return {'steps': steps, 'contacts': _contacts_done, 'elapsed': elapsed, 'contacts_per_hour': per_hour}
+
+def print_summary():
+    if _run_started is None:
+        return
+    data = summary()
+    print("\n" + "="*50)
+    print("⏱️ RUN PROFILE")
+    print(f"   {'step':<20} {'count':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'total':>9}")
+    for name, step in sorted(data['steps'].items(), key=lambda item: -item[1]['total']):
+        print(f"   {name:<20} {step['count']:>6} {step['p50']:>7.2f}s {step['p95']:>7.2f}s "
+              f"{step['p99']:>7.2f}s {step['total']:>8.1f}s")
+    print(f"   Throughput: {data['contacts_per_hour']:.0f} contacts/hour "
+          f"({data['contacts']} in {data['elapsed']:.0f}s)")
+    print("="*50 + "\n")
+
+def disable_tracing():
+    """Prints the end-of-run summary, writes it to the trace file and stops tracing."""
+    global _trace_file, _run_started
+    if _run_started is None:
+        return
+    print_summary()
+    if _trace_file is not None:
+        _trace_file.write(json.dumps({'summary': summary()}) + '\n')
+        _trace_file.close()
+    _trace_file = None
+    _run_started = None
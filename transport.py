@@ -0,0 +1,149 @@
+import math
+import os
+import random
+import time
+import zlib
+
+# ==========================================
+# TRANSPORTS
+# Everything main.py and group_creation.py need from WhatsApp goes through a
+# transport object with these methods:
+#     start() -> self                     connect / log in
+#     open_chat(phone) -> 'opened' | 'not_found' | 'not_opened'   (raises on errors)
+#     send_text(text)                     into the open chat (raises on failure)
+#     send_media(paths, caption=None, batched=True) -> {'images_sent', 'caption_sent', 'errors', 'unverified'}
+#     create_group(name, members, not_found=None) -> members added ([] if none)
+#     open_group(name, created=False) -> bool
+#     check(), print_report(), close()
+# selenium_transport.SeleniumTransport drives WhatsApp Web in Chrome (the
+# default). SimulatedTransport below answers in-process, with configurable
+# latency and failure rates, so extraction, dedup, ledgers, checkpoints and
+# pacing can be load-tested at any list size without a browser.
+# ==========================================
+
+# Mean seconds per call, roughly what WhatsApp Web takes on a good connection
+SIMULATED_LATENCY = {
+    'open_chat': 1.5, 'send_text': 0.6, 'send_media': 2.0,
+    'create_group': 3.0, 'add_member': 0.8, 'open_group': 0.5
+}
+LATENCY_SPREAD = 0.5  # Sigma of the log-normal latency distribution (0: every call takes the mean)
+# Probability per call (per image for image_failed)
+SIMULATED_FAILURE_RATES = {
+    'search_error': 0.005, 'chat_not_opened': 0.005, 'message_failed': 0.002,
+    'image_failed': 0.01, 'group_failed': 0.01, 'group_not_opened': 0.005
+}
+NOT_FOUND_RATE = 0.05  # Share of numbers with no WhatsApp account
+
+class SimulatedTransportError(Exception):
+    pass
+
+class SimulatedTransport:
+    """
+    In-process stand-in for WhatsApp Web. Every call waits a log-normally
+    distributed latency (times latency_scale; 0 skips the waits entirely) and
+    fails with the configured probability. Whether a number has an account is
+    derived from the number itself, so retries and reruns get the same answer.
+    Only groups create_group succeeded for can be opened; pass the same `groups`
+    set to a later transport to simulate a rerun against the same account.
+    """
+
+    def __init__(self, latency=None, latency_scale=1.0, spread=LATENCY_SPREAD, failure_rates=None,
+                 not_found_rate=NOT_FOUND_RATE, seed=0, groups=None):
+        self.latency = {op: mean * latency_scale for op, mean in (latency or SIMULATED_LATENCY).items()}
+        self.spread = spread
+        self.failure_rates = SIMULATED_FAILURE_RATES if failure_rates is None else failure_rates
+        self.not_found_rate = not_found_rate
+        self.random = random.Random(seed)
+        self.calls = dict.fromkeys(SIMULATED_LATENCY, 0)
+        self.failures = {}
+        self.not_found = 0
+        self.simulated_seconds = 0.0
+        self.groups = set() if groups is None else groups
+
+    def _call(self, op):
+        self.calls[op] = self.calls.get(op, 0) + 1
+        mean = self.latency.get(op, 0.0)
+        if mean <= 0:
+            return
+        # mu chosen so the distribution's mean is `mean`
+        seconds = self.random.lognormvariate(math.log(mean) - self.spread ** 2 / 2, self.spread) \
+            if self.spread else mean
+        self.simulated_seconds += seconds
+        time.sleep(seconds)
+
+    def _fails(self, code):
+        rate = self.failure_rates.get(code)
+        if rate and self.random.random() < rate:
+            self.failures[code] = self.failures.get(code, 0) + 1
+            return True
+        return False
+
+    def on_whatsapp(self, phone_number):
+        digits = phone_number.lstrip('+').encode()
+        return zlib.crc32(digits) % 1000000 >= self.not_found_rate * 1000000
+
+    def start(self):
+        return self
+
+    def open_chat(self, phone_number):
+        self._call('open_chat')
+        if self._fails('search_error'):
+            raise SimulatedTransportError("Simulated search timeout")
+        if not self.on_whatsapp(phone_number):
+            self.not_found += 1
+            return 'not_found'
+        return 'not_opened' if self._fails('chat_not_opened') else 'opened'
+
+    def send_text(self, text):
+        self._call('send_text')
+        if self._fails('message_failed'):
+            raise SimulatedTransportError("Simulated message timeout")
+
+    def send_media(self, image_paths, caption=None, batched=True):
+        # One upload for an album, one per image otherwise
+        for _ in range(1 if batched else len(image_paths)):
+            self._call('send_media')
+        errors = []
+        for path in image_paths:
+            if self._fails('image_failed'):
+                errors.append({'image': os.path.basename(path), 'error': "Simulated upload failure"})
+        return {'images_sent': len(image_paths) - len(errors),
+                'caption_sent': bool(caption) and not errors, 'errors': errors, 'unverified': 0}
+
+    def create_group(self, group_name, members, not_found=None):
+        self._call('create_group')
+        if self._fails('group_failed'):
+            return []
+        added = []
+        for phone in members:
+            if not_found is not None and not_found.skip(phone):
+                continue
+            self._call('add_member')
+            if self.on_whatsapp(phone):
+                added.append(phone)
+            else:
+                self.not_found += 1
+                if not_found is not None:
+                    not_found.add(phone, self.latency.get('add_member', 0.0))
+        if added:
+            self.groups.add(group_name)
+        return added
+
+    def open_group(self, group_name, created=False):
+        self._call('open_group')
+        if group_name not in self.groups:
+            return False
+        return not self._fails('group_not_opened')
+
+    def check(self):
+        pass
+
+    def print_report(self):
+        injected = ", ".join(f"{code} {count}" for code, count in self.failures.items()) or "none"
+        print(f"🧪 Simulated transport: {self.calls['open_chat']} chats, {self.calls['send_text']} texts, "
+              f"{self.calls['send_media']} uploads, {self.calls['create_group']} groups; "
+              f"{self.not_found} not on WhatsApp; injected failures: {injected}; "
+              f"{self.simulated_seconds:.0f}s of simulated browser time")
+
+    def close(self):
+        pass
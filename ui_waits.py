@@ -0,0 +1,118 @@
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
+from locators import find_all, clickable, present
+import time
+
+# ==========================================
+# PER-STEP TIMEOUTS (seconds)
+# Every wait returns as soon as the UI reaches the expected state; the timeout is
+# only the upper bound. The fallback taken on timeout is noted next to each one.
+# ==========================================
+CHAT_CLOSE_TIMEOUT = 1.5      # Fallback: carry on, the search box is cleared before typing anyway
+SEARCH_CLEAR_TIMEOUT = 2      # Fallback: type the number anyway
+SEARCH_RESULTS_TIMEOUT = 5    # Fallback: old behaviour, check "No results found" once and press Enter
+SEARCH_SETTLE = 0.4           # Results must stop changing for this long before we press Enter
+CHAT_OPEN_TIMEOUT = 10        # Fallback: report "Chat failed to open"
+MESSAGE_TYPED_TIMEOUT = 2     # Fallback: press Enter anyway
+MESSAGE_SENT_TIMEOUT = 10     # Fallback: assume sent (Enter was pressed), as before
+UPLOAD_PREVIEW_TIMEOUT = 30   # Fallback: the image is counted as failed
+MEDIA_SENT_TIMEOUT = 30       # Fallback: move on to the next image
+MEMBER_RESULT_TIMEOUT = 5     # Fallback: the member is skipped as not found
+MEMBER_CLEAR_TIMEOUT = 2      # Fallback: type the next member anyway
+GROUP_OPEN_TIMEOUT = 30       # Fallback: search for the new group by its name
+POLL_INTERVAL = 0.1
+
+def wait_for(driver, condition, timeout):
+    """Polls `condition(driver)` until it is truthy. Returns its value, or None on timeout."""
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=POLL_INTERVAL,
+                             ignored_exceptions=[StaleElementReferenceException]).until(condition)
+    except TimeoutException:
+        return None
+
+def pane_signature(driver):
+    """Text of the chat list pane; changes whenever search results are re-rendered."""
+    return driver.execute_script("var p = document.getElementById('pane-side'); return p ? p.textContent : null;")
+
+def count_outgoing(driver):
+    return len(find_all(driver, 'outgoing_bubbles'))
+
+def wait_for_chat_closed(driver, timeout=CHAT_CLOSE_TIMEOUT):
+    return wait_for(driver, lambda d: not find_all(d, 'message_box'), timeout)
+
+def wait_for_empty(driver, element, timeout=SEARCH_CLEAR_TIMEOUT):
+    return wait_for(driver, lambda d: element.text.strip() == "", timeout)
+
+def wait_for_text(driver, element, timeout=MESSAGE_TYPED_TIMEOUT):
+    return wait_for(driver, lambda d: element.text.strip() != "", timeout)
+
+def wait_for_search_outcome(driver, previous_signature, timeout=SEARCH_RESULTS_TIMEOUT):
+    """
+    Returns 'no_results' as soon as WhatsApp says so, or 'results' once the chat list
+    has been re-rendered and then stayed unchanged for SEARCH_SETTLE seconds (so Enter
+    opens the new first result, not the previous chat). None on timeout.
+    """
+    state = {'signature': previous_signature, 'since': time.monotonic(), 'changed': False}
+
+    def outcome(d):
+        if find_all(d, 'no_results'):
+            return 'no_results'
+        signature = pane_signature(d)
+        now = time.monotonic()
+        if signature != state['signature']:
+            state.update(signature=signature, since=now, changed=True)
+            return False
+        if state['changed'] and signature and now - state['since'] >= SEARCH_SETTLE:
+            return 'results'
+        return False
+
+    return wait_for(driver, outcome, timeout)
+
+def member_outcome(driver):
+    """'no_results' or 'result' once the group dialog's member search has rendered, else False."""
+    if find_all(driver, 'no_results'):
+        return 'no_results'
+    if find_all(driver, 'member_results'):
+        return 'result'
+    return False
+
+def wait_for_member_outcome(driver, timeout=MEMBER_RESULT_TIMEOUT):
+    return wait_for(driver, member_outcome, timeout)
+
+def wait_for_member_input_cleared(driver, input_box, timeout=MEMBER_CLEAR_TIMEOUT):
+    """Waits until the member input is empty and the previous member's results are gone."""
+    return wait_for(driver, lambda d: not input_box.get_attribute('value') and not member_outcome(d), timeout)
+
+def chat_title_is(title):
+    """Condition: the open chat's header shows `title` and its composer is usable."""
+    def opened(driver):
+        if not any(title in header.text for header in find_all(driver, 'chat_header')):
+            return False
+        return clickable('message_box')(driver)
+    return opened
+
+def wait_for_chat_opened(driver, title, timeout=GROUP_OPEN_TIMEOUT):
+    return wait_for(driver, chat_title_is(title), timeout)
+
+def wait_for_message_box(driver, timeout=CHAT_OPEN_TIMEOUT):
+    return wait_for(driver, clickable('message_box'), timeout)
+
+def wait_for_outgoing(driver, count_before, timeout=MESSAGE_SENT_TIMEOUT):
+    """Waits until at least one new outgoing bubble has been appended to the chat."""
+    return wait_for(driver, lambda d: count_outgoing(d) > count_before, timeout)
+
+def wait_for_clickable(driver, name, timeout):
+    """`name` is a locators.LOCATORS entry."""
+    return wait_for(driver, clickable(name), timeout)
+
+def wait_for_presence(driver, name, timeout):
+    return wait_for(driver, present(name), timeout)
+
+def wait_for_gone(driver, element, timeout):
+    """Waits until `element` is detached from the page or hidden."""
+    def gone(d):
+        try:
+            return not element.is_displayed()
+        except StaleElementReferenceException:
+            return True
+    return wait_for(driver, gone, timeout)